@@ -1,7 +1,10 @@
 import json
 import logging
+import re
+import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Any
+from dataclasses import dataclass
 from datetime import datetime
 from .ipfs import IPFSClient, SciPFSFileNotFoundError
 
@@ -9,6 +12,69 @@ from .ipfs import IPFSClient, SciPFSFileNotFoundError
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+IPFS_PATH_PREFIX = "/ipfs/"
+
+# Well-formed manifest CIDs: CIDv0 (base58btc "Qm...") or CIDv1 in base32 ("b...") or
+# base58btc ("z..."). Checked before get_json so garbage IPNS records fail without a network fetch.
+_CID_RE = re.compile(r"(Qm[1-9A-HJ-NP-Za-km-z]{44}|b[a-z2-7]{58,}|z[1-9A-HJ-NP-Za-km-z]{46,})")
+
+def _intern_user(username: Optional[str]) -> Optional[str]:
+    """Intern a username; most entries in a library share a handful of adders."""
+    return sys.intern(username) if isinstance(username, str) else username
+
+@dataclass(init=False) # __init__ is written out: a slotted dataclass field can't have a class-level default
+class FileEntry:
+    """A single file record in a library manifest.
+
+    Uses __slots__ so large libraries don't pay a full dict per entry. Keys other
+    than the four known ones (e.g. written by a newer SciPFS on another peer) are
+    kept in extra and written back unchanged, so republishing doesn't drop them.
+    """
+    __slots__ = ("cid", "size", "added_timestamp", "added_by", "extra")
+    cid: Optional[str]
+    size: Optional[int]
+    added_timestamp: Optional[str]
+    added_by: Optional[str]
+    extra: Optional[Dict[str, Any]]
+
+    def __init__(self, cid: Optional[str], size: Optional[int], added_timestamp: Optional[str],
+                 added_by: Optional[str], extra: Optional[Dict[str, Any]] = None):
+        self.cid = cid
+        self.size = size
+        self.added_timestamp = added_timestamp
+        self.added_by = added_by
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FileEntry":
+        """Build an entry from its JSON manifest representation."""
+        extra = {key: value for key, value in data.items() if key not in _FILE_ENTRY_KEYS}
+        return cls(
+            cid=data.get("cid"),
+            size=data.get("size"),
+            added_timestamp=data.get("added_timestamp"),
+            added_by=_intern_user(data.get("added_by")),
+            extra=extra or None
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the JSON manifest representation (key order is kept stable for CIDs)."""
+        data = {
+            "cid": self.cid,
+            "size": self.size,
+            "added_timestamp": self.added_timestamp,
+            "added_by": self.added_by
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+_FILE_ENTRY_KEYS = frozenset(("cid", "size", "added_timestamp", "added_by"))
+
+def _files_from_json(files: Dict[str, Any]) -> Dict[str, FileEntry]:
+    """Convert the raw "files" mapping of a manifest into FileEntry objects."""
+    return {name: FileEntry.from_dict(details) for name, details in files.items()}
+
 class Library:
     """Manages a decentralized file library on IPFS."""
     
@@ -34,6 +100,7 @@ class Library:
                 
                 self.manifest_cid = loaded_data.pop("local_manifest_cid", None) # Pop it out, store it
                 self.manifest = loaded_data # The rest is the actual manifest
+                self.manifest["files"] = _files_from_json(self.manifest.get("files", {}))
 
                 self.name = self.manifest.get("name", self.name) # Ensure name is consistent
                 self.ipns_key_name = self.manifest.get("ipns_key_name")
@@ -78,11 +145,12 @@ class Library:
         
         # Add the core manifest (without its own CID yet) to IPFS to get its true CID
         # This self.manifest should NOT contain 'local_manifest_cid' at this point.
-        current_manifest_cid = self.ipfs_client.add_json(self.manifest)
+        manifest_json = self._manifest_to_json()
+        current_manifest_cid = self.ipfs_client.add_json(manifest_json)
         self.manifest_cid = current_manifest_cid # This is the CID of the content in self.manifest
         
         # Prepare data for local JSON file, including the local_manifest_cid
-        manifest_to_save_locally = self.manifest.copy()
+        manifest_to_save_locally = manifest_json.copy()
         if self.manifest_cid: # Only add if a CID was successfully generated
             manifest_to_save_locally["local_manifest_cid"] = self.manifest_cid
         
@@ -116,6 +184,12 @@ class Library:
         else:
             logger.debug("Not publishing to IPNS: ipns_key_name not set or manifest_cid missing.")
 
+    def _manifest_to_json(self) -> Dict[str, Any]:
+        """Return a JSON-serializable copy of the manifest with file entries as plain dicts."""
+        manifest_json = self.manifest.copy()
+        manifest_json["files"] = {name: entry.to_dict() for name, entry in self.manifest.get("files", {}).items()}
+        return manifest_json
+
     def create(self, ipns_record_lifetime: str = "24h") -> None:
         """Create a new library, generate an IPNS key, save manifest, and publish to IPNS.
 
@@ -164,13 +238,16 @@ class Library:
         logger.info("Attempting to join library via IPNS name: %s", ipns_name_to_join)
         try:
             resolved_path = self.ipfs_client.resolve_ipns_name(ipns_name_to_join)
-            if not resolved_path or not resolved_path.startswith("/ipfs/"):
+            if not resolved_path or not resolved_path.startswith(IPFS_PATH_PREFIX):
                 raise ValueError(f"IPNS name {ipns_name_to_join} resolved to an invalid path: {resolved_path}")
             
-            manifest_cid_from_ipns = resolved_path.split("/ipfs/")[-1]
+            manifest_cid_from_ipns = resolved_path[len(IPFS_PATH_PREFIX):]
+            if not _CID_RE.fullmatch(manifest_cid_from_ipns):
+                raise ValueError(f"IPNS name {ipns_name_to_join} resolved to an invalid CID: {manifest_cid_from_ipns}")
             logger.info("IPNS name %s resolved to manifest CID: %s", ipns_name_to_join, manifest_cid_from_ipns)
 
             self.manifest = self.ipfs_client.get_json(manifest_cid_from_ipns)
+            self.manifest["files"] = _files_from_json(self.manifest.get("files", {}))
             
             # Update library instance attributes from the fetched manifest
             manifest_name = self.manifest.get("name")
@@ -210,47 +287,45 @@ class Library:
             raise SciPFSFileNotFoundError(f"File not found: {file_path}")
         cid = self.ipfs_client.add_file(file_path)
         self.ipfs_client.pin(cid)
-        self.manifest["files"][file_path.name] = {
-            "cid": cid,
-            "size": file_path.stat().st_size,
-            "added_timestamp": datetime.fromtimestamp(file_path.stat().st_mtime).isoformat(),
-            "added_by": username
-        }
+        self.manifest["files"][file_path.name] = FileEntry(
+            cid=cid,
+            size=file_path.stat().st_size,
+            added_timestamp=datetime.fromtimestamp(file_path.stat().st_mtime).isoformat(),
+            added_by=_intern_user(username)
+        )
         self._save_manifest()
         logger.info("Added file %s to library %s by %s", file_path.name, self.name, username)
 
     def list_files(self) -> List[Dict]:
         """List all files in the library."""
-        # Ensure structure includes new field even if missing in older manifests (optional)
-        files_list = []
-        for name, details in self.manifest.get("files", {}).items():
-             file_info = {
-                 "name": name,
-                 "cid": details.get("cid"),
-                 "size": details.get("size"),
-                 "added_timestamp": details.get("added_timestamp"),
-                 "added_by": details.get("added_by") # Safely get username
-             }
-             files_list.append(file_info)
-        return files_list
+        return [
+            {
+                "name": name,
+                "cid": entry.cid,
+                "size": entry.size,
+                "added_timestamp": entry.added_timestamp,
+                "added_by": entry.added_by
+            }
+            for name, entry in self.manifest.get("files", {}).items()
+        ]
 
     def get_file(self, file_name: str, output_path: Path) -> None:
         """Download a file from the library by name."""
         if file_name not in self.manifest["files"]:
             raise KeyError(f"File {file_name} not found in library {self.name}")
-        cid = self.manifest["files"][file_name]["cid"]
+        cid = self.manifest["files"][file_name].cid
         self.ipfs_client.get_file(cid, output_path)
 
     def get_file_info(self, file_name: str) -> Optional[Dict]:
         """Get information about a specific file in the library."""
-        file_details = self.manifest.get("files", {}).get(file_name)
-        if file_details:
+        entry = self.manifest.get("files", {}).get(file_name)
+        if entry:
             return {
                 "name": file_name,
-                "cid": file_details.get("cid"),
-                "size": file_details.get("size"),
-                "added_timestamp": file_details.get("added_timestamp"),
-                "added_by": file_details.get("added_by")
+                "cid": entry.cid,
+                "size": entry.size,
+                "added_timestamp": entry.added_timestamp,
+                "added_by": entry.added_by
             }
         return None
 
@@ -268,12 +343,12 @@ class Library:
         
         try:
             resolved_path = self.ipfs_client.resolve_ipns_name(self.ipns_name)
-            if not resolved_path or not resolved_path.startswith("/ipfs/"):
+            if not resolved_path or not resolved_path.startswith(IPFS_PATH_PREFIX):
                 logger.error("IPNS name %s for library '%s' resolved to an invalid path: %s", 
                              self.ipns_name, self.name, resolved_path)
                 raise FileNotFoundError(f"IPNS name {self.ipns_name} resolved to an invalid path: {resolved_path}")
             
-            new_manifest_cid = resolved_path.split("/ipfs/")[-1]
+            new_manifest_cid = resolved_path[len(IPFS_PATH_PREFIX):]
             logger.info("IPNS name %s for library '%s' resolved to new manifest CID: %s", 
                         self.ipns_name, self.name, new_manifest_cid)
 
@@ -282,7 +357,11 @@ class Library:
             if self.manifest_cid != new_manifest_cid:
                 logger.info("Current manifest CID for '%s' is '%s'. New manifest CID is '%s'. Updating...",
                             self.name, self.manifest_cid, new_manifest_cid)
-                
+                if not _CID_RE.fullmatch(new_manifest_cid):
+                    logger.error("IPNS name %s for library '%s' resolved to an invalid CID: %s",
+                                 self.ipns_name, self.name, new_manifest_cid)
+                    raise ValueError(f"IPNS name {self.ipns_name} resolved to an invalid CID: {new_manifest_cid}")
+
                 new_manifest_data = self.ipfs_client.get_json(new_manifest_cid)
                 
                 # Potentially validate new_manifest_data structure here
@@ -292,6 +371,7 @@ class Library:
 
                 original_name = self.name
                 self.manifest = new_manifest_data
+                self.manifest["files"] = _files_from_json(self.manifest["files"])
                 self.name = self.manifest.get("name", original_name) # Update name if changed
                 
                 if self.name != original_name:
@@ -0,0 +1,150 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+class _SQLiteStore:
+    """One SQLite connection in WAL mode, shared across threads and serialized by a lock."""
+
+    _SCHEMA = ""
+
+    def __init__(self, cache_path: Union[str, Path]):
+        self.cache_path = Path(cache_path)
+        self._lock = threading.Lock()
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; concurrent access from several threads goes through self._lock
+        self._conn = sqlite3.connect(str(self.cache_path), isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(self._SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class LLMCache(_SQLiteStore):
+    """Persistent LRU cache of LLM responses (summaries, tags) stored in SQLite.
+
+    Keys are opaque digests computed by the caller (see llm_utils._ResponseCache.make_key);
+    values are stored as JSON. Storage errors are logged and treated as cache misses,
+    so a broken cache never breaks an LLM request.
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS cache (
+        key BLOB PRIMARY KEY,
+        model TEXT,
+        kind TEXT,
+        value TEXT NOT NULL,
+        ts INTEGER NOT NULL
+    )
+    """
+
+    # Check the row count only every this many inserts; eviction may lag by at most this much
+    _TRIM_EVERY = 64
+
+    def __init__(self, cache_path: Union[str, Path], max_entries: int = 10000):
+        """Open (creating if needed) the cache database.
+
+        Args:
+            cache_path: Path of the SQLite database file.
+            max_entries: Least recently used entries beyond this count are evicted.
+        """
+        super().__init__(cache_path)
+        self.max_entries = max_entries
+        self._puts_since_trim = 0
+
+    def get(self, key: bytes) -> Any:
+        """Return the cached value for key, or None on a miss."""
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                self._conn.execute("UPDATE cache SET ts = ? WHERE key = ?", (time.time_ns(), key))
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning("LLM cache read from %s failed: %s", self.cache_path, e)
+            return None
+
+    def put(self, key: bytes, model: Optional[str], kind: str, value: Any) -> None:
+        """Store value (anything JSON serializable) under key."""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, model, kind, value, ts) VALUES (?, ?, ?, ?, ?)",
+                    (key, model, kind, json.dumps(value), time.time_ns()),
+                )
+                self._puts_since_trim += 1
+                if self._puts_since_trim >= self._TRIM_EVERY:
+                    self._puts_since_trim = 0
+                    self._trim()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning("LLM cache write to %s failed: %s", self.cache_path, e)
+
+    def _trim(self) -> None:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY ts ASC LIMIT ?)", (excess,)
+            )
+            logger.debug("Evicted %d entries from LLM cache %s.", excess, self.cache_path)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+class ExtractionCache(_SQLiteStore):
+    """Extracted file text keyed by path, valid while the file's (mtime_ns, size) are unchanged.
+
+    Can share a database file with LLMCache. Text is stored zlib-compressed. Identical
+    files at different paths need no link here: LLM responses are cached by a digest
+    of the text itself, so they share cache entries anyway.
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS extraction (
+        path TEXT PRIMARY KEY,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL,
+        text_blob BLOB NOT NULL
+    )
+    """
+
+    def __init__(self, cache_path: Union[str, Path]):
+        super().__init__(cache_path)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(extraction)")}
+        if "text_hash" in columns: # Table from an earlier schema; its text is cheap to extract again
+            self._conn.execute("DROP TABLE extraction")
+            self._conn.execute(self._SCHEMA)
+
+    def get(self, path: Path, stat: os.stat_result) -> Optional[str]:
+        """Return the cached text for path if it was stored for the same mtime and size."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT text_blob FROM extraction WHERE path = ? AND mtime_ns = ? AND size = ?",
+                    (str(path), stat.st_mtime_ns, stat.st_size),
+                ).fetchone()
+            return zlib.decompress(row[0]).decode("utf-8") if row else None
+        except (sqlite3.Error, zlib.error, UnicodeDecodeError) as e:
+            logger.warning("Extraction cache read from %s failed: %s", self.cache_path, e)
+            return None
+
+    def put(self, path: Path, stat: os.stat_result, text: str) -> None:
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO extraction (path, mtime_ns, size, text_blob) VALUES (?, ?, ?, ?)",
+                    (str(path), stat.st_mtime_ns, stat.st_size, zlib.compress(text.encode("utf-8"))),
+                )
+        except sqlite3.Error as e:
+            logger.warning("Extraction cache write to %s failed: %s", self.cache_path, e)
@@ -1,74 +1,209 @@
 import os
-from typing import Optional, Dict, Any
+import sys
+import json
+import functools
+import types
+from pathlib import Path
+from typing import Optional, Dict, Any, List
 import logging
 
 # Environment variable names for API keys
 # Example: SCIPFS_OPENAI_API_KEY, SCIPFS_ANTHROPIC_API_KEY
 ENV_VAR_PREFIX = "SCIPFS_"
 ENV_VAR_SUFFIX = "_API_KEY"
+_ENV_VAR_TEMPLATE = ENV_VAR_PREFIX + "{0}" + ENV_VAR_SUFFIX
+
+# Registry of known providers, shipped alongside this module
+PROVIDERS_FILE = Path(__file__).with_name("providers.json")
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
+def _warn_missing_api_key(env_var: str, provider_name: str) -> None:
+    """Log the missing-key warning at most once per (env var, provider) per process."""
+    logger.warning("Environment variable %s for %s API key not set.", env_var, provider_name)
+
+def _norm(provider_name: str) -> str:
+    """Canonical (lower-cased, interned) form of a provider name used as a dict key."""
+    return sys.intern(provider_name.lower())
+
+@functools.lru_cache(maxsize=1)
+def _load_provider_metadata() -> Dict[str, Dict[str, Any]]:
+    """Load the provider registry (name -> LLMProviderConfig kwargs) from PROVIDERS_FILE.
+
+    Only this lightweight metadata is read up front; LLMProviderConfig objects
+    are built on demand by GlobalLLMConfig.get_provider_config().
+    """
+    try:
+        with open(PROVIDERS_FILE, "r") as f:
+            entries = json.load(f)
+        return {_norm(entry["provider_name"]): entry for entry in entries}
+    except (OSError, json.JSONDecodeError, KeyError, TypeError) as e:
+        logger.error("Failed to load LLM provider registry %s: %s", PROVIDERS_FILE, e)
+        return {}
+
 class LLMProviderConfig:
     """Configuration for a single LLM provider."""
-    def __init__(self, provider_name: str, api_key_env_var: Optional[str] = None, default_model: Optional[str] = None):
-        self.provider_name = provider_name.lower()
-        self.api_key_env_var = api_key_env_var if api_key_env_var else f"{ENV_VAR_PREFIX}{self.provider_name.upper()}{ENV_VAR_SUFFIX}"
+    __slots__ = (
+        "provider_name", "api_key_env_var", "api_key", "default_model", "use_batch_api",
+        "rate_limit_rps", "max_concurrency", "timeout_s", "connect_timeout_s", "max_retries", "context_window", "_api_key_loaded",
+    )
+
+    def __init__(self, provider_name: str, api_key_env_var: Optional[str] = None, default_model: Optional[str] = None, use_batch_api: bool = False,
+                 rate_limit_rps: Optional[float] = None, max_concurrency: Optional[int] = None,
+                 timeout_s: float = 30.0, connect_timeout_s: float = 5.0, max_retries: Optional[int] = None,
+                 context_window: Optional[int] = None):
+        self.provider_name = _norm(provider_name)
+        self.api_key_env_var = api_key_env_var or _ENV_VAR_TEMPLATE.format(self.provider_name.upper())
         self.api_key: Optional[str] = None
         self.default_model = default_model
-        self._load_api_key()
+        # Send large summarize_many/generate_tags_many jobs through the provider's batch API
+        self.use_batch_api = use_batch_api
+        # Per-provider overrides of the GlobalLLMConfig settings of the same name; None means use the global value
+        self.rate_limit_rps = rate_limit_rps
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        # Per-request timeout passed to the provider SDK client
+        self.timeout_s = timeout_s
+        self.connect_timeout_s = connect_timeout_s
+        # Context window of default_model in tokens, if known; bounds the input sent per request
+        self.context_window = context_window
+        self._api_key_loaded = False
 
     def _load_api_key(self) -> None:
         """Load API key from environment variable."""
         self.api_key = os.environ.get(self.api_key_env_var)
+        self._api_key_loaded = True
         if not self.api_key:
-            logger.warning(f"Environment variable {self.api_key_env_var} for {self.provider_name} API key not set.")
+            _warn_missing_api_key(self.api_key_env_var, self.provider_name)
 
     def get_api_key(self) -> Optional[str]:
+        """Return the API key, reading the environment on first use only."""
+        if not self._api_key_loaded:
+            self._load_api_key()
         return self.api_key
 
+    def invalidate(self) -> None:
+        """Forget the cached API key so the next get_api_key() re-reads the environment."""
+        self.api_key = None
+        self._api_key_loaded = False
+
 class GlobalLLMConfig:
     """Manages global LLM settings and provider configurations."""
+    __slots__ = (
+        "_providers", "providers", "default_provider_name", "_api_key_cache", "_provider_metadata",
+        "_resolved_default",
+        "default_max_tokens_summary", "default_max_tokens_tags", "default_num_tags", "default_temperature",
+        "rate_limit_rps", "rate_limit_burst", "max_retries", "max_concurrency", "failover_chain", "warmup_on_init",
+        "enable_chunked_summary", "summary_chunk_chars", "summary_chunk_overlap", "max_input_tokens",
+        "batch_api_threshold", "enable_disk_cache", "disk_cache_path", "disk_cache_max_entries",
+    )
+
     def __init__(self):
-        self.providers: Dict[str, LLMProviderConfig] = {}
+        self._providers: Dict[str, LLMProviderConfig] = {}
+        self.providers = types.MappingProxyType(self._providers) # Read-only view for callers
         self.default_provider_name: Optional[str] = None
-        self._initialize_providers()
+        self._api_key_cache: Dict[str, Optional[str]] = {}
+        self._provider_metadata = _load_provider_metadata() # Shared, treat as read-only
+        self._resolved_default: Optional[LLMProviderConfig] = None
         # Default settings for LLM interactions
         self.default_max_tokens_summary: int = 150
         self.default_max_tokens_tags: int = 50
         self.default_num_tags: int = 5
         self.default_temperature: float = 0.7
+        # Client-side request pacing per (provider, model); rate_limit_rps <= 0 disables it
+        self.rate_limit_rps: float = 8.0
+        self.rate_limit_burst: int = 16
+        # Retries with exponential backoff after a rate-limit, connection or transient server error
+        # (408, 409, 5xx). This is the only retry layer: provider SDK clients are created with their
+        # built-in retries disabled.
+        self.max_retries: int = 4
+        self.max_concurrency: int = 10 # Requests in flight at once in summarize_many/generate_tags_many
+        # Providers to retry a request on, in order, when its provider stays rate limited, unreachable or failing
+        self.failover_chain: List[str] = []
+        # Validate the API key in a background thread when an LLMClient is created (one extra API call)
+        self.warmup_on_init: bool = False
+        # Texts longer than summary_chunk_chars are summarized chunk by chunk, then combined
+        self.enable_chunked_summary: bool = True
+        self.summary_chunk_chars: int = 8000
+        self.summary_chunk_overlap: int = 200
+        # Input text beyond this many tokens is truncated client-side before sending
+        self.max_input_tokens: int = 24000
+        # Minimum number of documents before a provider with use_batch_api goes through its batch API
+        self.batch_api_threshold: int = 8
+        # Persistent response cache (see llm_cache.LLMCache) shared across runs. Opt-in: it keeps
+        # model summaries and tags of the user's documents in disk_cache_path until evicted.
+        self.enable_disk_cache: bool = False
+        self.disk_cache_path: Path = Path.home() / ".scipfs" / "llm_cache.sqlite3"
+        self.disk_cache_max_entries: int = 10000
         # Add other global settings like context strategy, structured output requirements, etc.
 
-    def _initialize_providers(self):
-        """Initialize known LLM providers. This can be expanded or loaded from a config file."""
-        # Example:
-        self.add_provider("openai", default_model="gpt-4o-mini")
-        self.add_provider("anthropic", default_model="claude-3-haiku-20240307")
-        self.add_provider("groq", default_model="mixtral-8x7b-32768", api_key_env_var="SCIPFS_GROQ_API_KEY")
-        # A 'custom_url' provider might need different handling for API key/URL
-
-    def add_provider(self, provider_name: str, api_key_env_var: Optional[str] = None, default_model: Optional[str] = None):
-        provider_conf = LLMProviderConfig(provider_name, api_key_env_var, default_model)
-        self.providers[provider_name.lower()] = provider_conf
+    def _get_provider(self, key: str) -> Optional[LLMProviderConfig]:
+        """Look up a provider by normalized name, building it from the registry on first use."""
+        provider = self.providers.get(key)
+        if provider is None and key in self._provider_metadata:
+            provider = LLMProviderConfig(**self._provider_metadata[key])
+            self._providers[key] = provider
+        return provider
+
+    def add_provider(self, provider_name: str, api_key_env_var: Optional[str] = None, default_model: Optional[str] = None, use_batch_api: bool = False, **kwargs: Any):
+        """Register a provider; kwargs set the other LLMProviderConfig options, e.g. context_window or timeout_s."""
+        provider_conf = LLMProviderConfig(provider_name, api_key_env_var, default_model, use_batch_api, **kwargs)
+        key = provider_conf.provider_name # Already normalized by LLMProviderConfig
+        self._providers[key] = provider_conf
+        self._api_key_cache.pop(key, None) # Provider may have been replaced
+        self._resolved_default = None
 
     def get_provider_config(self, provider_name: str) -> Optional[LLMProviderConfig]:
-        return self.providers.get(provider_name.lower())
+        return self._get_provider(_norm(provider_name))
 
     def get_api_key(self, provider_name: str) -> Optional[str]:
-        provider = self.get_provider_config(provider_name)
-        return provider.get_api_key() if provider else None
+        key = _norm(provider_name)
+        if key in self._api_key_cache:
+            return self._api_key_cache[key]
+        provider = self._get_provider(key)
+        if not provider:
+            return None # Don't cache misses for unknown providers; they may be added later
+        api_key = provider.get_api_key()
+        self._api_key_cache[key] = api_key
+        return api_key
+
+    def invalidate(self) -> None:
+        """Drop cached API keys and the resolved default provider, e.g. after changing the environment.
+
+        LLM clients obtained through llm_utils.get_llm_client() are keyed on the
+        API key, so they are rebuilt automatically once a rotated key is picked up.
+        """
+        for provider in self._providers.values():
+            provider.invalidate()
+        self._api_key_cache.clear()
+        self._resolved_default = None
+
+    def configured_providers(self) -> List[str]:
+        """Names of all known providers that have an API key available."""
+        names = dict.fromkeys(self._provider_metadata)
+        names.update(dict.fromkeys(self.providers))
+        return [name for name in names if self.get_api_key(name)]
 
     def set_default_provider(self, provider_name: str):
-        if provider_name.lower() in self.providers:
-            self.default_provider_name = provider_name.lower()
+        key = _norm(provider_name)
+        if key in self.providers or key in self._provider_metadata:
+            self.default_provider_name = key
+            self._resolved_default = None
         else:
-            logger.warning(f"Provider {provider_name} not recognized. Cannot set as default.")
+            logger.warning("Provider %s not recognized. Cannot set as default.", provider_name)
 
     def get_default_provider(self) -> Optional[LLMProviderConfig]:
+        if self._resolved_default is None:
+            self._resolved_default = self._resolve_default_provider()
+        return self._resolved_default
+
+    def _resolve_default_provider(self) -> Optional[LLMProviderConfig]:
         if self.default_provider_name:
-            return self.get_provider_config(self.default_provider_name)
-        # Fallback to the first available provider if no default is set
+            return self._get_provider(self.default_provider_name) # Stored already normalized
+        # Fallback to the first registered provider if no default is set
+        if self._provider_metadata:
+            return self._get_provider(next(iter(self._provider_metadata)))
         if self.providers:
             return next(iter(self.providers.values()))
         return None
@@ -81,12 +216,23 @@ class GlobalLLMConfig:
                 return provider.default_model
         return None # Or a global default model
 
-# Instantiate a global LLM config object for use by other modules
-llm_config = GlobalLLMConfig()
+@functools.lru_cache(maxsize=1)
+def get_llm_config() -> GlobalLLMConfig:
+    """Return the shared GlobalLLMConfig, constructing it on first use."""
+    return GlobalLLMConfig()
 
-if __name__ == '__main__':
+def __getattr__(name: str) -> Any:
+    # Keep `from scipfs.llm_config import llm_config` working without building
+    # the config at import time.
+    if name == "llm_config":
+        return get_llm_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _demo() -> None:
+    """Print the resolved provider configuration (run `python -m scipfs.llm_config`)."""
     # Example usage:
     logging.basicConfig(level=logging.INFO)
+    llm_config = get_llm_config()
     print(f"OpenAI API Key configured: {'Yes' if llm_config.get_api_key('openai') else 'No'}")
     print(f"Anthropic API Key configured: {'Yes' if llm_config.get_api_key('anthropic') else 'No'}")
     print(f"Groq API Key configured: {'Yes' if llm_config.get_api_key('groq') else 'No'}")
@@ -98,4 +244,7 @@ if __name__ == '__main__':
         print(f"Default model for {default_provider.provider_name}: {default_provider.default_model}")
         print(f"API key for default provider: {'Yes' if default_provider.get_api_key() else 'No'}")
 
-    print(f"Default summary tokens: {llm_config.default_max_tokens_summary}") 
\ No newline at end of file
+    print(f"Default summary tokens: {llm_config.default_max_tokens_summary}")
+
+if __name__ == '__main__':
+    _demo()
@@ -1,14 +1,184 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Callable, Union, NamedTuple, Iterator, FrozenSet
+import asyncio
+import atexit
+import contextlib
+import functools
+import hashlib
+import importlib
+import json
 import logging
+import random
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 
 # Import the global LLM config (and specific provider configs if needed)
-from .llm_config import llm_config, LLMProviderConfig 
+from .llm_config import get_llm_config, LLMProviderConfig
+from .llm_cache import LLMCache
 
 # Actual LLM client libraries will be imported in _initialize_sdk_client
-# to handle potential ImportErrors gracefully.
+# to handle potential ImportErrors gracefully. Only the configured provider's
+# SDK is imported, and only when an LLMClient is created.
 
 logger = logging.getLogger(__name__)
 
+# SDK clients shared by every LLMClient for the same (provider, api_key), so
+# repeated LLMClient() constructions reuse one HTTP connection pool.
+# Values are (client_instance, (auth, rate_limit, connection, api) error classes).
+_SDK_CLIENTS: Dict[Tuple[str, str], Tuple[Any, Tuple[type, type, type, type]]] = {}
+
+@functools.lru_cache(maxsize=1)
+def _shared_http_client() -> Optional[Any]:
+    """One pooled httpx.Client handed to every provider SDK, using HTTP/2 when `h2` is installed.
+
+    httpx comes with the provider SDKs; if it is missing the SDKs fall back to their own transport.
+    """
+    try:
+        import httpx # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    try:
+        import h2 # type: ignore[import-not-found] # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    client = httpx.Client(
+        http2=http2,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60.0),
+        timeout=httpx.Timeout(60.0, connect=5.0),
+    )
+    atexit.register(client.close) # Close pooled connections cleanly instead of at interpreter teardown
+    return client
+
+def _sdk_timeout(timeout_s: float, connect_timeout_s: float) -> Any:
+    """Timeout argument for a provider SDK client: an httpx.Timeout if httpx is importable, else seconds."""
+    try:
+        import httpx # type: ignore[import-not-found]
+    except ImportError:
+        return timeout_s
+    return httpx.Timeout(timeout_s, connect=connect_timeout_s)
+
+# Rough characters-per-token ratio used when tiktoken is not installed
+_CHARS_PER_TOKEN = 4
+# Tokens reserved for the system prompt and template text around the document
+_PROMPT_OVERHEAD_TOKENS = 256
+
+@functools.lru_cache(maxsize=None)
+def _load_encoding(provider_name: str, model_name: Optional[str]) -> Optional[Any]:
+    """Return a tiktoken encoding for counting tokens, or None if tiktoken is unavailable.
+
+    Non-OpenAI models use cl100k_base as an approximation.
+    """
+    try:
+        import tiktoken # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    try:
+        if provider_name == "openai" and model_name:
+            try:
+                return tiktoken.encoding_for_model(model_name)
+            except KeyError:
+                pass # Unknown model name; fall through to the generic encoding
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e: # e.g. the encoding file could not be downloaded
+        logger.debug("Could not load tiktoken encoding for %s/%s: %s", provider_name, model_name, e)
+        return None
+
+class _ResponseCache:
+    """Thread-safe, bounded LRU cache of LLM responses keyed by a digest of the request."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: Any) -> bytes:
+        # Same digest as hashing "\0".join(map(str, parts)), without building that
+        # string, which would copy a potentially large document text.
+        digest = hashlib.blake2b(digest_size=16)
+        for i, part in enumerate(parts):
+            if i:
+                digest.update(b"\0")
+            digest.update(str(part).encode("utf-8"))
+        return digest.digest()
+
+    def get(self, key: bytes) -> Any:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: bytes, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+class TokenBucket:
+    """Blocking token-bucket rate limiter: `rate` tokens per second, bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until `tokens` are available and take them. A non-positive rate never blocks."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+# One bucket per (provider, model), shared by all LLMClient instances and threads.
+_RATE_LIMITERS: Dict[Tuple[str, Optional[str]], TokenBucket] = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+def _get_rate_limiter(provider_name: str, model_name: Optional[str], rate: float, burst: int) -> TokenBucket:
+    key = (provider_name, model_name)
+    with _RATE_LIMITERS_LOCK:
+        limiter = _RATE_LIMITERS.get(key)
+        if limiter is None:
+            limiter = _RATE_LIMITERS[key] = TokenBucket(rate, burst)
+        return limiter
+
+# Summaries/tags for identical (provider, model, settings, text) requests,
+# e.g. the same file content seen again while re-indexing a library.
+_RESPONSE_CACHE = _ResponseCache()
+
+@functools.lru_cache(maxsize=None)
+def _open_disk_cache(cache_path: str, max_entries: int) -> Optional[LLMCache]:
+    try:
+        return LLMCache(cache_path, max_entries)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("Could not open LLM response cache at %s; continuing without it: %s", cache_path, e)
+        return None
+
+def _get_disk_cache() -> Optional[LLMCache]:
+    """The persistent response cache configured in llm_config, or None if it is disabled."""
+    llm_config = get_llm_config()
+    if not llm_config.enable_disk_cache or not llm_config.disk_cache_path:
+        return None
+    return _open_disk_cache(str(llm_config.disk_cache_path), llm_config.disk_cache_max_entries)
+
 # Custom LLM Exceptions
 class LLMError(Exception):
     """Base class for LLM related errors."""
@@ -30,6 +200,10 @@ class LLMAPIError(LLMError):
     """Raised for general errors during API calls."""
     pass
 
+class LLMConnectionError(LLMAPIError):
+    """Raised when the provider cannot be reached or the request times out."""
+    pass
+
 class LLMResponseFormatError(LLMError):
     """Raised when the LLM response is not in the expected format."""
     pass
@@ -42,6 +216,287 @@ class LLMAuthenticationError(LLMAPIKeyError):
     """Raised specifically for authentication failures (e.g., invalid API key)."""
     pass
 
+class LLMServerError(LLMAPIError):
+    """Raised when the provider fails with a transient status: a timeout, conflict, overload or 5xx error."""
+    pass
+
+# Errors worth retrying, and failing over to another provider after the retries run out
+_RETRYABLE_ERRORS = (LLMRateLimitError, LLMConnectionError, LLMServerError)
+
+def _is_transient_status(error: Exception) -> bool:
+    """True if error carries an HTTP status the provider SDKs themselves would retry (408, 409, 5xx)."""
+    status = getattr(error, "status_code", None)
+    return isinstance(status, int) and (status in (408, 409) or status >= 500)
+
+# Prompt templates. Bump PROMPT_VERSION whenever any of them changes so cached
+# responses produced by the old prompts are not reused.
+PROMPT_VERSION = 1
+_SUMMARY_SYSTEM = "You are a helpful assistant designed to summarize texts accurately and concisely."
+_SUMMARY_USER_TMPL = "Summarize the following text concisely and informatively:\n\n---\n%s\n---"
+_TAGS_SYSTEM = "You are an expert at extracting keywords and tags. You always output a valid JSON list of strings, and nothing else."
+_TAGS_SYSTEM_NO_JSON_MODE = _TAGS_SYSTEM + " Your entire response should be ONLY the JSON list."
+_TAGS_USER_TMPL = (
+    "Extract exactly %d highly relevant and distinct keywords or short phrases (tags) from the following text. "
+    "Format the output STRICTLY as a JSON list of strings. For example: [\"keyword1\", \"short phrase tag\", \"concept3\"]. "
+    "Ensure the output is ONLY the JSON list and nothing else.\n\n---\nText: %s\n---"
+)
+_BATCH_SUMMARY_SYSTEM = _SUMMARY_SYSTEM + " You always output a valid JSON list of strings, and nothing else."
+_BATCH_SUMMARY_USER_TMPL = (
+    "Summarize each of the following %d documents concisely and informatively. "
+    "Format the output STRICTLY as a JSON list of %d strings, where string i is the summary of DOC i. "
+    "Ensure the output is ONLY the JSON list and nothing else.\n\n%s"
+)
+_BATCH_TAGS_SYSTEM = "You are an expert at extracting keywords and tags. You always output valid JSON, and nothing else."
+_BATCH_TAGS_USER_TMPL = (
+    "For each of the following %d documents, extract exactly %d highly relevant and distinct keywords or short phrases (tags). "
+    "Format the output STRICTLY as a JSON list of %d lists of strings, where list i holds the tags for DOC i. "
+    "Ensure the output is ONLY the JSON list and nothing else.\n\n%s"
+)
+
+# Upper bound on documents packed into one batch request; larger batches
+# increase per-call latency and the risk of the model dropping documents.
+MAX_BATCH_SIZE = 16
+
+_JSON_DECODER = json.JSONDecoder()
+_JSON_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*```\s*$", re.DOTALL)
+
+def _strip_json_fence(raw_content: str) -> str:
+    """Remove a ```json ... ``` (or bare ```) fence that LLMs sometimes wrap JSON in."""
+    match = _JSON_FENCE_RE.match(raw_content)
+    return match.group(1) if match else raw_content.strip()
+
+# Trailing commas before a closing bracket/brace, which LLMs sometimes emit
+_TRAILING_COMMA_RE = re.compile(r",\s*([\]}])")
+
+def _parse_tag_json(content: str) -> Any:
+    """Decode a tag response, tolerating the usual LLM deviations from a bare JSON list.
+
+    Handles a ```json fence, prose before/after the list, trailing commas, and a
+    JSON-mode object wrapping a single list (e.g. {"tags": [...]}). Raises
+    json.JSONDecodeError if no JSON value can be recovered.
+    """
+    cleaned_content = _strip_json_fence(content)
+    try:
+        parsed = _JSON_DECODER.decode(cleaned_content)
+    except json.JSONDecodeError:
+        start = cleaned_content.find("[")
+        if start == -1:
+            raise
+        # raw_decode parses the first JSON value and ignores whatever follows it
+        parsed = _JSON_DECODER.raw_decode(_TRAILING_COMMA_RE.sub(r"\1", cleaned_content[start:]))[0]
+    if isinstance(parsed, dict) and len(parsed) == 1:
+        (value,) = parsed.values()
+        if isinstance(value, list):
+            return value
+    return parsed
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+def _chunk_text(text: str, max_chars: int = 8000, overlap: int = 200) -> List[str]:
+    """Split text into chunks of roughly max_chars, breaking at sentence boundaries where possible.
+
+    Each chunk after the first starts with the last `overlap` characters of the previous one.
+    """
+    if len(text) <= max_chars:
+        return [text]
+    overlap = max(0, min(overlap, max_chars // 2))
+    piece_chars = max_chars - overlap
+    pieces: List[str] = []
+    for sentence in _SENTENCE_END_RE.split(text):
+        # Hard-split sentences that would not fit in a chunk on their own
+        pieces.extend(sentence[i:i + piece_chars] for i in range(0, len(sentence), piece_chars))
+
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > max_chars:
+            chunks.append(current)
+            current = current[-overlap:] if overlap else ""
+        current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _format_batch_documents(texts: List[str]) -> str:
+    """Join documents with numbered delimiters for a single batch prompt."""
+    return "\n".join(f"### DOC {i} ###\n{text}" for i, text in enumerate(texts, 1))
+
+def _json_list_end(text: str) -> int:
+    """Index just past the first complete top-level JSON list in text, or -1 if it isn't closed yet."""
+    depth = 0
+    in_string = False
+    escaped = False
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"' and depth:
+            in_string = True
+        elif char == "[":
+            depth += 1
+        elif char == "]" and depth:
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
+
+def _chat_completions_params(model: str, system_prompt: str, prompt: str, max_tokens: int, temperature: float, response_format: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    params: Dict[str, Any] = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": max_tokens,
+        "temperature": temperature
+    }
+    if response_format:
+        params["response_format"] = response_format
+    return params
+
+def _chat_completions_call(client: Any, model: str, system_prompt: str, prompt: str, max_tokens: int, temperature: float, response_format: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """Call an OpenAI-compatible chat completions API (OpenAI, Groq)."""
+    params = _chat_completions_params(model, system_prompt, prompt, max_tokens, temperature, response_format)
+    response = client.chat.completions.create(**params)
+    return response.choices[0].message.content
+
+def _chat_completions_stream(client: Any, model: str, system_prompt: str, prompt: str, max_tokens: int, temperature: float, response_format: Optional[Dict[str, str]] = None) -> Iterator[str]:
+    """Stream text deltas from an OpenAI-compatible chat completions API; closing the generator aborts the request."""
+    params = _chat_completions_params(model, system_prompt, prompt, max_tokens, temperature, response_format)
+    stream = client.chat.completions.create(stream=True, **params)
+    try:
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        stream.close()
+
+def _anthropic_messages_call(client: Any, model: str, system_prompt: str, prompt: str, max_tokens: int, temperature: float, response_format: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """Call the Anthropic messages API. Anthropic has no JSON mode, so response_format is ignored."""
+    response = client.messages.create(
+        model=model,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        system=system_prompt,
+        messages=[{"role": "user", "content": prompt}]
+    )
+    return response.content[0].text if response.content and response.content[0].text else None
+
+def _anthropic_messages_stream(client: Any, model: str, system_prompt: str, prompt: str, max_tokens: int, temperature: float, response_format: Optional[Dict[str, str]] = None) -> Iterator[str]:
+    """Stream text deltas from the Anthropic messages API; closing the generator aborts the request."""
+    with client.messages.stream(
+        model=model,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        system=system_prompt,
+        messages=[{"role": "user", "content": prompt}]
+    ) as stream:
+        yield from stream.text_stream
+
+# Polling schedule for provider batch jobs: start at the initial interval and
+# double up to the maximum. Batch jobs typically finish in minutes to hours.
+_BATCH_POLL_INITIAL_S = 5.0
+_BATCH_POLL_MAX_S = 60.0
+
+def _wait_for_batch(retrieve: Callable[[], Any], is_done: Callable[[Any], bool]) -> Any:
+    """Poll retrieve() with exponential backoff until is_done(result); return the final result."""
+    delay = _BATCH_POLL_INITIAL_S
+    batch = retrieve()
+    while not is_done(batch):
+        time.sleep(delay)
+        delay = min(delay * 2, _BATCH_POLL_MAX_S)
+        batch = retrieve()
+    return batch
+
+def _openai_batch_call(client: Any, model: str, system_prompt: str, prompts: List[str], max_tokens: int, temperature: float, response_format: Optional[Dict[str, str]] = None) -> List[Optional[str]]:
+    """Run prompts through the OpenAI Batch API; results are in prompt order, None where a request failed."""
+    lines = [
+        json.dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": _chat_completions_params(model, system_prompt, prompt, max_tokens, temperature, response_format),
+        })
+        for i, prompt in enumerate(prompts)
+    ]
+    input_file = client.files.create(file=("batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch")
+    batch = client.batches.create(input_file_id=input_file.id, endpoint="/v1/chat/completions", completion_window="24h")
+    logger.info("Submitted OpenAI batch %s with %d requests.", batch.id, len(prompts))
+    batch = _wait_for_batch(
+        lambda: client.batches.retrieve(batch.id),
+        lambda b: b.status in ("completed", "failed", "expired", "cancelled"),
+    )
+    if batch.status != "completed" or not batch.output_file_id:
+        raise LLMAPIError(f"OpenAI batch {batch.id} ended with status '{batch.status}'.")
+
+    results: List[Optional[str]] = [None] * len(prompts)
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        response = entry.get("response") or {}
+        if response.get("status_code") == 200:
+            results[int(entry["custom_id"])] = response["body"]["choices"][0]["message"]["content"]
+    return results
+
+def _anthropic_batch_call(client: Any, model: str, system_prompt: str, prompts: List[str], max_tokens: int, temperature: float, response_format: Optional[Dict[str, str]] = None) -> List[Optional[str]]:
+    """Run prompts through the Anthropic Message Batches API; results are in prompt order, None where a request failed."""
+    batch = client.messages.batches.create(requests=[
+        {
+            "custom_id": str(i),
+            "params": {
+                "model": model,
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "system": system_prompt,
+                "messages": [{"role": "user", "content": prompt}],
+            },
+        }
+        for i, prompt in enumerate(prompts)
+    ])
+    logger.info("Submitted Anthropic message batch %s with %d requests.", batch.id, len(prompts))
+    _wait_for_batch(lambda: client.messages.batches.retrieve(batch.id), lambda b: b.processing_status == "ended")
+
+    results: List[Optional[str]] = [None] * len(prompts)
+    for entry in client.messages.batches.results(batch.id):
+        if entry.result.type == "succeeded":
+            content = entry.result.message.content
+            results[int(entry.custom_id)] = content[0].text if content else None
+    return results
+
+class _ProviderAdapter(NamedTuple):
+    """How to build and call the SDK client for one provider."""
+    sdk_module: str # Importable module name, also the pip package name
+    client_class: str
+    display_name: str
+    call: Callable[..., Optional[str]]
+    stream: Callable[..., Iterator[str]]
+    supports_json_mode: bool
+    json_mode_models: Optional[FrozenSet[str]] = None # Models that accept response_format; None means all
+    batch: Optional[Callable[..., List[Optional[str]]]] = None # Provider batch API, if there is one
+
+# OpenAI models known to accept response_format={"type": "json_object"}
+_OPENAI_JSON_MODE_MODELS: FrozenSet[str] = frozenset({
+    "gpt-3.5-turbo", "gpt-3.5-turbo-0125", "gpt-3.5-turbo-1106",
+    "gpt-4-turbo", "gpt-4-turbo-preview", "gpt-4-1106-preview", "gpt-4-0125-preview",
+    "gpt-4o", "gpt-4o-2024-05-13", "gpt-4o-2024-08-06",
+    "gpt-4o-mini", "gpt-4o-mini-2024-07-18",
+    "gpt-4.1", "gpt-4.1-mini", "gpt-4.1-nano",
+})
+
+_PROVIDER_ADAPTERS: Dict[str, _ProviderAdapter] = {
+    "openai": _ProviderAdapter("openai", "OpenAI", "OpenAI", _chat_completions_call, _chat_completions_stream, True, _OPENAI_JSON_MODE_MODELS, _openai_batch_call),
+    "anthropic": _ProviderAdapter("anthropic", "Anthropic", "Anthropic", _anthropic_messages_call, _anthropic_messages_stream, False, None, _anthropic_batch_call),
+    "groq": _ProviderAdapter("groq", "Groq", "Groq", _chat_completions_call, _chat_completions_stream, True), # OpenAI compatible
+}
+
+# Longest a request waits for a still-running warm-up before going ahead anyway
+_WARMUP_JOIN_TIMEOUT_S = 5.0
+
 class LLMClient:
     """Client for interacting with Large Language Models."""
 
@@ -56,407 +511,669 @@ class LLMClient:
         self.provider_config: Optional[LLMProviderConfig] = None
         self.client_instance: Optional[Any] = None # Placeholder for the actual SDK client (e.g., openai.OpenAI())
         self.model_name: Optional[str] = model_name
+        llm_config = get_llm_config()
 
         if provider_name:
             self.provider_config = llm_config.get_provider_config(provider_name)
             if not self.provider_config:
-                logger.error(f"LLM provider '{provider_name}' not found in configuration.")
+                logger.error("LLM provider '%s' not found in configuration.", provider_name)
                 raise LLMProviderNotFound(f"Provider '{provider_name}' not configured.")
         else:
             self.provider_config = llm_config.get_default_provider()
             if not self.provider_config:
                 logger.error("No default LLM provider configured or no providers available.")
                 raise LLMProviderNotFound("No LLM provider available.")
-        
-        logger.info(f"LLMClient initializing with provider: {self.provider_config.provider_name}")
+
+        # Resolved once here; the request methods use these instead of re-reading provider_config
+        self._provider_name: str = self.provider_config.provider_name
+        self._adapter: Optional[_ProviderAdapter] = _PROVIDER_ADAPTERS.get(self._provider_name)
+
+        logger.info("LLMClient initializing with provider: %s", self._provider_name)
 
         if not self.provider_config.get_api_key():
-            logger.error(f"API key for LLM provider '{self.provider_config.provider_name}' is not set.")
-            raise LLMAPIKeyError(f"API key for {self.provider_config.provider_name} not set.")
+            logger.error("API key for LLM provider '%s' is not set.", self._provider_name)
+            raise LLMAPIKeyError(f"API key for {self._provider_name} not set.")
 
         if not self.model_name:
             self.model_name = self.provider_config.default_model
         
         if not self.model_name:
-            logger.warning(f"No model specified and no default model for provider {self.provider_config.provider_name}")
+            logger.warning("No model specified and no default model for provider %s", self._provider_name)
             # Potentially raise error if model is essential for init
 
+        self._warmup_thread: Optional[threading.Thread] = None
+        self._warmup_error: Optional[LLMError] = None
         self._initialize_sdk_client()
+        if llm_config.warmup_on_init:
+            self.start_warmup()
+
+    def _set_sdk_errors(self, auth_error: type, rate_limit_error: type, connection_error: type, api_error: type) -> None:
+        """Bind the provider SDK's exception classes once so API calls don't re-import them."""
+        self._auth_error = auth_error
+        self._rate_limit_error = rate_limit_error
+        self._connection_error = connection_error
+        self._api_error = api_error
+        # SDK exception class -> (LLMError class, log label, message template); see _translate_error
+        self._error_map: Dict[type, Tuple[type, str, str]] = {
+            api_error: (LLMAPIError, "API error", "API error with %s: %s"),
+            connection_error: (LLMConnectionError, "API connection error", "API connection error with %s: %s"),
+            rate_limit_error: (LLMRateLimitError, "rate limit exceeded", "Rate limit exceeded with %s: %s"),
+            auth_error: (LLMAuthenticationError, "authentication error", "Authentication failed with %s: %s"),
+        }
 
     def _initialize_sdk_client(self):
         """Initialize the actual LLM SDK client based on the provider."""
         # API key presence is already checked in __init__
-        provider_name = self.provider_config.provider_name
+        provider_name = self._provider_name
         api_key = self.provider_config.get_api_key()
 
+        cached = _SDK_CLIENTS.get((provider_name, api_key))
+        if cached is not None:
+            self.client_instance, sdk_errors = cached
+            self._set_sdk_errors(*sdk_errors)
+            logger.debug("Reusing %s SDK client for model %s.", provider_name, self.model_name)
+            return
+
+        adapter = self._adapter
+        if adapter is None:
+            logger.error("SDK client initialization not implemented for provider: %s", provider_name)
+            raise LLMClientInitializationError(f"SDK client for provider '{provider_name}' is not implemented.")
+        name = adapter.display_name
+
         try:
-            if provider_name == "openai":
-                try:
-                    from openai import OpenAI, APIConnectionError as OpenAIAPIConnectionError, RateLimitError as OpenAIRateLimitError, AuthenticationError as OpenAIAuthenticationError, APIError as OpenAIAPIError
-                    self.client_instance = OpenAI(api_key=api_key)
-                    logger.info(f"OpenAI client initialized successfully for model {self.model_name}.")
-                except ImportError:
-                    logger.error("OpenAI SDK not found. Please install it: pip install openai")
-                    raise LLMClientInitializationError("OpenAI SDK not installed.")
-                except OpenAIAuthenticationError as e:
-                    logger.error(f"OpenAI authentication failed: {e}")
-                    raise LLMAuthenticationError(f"OpenAI authentication failed: {e}") from e
-                except OpenAIRateLimitError as e:
-                    logger.error(f"OpenAI rate limit exceeded during client initialization (or first call): {e}")
-                    raise LLMRateLimitError(f"OpenAI rate limit hit: {e}") from e
-                except OpenAIAPIConnectionError as e:
-                    logger.error(f"OpenAI API connection error: {e}")
-                    raise LLMAPIError(f"OpenAI API connection error: {e}") from e
-                except OpenAIAPIError as e:
-                    logger.error(f"OpenAI API error during client initialization: {e}")
-                    raise LLMAPIError(f"OpenAI API error: {e}") from e
-
-            elif provider_name == "anthropic":
-                try:
-                    from anthropic import Anthropic, APIConnectionError as AnthropicAPIConnectionError, RateLimitError as AnthropicRateLimitError, AuthenticationError as AnthropicAuthenticationError, APIError as AnthropicAPIError # type: ignore[import-not-found]
-                    self.client_instance = Anthropic(api_key=api_key)
-                    logger.info(f"Anthropic client initialized successfully for model {self.model_name}.")
-                except ImportError:
-                    logger.error("Anthropic SDK not found. Please install it: pip install anthropic")
-                    raise LLMClientInitializationError("Anthropic SDK not installed.")
-                except AnthropicAuthenticationError as e:
-                    logger.error(f"Anthropic authentication failed: {e}")
-                    raise LLMAuthenticationError(f"Anthropic authentication failed: {e}") from e
-                except AnthropicRateLimitError as e:
-                    logger.error(f"Anthropic rate limit exceeded during client initialization: {e}")
-                    raise LLMRateLimitError(f"Anthropic rate limit hit: {e}") from e
-                except AnthropicAPIConnectionError as e:
-                    logger.error(f"Anthropic API connection error: {e}")
-                    raise LLMAPIError(f"Anthropic API connection error: {e}") from e
-                except AnthropicAPIError as e:
-                    logger.error(f"Anthropic API error during client initialization: {e}")
-                    raise LLMAPIError(f"Anthropic API error: {e}") from e
-            elif provider_name == "groq":
-                try:
-                    from groq import Groq, APIConnectionError as GroqAPIConnectionError, RateLimitError as GroqRateLimitError, AuthenticationError as GroqAuthenticationError, APIError as GroqAPIError # type: ignore[import-not-found]
-                    self.client_instance = Groq(api_key=api_key)
-                    logger.info(f"Groq client initialized successfully for model {self.model_name}.")
-                except ImportError:
-                    logger.error("Groq SDK not found. Please install it: pip install groq")
-                    raise LLMClientInitializationError("Groq SDK not installed.")
-                except GroqAuthenticationError as e:
-                    logger.error(f"Groq authentication failed: {e}")
-                    raise LLMAuthenticationError(f"Groq authentication failed: {e}") from e
-                except GroqRateLimitError as e:
-                    logger.error(f"Groq rate limit exceeded during client initialization: {e}")
-                    raise LLMRateLimitError(f"Groq rate limit hit: {e}") from e
-                except GroqAPIConnectionError as e:
-                    logger.error(f"Groq API connection error: {e}")
-                    raise LLMAPIError(f"Groq API connection error: {e}") from e
-                except GroqAPIError as e:
-                    logger.error(f"Groq API error during client initialization: {e}")
-                    raise LLMAPIError(f"Groq API error: {e}") from e
-            else:
-                logger.error(f"SDK client initialization not implemented for provider: {provider_name}")
-                raise LLMClientInitializationError(f"SDK client for provider '{provider_name}' is not implemented.")
-        
+            try:
+                sdk = importlib.import_module(adapter.sdk_module)
+                self._set_sdk_errors(sdk.AuthenticationError, sdk.RateLimitError, sdk.APIConnectionError, sdk.APIError)
+                provider_config = self.provider_config
+                client_kwargs: Dict[str, Any] = {
+                    "api_key": api_key,
+                    "timeout": _sdk_timeout(provider_config.timeout_s, provider_config.connect_timeout_s),
+                    "max_retries": 0, # _complete_with_retries owns retries; SDK retries would multiply them
+                }
+                http_client = _shared_http_client()
+                if http_client is not None:
+                    client_kwargs["http_client"] = http_client
+                self.client_instance = getattr(sdk, adapter.client_class)(**client_kwargs)
+                logger.info("%s client initialized successfully for model %s.", name, self.model_name)
+            except ImportError:
+                logger.error("%s SDK not found. Please install it: pip install %s", name, adapter.sdk_module)
+                raise LLMClientInitializationError(f"{name} SDK not installed.")
+            except self._auth_error as e:
+                logger.error("%s authentication failed: %s", name, e)
+                raise LLMAuthenticationError(f"{name} authentication failed: {e}") from e
+            except self._rate_limit_error as e:
+                logger.error("%s rate limit exceeded during client initialization: %s", name, e)
+                raise LLMRateLimitError(f"{name} rate limit hit: {e}") from e
+            except self._connection_error as e:
+                logger.error("%s API connection error: %s", name, e)
+                raise LLMConnectionError(f"{name} API connection error: {e}") from e
+            except self._api_error as e:
+                logger.error("%s API error during client initialization: %s", name, e)
+                raise LLMAPIError(f"{name} API error: {e}") from e
+
+            _SDK_CLIENTS[(provider_name, api_key)] = (
+                self.client_instance,
+                (self._auth_error, self._rate_limit_error, self._connection_error, self._api_error),
+            )
         except LLMError: # Re-raise our custom errors
             raise
         except Exception as e: # Catch any other unexpected errors during import or init
-            logger.error(f"Failed to initialize SDK client for {provider_name} due to an unexpected error: {e}", exc_info=True)
+            logger.error("Failed to initialize SDK client for %s due to an unexpected error: %s", provider_name, e, exc_info=True)
             raise LLMClientInitializationError(f"Unexpected error initializing SDK for {provider_name}: {e}") from e
 
+    def start_warmup(self) -> None:
+        """Validate the API key and open a connection in a background thread.
+
+        Listing the provider's models is cheap, so this can overlap with other work
+        such as text extraction. The first request waits up to _WARMUP_JOIN_TIMEOUT_S
+        for it to finish, and fails fast if the key was rejected.
+        """
+        if self._warmup_thread is not None:
+            return
+        self._warmup_thread = threading.Thread(target=self._warmup, name="scipfs-llm-warmup", daemon=True)
+        self._warmup_thread.start()
+
+    def _warmup(self) -> None:
+        try:
+            with self._translate_sdk_errors("warm-up"):
+                self.client_instance.models.list()
+            logger.debug("%s client warmed up.", self._provider_name)
+        except LLMAPIKeyError as e:
+            self._warmup_error = e
+        except LLMError as e: # Anything else is left for the real request to hit and retry
+            logger.debug("%s warm-up failed: %s", self._provider_name, e)
+
+    def _wait_for_warmup(self) -> None:
+        thread = self._warmup_thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=_WARMUP_JOIN_TIMEOUT_S)
+        if self._warmup_error is not None:
+            raise self._warmup_error
+
+    def _translate_error(self, error: Exception, operation: str) -> LLMError:
+        """Map a provider SDK exception to the matching LLMError; `operation` is only used in messages."""
+        name = self._adapter.display_name
+        for klass in type(error).__mro__: # Most specific SDK class first, e.g. RateLimitError before APIError
+            entry = self._error_map.get(klass)
+            if entry is not None:
+                error_cls, label, template = entry
+                if error_cls is LLMAPIError and _is_transient_status(error):
+                    error_cls, label, template = LLMServerError, "server error", "Server error with %s: %s"
+                logger.error("%s %s during %s: %s", name, label, operation, error)
+                return error_cls(template % (name, error))
+        logger.error("Unexpected error during %s %s: %s", name, operation, error, exc_info=True)
+        return LLMAPIError("Unexpected error with %s %s: %s" % (name, operation, error))
+
+    @contextlib.contextmanager
+    def _translate_sdk_errors(self, operation: str) -> Iterator[None]:
+        """Raise provider SDK exceptions from the wrapped block as LLMErrors."""
+        try:
+            yield
+        except LLMError:
+            raise
+        except Exception as e:
+            raise self._translate_error(e, operation) from e
+
+    def _input_token_budget(self, max_tokens: int) -> int:
+        """Tokens of document text allowed in one request.
+
+        llm_config.max_input_tokens, further limited by the provider's configured
+        context window (which describes its default model) minus the output
+        tokens and the prompt template.
+        """
+        budget = get_llm_config().max_input_tokens
+        context_window = self.provider_config.context_window
+        if context_window and self.model_name == self.provider_config.default_model:
+            budget = min(budget, context_window - max_tokens - _PROMPT_OVERHEAD_TOKENS)
+        return max(1, budget)
+
+    def _truncate_input(self, text: str, max_tokens: int, num_documents: int = 1) -> str:
+        """Cut text down to the input token budget so oversized inputs never reach the provider.
+
+        A batch prompt carrying num_documents documents gives each an equal share of the budget.
+        """
+        max_input_tokens = max(1, self._input_token_budget(max_tokens) // num_documents)
+        if len(text) * 4 <= max_input_tokens: # At most 4 UTF-8 bytes per char and >= 1 byte per token
+            return text
+        encoding = _load_encoding(self._provider_name, self.model_name)
+        if encoding is None:
+            limit = max_input_tokens * _CHARS_PER_TOKEN
+            if len(text) <= limit:
+                return text
+            truncated = text[:limit]
+        else:
+            tokens = encoding.encode(text)
+            if len(tokens) <= max_input_tokens:
+                return text
+            truncated = encoding.decode(tokens[:max_input_tokens])
+        logger.warning("Input text truncated to about %d tokens for %s model %s.", max_input_tokens, self._provider_name, self.model_name)
+        return truncated
+
+    def _get_cached_response(self, cache_key: bytes) -> Any:
+        """Look a response up in the in-memory cache, then the on-disk cache."""
+        value = _RESPONSE_CACHE.get(cache_key)
+        if value is None:
+            disk_cache = _get_disk_cache()
+            if disk_cache is not None:
+                value = disk_cache.get(cache_key)
+                if isinstance(value, list): # JSON round trip turned a tags tuple into a list
+                    value = tuple(value)
+                if value is not None:
+                    _RESPONSE_CACHE.put(cache_key, value)
+        return value
+
+    def _store_response(self, cache_key: bytes, kind: str, value: Any) -> None:
+        _RESPONSE_CACHE.put(cache_key, value)
+        disk_cache = _get_disk_cache()
+        if disk_cache is not None:
+            disk_cache.put(cache_key, self.model_name, kind, value)
+
+    def _acquire_rate_limit(self) -> None:
+        llm_config = get_llm_config()
+        rate = self.provider_config.rate_limit_rps
+        if rate is None:
+            rate = llm_config.rate_limit_rps
+        _get_rate_limiter(self._provider_name, self.model_name, rate, llm_config.rate_limit_burst).acquire()
+
+    def _complete(self, operation: str, system_prompt: str, prompt: str, max_tokens: int, temperature: float, response_format: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """Send one system + user prompt through the provider adapter and return the raw text content.
+
+        Requests are paced by the per-(provider, model) token bucket, and rate-limit,
+        connection and transient server errors are retried with exponential backoff up to
+        max_retries times (the provider's override, else llm_config.max_retries). If the
+        provider still fails with one of them, the request is retried on each provider in
+        llm_config.failover_chain in turn.
+        """
+        return self._complete_with_failover(operation, system_prompt, prompt, max_tokens, temperature, response_format)[0]
+
+    def _complete_with_failover(self, operation: str, system_prompt: str, prompt: str, max_tokens: int, temperature: float, response_format: Optional[Dict[str, str]] = None) -> Tuple[Optional[str], "LLMClient"]:
+        """Like _complete, but also return the client that answered: self, or a failover provider's client."""
+        try:
+            return self._complete_with_retries(operation, system_prompt, prompt, max_tokens, temperature, response_format), self
+        except _RETRYABLE_ERRORS as e:
+            last_error = e
+        for fallback in self._failover_clients():
+            logger.warning("%s failed during %s (%s); failing over to %s.", self._provider_name, operation, last_error, fallback._provider_name)
+            # JSON mode only if the fallback's own model accepts it
+            fallback_format = fallback._tags_response_format() if response_format is not None else None
+            try:
+                return fallback._complete_with_retries(operation, system_prompt, prompt, max_tokens, temperature, fallback_format), fallback
+            except _RETRYABLE_ERRORS as e:
+                last_error = e
+        raise last_error
+
+    def _failover_clients(self) -> Iterator["LLMClient"]:
+        """Clients for the usable providers in llm_config.failover_chain, other than this one."""
+        for provider_name in get_llm_config().failover_chain:
+            if provider_name.lower() == self._provider_name:
+                continue
+            try:
+                yield get_llm_client(provider_name)
+            except LLMError as e: # Unknown provider, missing key or SDK; try the next one
+                logger.debug("Skipping failover provider %s: %s", provider_name, e)
+
+    def _complete_with_retries(self, operation: str, system_prompt: str, prompt: str, max_tokens: int, temperature: float, response_format: Optional[Dict[str, str]] = None) -> Optional[str]:
+        adapter = self._adapter
+        max_retries = self.provider_config.max_retries
+        if max_retries is None:
+            max_retries = get_llm_config().max_retries
+        self._wait_for_warmup()
+        for attempt in range(max_retries + 1):
+            self._acquire_rate_limit()
+            try:
+                with self._translate_sdk_errors(operation):
+                    return adapter.call(self.client_instance, self.model_name, system_prompt, prompt, max_tokens, temperature, response_format)
+            except _RETRYABLE_ERRORS as e:
+                if attempt >= max_retries:
+                    raise
+                delay = 2 ** attempt + random.random()
+                logger.warning("%s during %s; retrying in %.1fs (retry %d of %d).", type(e).__name__, operation, delay, attempt + 1, max_retries)
+                time.sleep(delay)
+        return None # Not reached; the last attempt either returns or raises
+
+    def _stream(self, operation: str, system_prompt: str, prompt: str, max_tokens: int, temperature: float, response_format: Optional[Dict[str, str]] = None) -> Iterator[str]:
+        """Like _complete, but yield text deltas as the provider streams them."""
+        adapter = self._adapter
+        self._wait_for_warmup()
+        self._acquire_rate_limit()
+        with self._translate_sdk_errors(operation):
+            yield from adapter.stream(self.client_instance, self.model_name, system_prompt, prompt, max_tokens, temperature, response_format)
+
+    def _stream_json_list(self, operation: str, system_prompt: str, prompt: str, max_tokens: int, temperature: float, response_format: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """Stream a response and stop reading as soon as a complete top-level JSON list has arrived."""
+        buffer = ""
+        deltas = self._stream(operation, system_prompt, prompt, max_tokens, temperature, response_format)
+        try:
+            for delta in deltas:
+                buffer += delta
+                if "]" in delta:
+                    end = _json_list_end(buffer)
+                    if end != -1:
+                        return buffer[buffer.index("["):end] # Drop any opening ```json fence
+        finally:
+            deltas.close() # Stops the underlying HTTP stream if we returned early
+        return buffer or None
+
+    def summarize_stream(self, text: str, max_tokens: Optional[int] = None, temperature: Optional[float] = None) -> Iterator[str]:
+        """Like summarize, but yield the summary text incrementally as the provider streams it.
+
+        Callers can write each chunk out as it arrives. A cached summary is yielded
+        as a single chunk, and a fully streamed summary is added to the cache.
+        """
+        self._check_ready("summarize_stream")
+        llm_config = get_llm_config()
+        effective_max_tokens = max_tokens if max_tokens is not None else llm_config.default_max_tokens_summary
+        effective_temperature = temperature if temperature is not None else llm_config.default_temperature
+
+        cache_key = self._summary_cache_key(text, effective_max_tokens, effective_temperature)
+        cached_summary = self._get_cached_response(cache_key)
+        if cached_summary is not None:
+            yield cached_summary
+            return
+
+        parts: List[str] = []
+        prompt = _SUMMARY_USER_TMPL % self._truncate_input(text, effective_max_tokens)
+        for delta in self._stream("summarization", _SUMMARY_SYSTEM, prompt, effective_max_tokens, effective_temperature):
+            parts.append(delta)
+            yield delta
+        summary = "".join(parts).strip()
+        if summary: # Only reached if the caller consumed the whole stream
+            self._store_response(cache_key, "summary", summary)
+
+    def _summary_cache_key(self, text: str, max_tokens: int, temperature: float) -> bytes:
+        return _ResponseCache.make_key("summary", PROMPT_VERSION, self._provider_name, self.model_name, max_tokens, temperature, text)
+
+    def _tags_cache_key(self, text: str, num_tags: int, max_tokens: int, temperature: float) -> bytes:
+        return _ResponseCache.make_key("tags", PROMPT_VERSION, self._provider_name, self.model_name, num_tags, max_tokens, temperature, text)
+
     def summarize(self, text: str, max_tokens: Optional[int] = None, temperature: Optional[float] = None) -> Optional[str]:
         """Generates a concise summary of the given text."""
-        if not self.client_instance or not self.model_name:
-            # This assertion helps mypy understand that provider_config is not None here.
-            assert self.provider_config is not None, "Provider config should be set if client is initialized"
-            logger.error(f"LLM client or model not properly initialized for summarization with provider {self.provider_config.provider_name}.")
-            raise LLMClientInitializationError("Client or model not initialized before calling summarize.")
-        
-        # Additional assertion for clarity, though the one above should cover it.
-        assert self.provider_config is not None, "Provider config must be set here."
+        self._check_ready("summarize")
+        llm_config = get_llm_config()
         effective_max_tokens = max_tokens if max_tokens is not None else llm_config.default_max_tokens_summary
         effective_temperature = temperature if temperature is not None else llm_config.default_temperature
-        
-        provider_name = self.provider_config.provider_name
-        prompt = f"Summarize the following text concisely and informatively:\n\n---\n{text}\n---"
-        
-        logger.info(f"Requesting summary from {provider_name} model {self.model_name} (max_tokens: {effective_max_tokens}, temp: {effective_temperature})")
+        provider_name = self._provider_name
 
-        # Initialize summary to None or a default value
-        summary: Optional[str] = None
+        cache_key = self._summary_cache_key(text, effective_max_tokens, effective_temperature)
+        cached_summary = self._get_cached_response(cache_key)
+        if cached_summary is not None:
+            logger.debug("Using cached summary from %s model %s.", provider_name, self.model_name)
+            return cached_summary
 
-        if provider_name == "openai":
-            try:
-                from openai import OpenAI, RateLimitError as OpenAIRateLimitError, APIConnectionError as OpenAIAPIConnectionError, AuthenticationError as OpenAIAuthenticationError, APIError as OpenAIAPIError
-                response = self.client_instance.chat.completions.create(
-                    model=self.model_name,
-                    messages=[
-                        {"role": "system", "content": "You are a helpful assistant designed to summarize texts accurately and concisely."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=effective_max_tokens,
-                    temperature=effective_temperature
-                )
-                raw_summary = response.choices[0].message.content
-                if raw_summary:
-                    summary = raw_summary.strip()
-                    logger.info(f"OpenAI summary generated successfully. Length: {len(summary) if summary else 0}")
-                else:
-                    logger.warning("OpenAI summarization returned empty content.")
-            except OpenAIAuthenticationError as e:
-                logger.error(f"OpenAI authentication error during summarization: {e}")
-                raise LLMAuthenticationError(f"Authentication failed with OpenAI: {e}") from e
-            except OpenAIRateLimitError as e:
-                logger.error(f"OpenAI rate limit exceeded during summarization: {e}")
-                raise LLMRateLimitError(f"Rate limit exceeded with OpenAI: {e}") from e
-            except OpenAIAPIConnectionError as e:
-                logger.error(f"OpenAI API connection error during summarization: {e}")
-                raise LLMAPIError(f"API connection error with OpenAI: {e}") from e
-            except OpenAIAPIError as e:
-                logger.error(f"OpenAI API error during summarization: {e}")
-                raise LLMAPIError(f"API error with OpenAI: {e}") from e
-            except Exception as e: # Catch any other unexpected errors from this provider's block
-                logger.error(f"Unexpected error during OpenAI summarization: {e}", exc_info=True)
-                raise LLMAPIError(f"Unexpected error with OpenAI summarization: {e}") from e
-        
-        elif provider_name == "anthropic":
-            try:
-                from anthropic import Anthropic, RateLimitError as AnthropicRateLimitError, APIConnectionError as AnthropicAPIConnectionError, AuthenticationError as AnthropicAuthenticationError, APIError as AnthropicAPIError # type: ignore[import-not-found]
-                response = self.client_instance.messages.create(
-                    model=self.model_name,
-                    max_tokens=effective_max_tokens,
-                    temperature=effective_temperature,
-                    system="You are a helpful assistant designed to summarize texts accurately and concisely.",
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                raw_summary = response.content[0].text if response.content and response.content[0].text else None
-                if raw_summary:
-                    summary = raw_summary.strip()
-                    logger.info(f"Anthropic summary generated successfully. Length: {len(summary) if summary else 0}")
-                else:
-                    logger.warning("Anthropic summarization returned empty content.")
-            except AnthropicAuthenticationError as e:
-                logger.error(f"Anthropic authentication error during summarization: {e}")
-                raise LLMAuthenticationError(f"Authentication failed with Anthropic: {e}") from e
-            except AnthropicRateLimitError as e:
-                logger.error(f"Anthropic rate limit exceeded during summarization: {e}")
-                raise LLMRateLimitError(f"Rate limit exceeded with Anthropic: {e}") from e
-            except AnthropicAPIConnectionError as e:
-                logger.error(f"Anthropic API connection error during summarization: {e}")
-                raise LLMAPIError(f"API connection error with Anthropic: {e}") from e
-            except AnthropicAPIError as e:
-                logger.error(f"Anthropic API error during summarization: {e}")
-                raise LLMAPIError(f"API error with Anthropic: {e}") from e
-            except Exception as e:
-                logger.error(f"Unexpected error during Anthropic summarization: {e}", exc_info=True)
-                raise LLMAPIError(f"Unexpected error with Anthropic summarization: {e}") from e
-
-        elif provider_name == "groq":
-            try:
-                from groq import Groq, RateLimitError as GroqRateLimitError, APIConnectionError as GroqAPIConnectionError, AuthenticationError as GroqAuthenticationError, APIError as GroqAPIError # type: ignore[import-not-found]
-                response = self.client_instance.chat.completions.create(
-                    model=self.model_name,
-                    messages=[
-                        {"role": "system", "content": "You are a helpful assistant designed to summarize texts accurately and concisely."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=effective_max_tokens,
-                    temperature=effective_temperature
-                )
-                raw_summary = response.choices[0].message.content
-                if raw_summary:
-                    summary = raw_summary.strip()
-                    logger.info(f"Groq summary generated successfully. Length: {len(summary) if summary else 0}")
-                else:
-                    logger.warning("Groq summarization returned empty content.")
-            except GroqAuthenticationError as e:
-                logger.error(f"Groq authentication error during summarization: {e}")
-                raise LLMAuthenticationError(f"Authentication failed with Groq: {e}") from e
-            except GroqRateLimitError as e:
-                logger.error(f"Groq rate limit exceeded during summarization: {e}")
-                raise LLMRateLimitError(f"Rate limit exceeded with Groq: {e}") from e
-            except GroqAPIConnectionError as e:
-                logger.error(f"Groq API connection error during summarization: {e}")
-                raise LLMAPIError(f"API connection error with Groq: {e}") from e
-            except GroqAPIError as e:
-                logger.error(f"Groq API error during summarization: {e}")
-                raise LLMAPIError(f"API error with Groq: {e}") from e
-            except Exception as e:
-                logger.error(f"Unexpected error during Groq summarization: {e}", exc_info=True)
-                raise LLMAPIError(f"Unexpected error with Groq summarization: {e}") from e
+        if llm_config.enable_chunked_summary and len(text) > llm_config.summary_chunk_chars:
+            # Map-reduce: summarize each chunk, then summarize the combined partial summaries below
+            chunks = _chunk_text(text, llm_config.summary_chunk_chars, llm_config.summary_chunk_overlap)
+            logger.info("Text is %d chars; summarizing %d chunks before combining.", len(text), len(chunks))
+            partial_summaries = self.summarize_batch(chunks, max_tokens=effective_max_tokens, temperature=effective_temperature)
+            text = "\n\n".join(partial_summaries)
+
+        prompt = _SUMMARY_USER_TMPL % self._truncate_input(text, effective_max_tokens)
+
+        logger.info("Requesting summary from %s model %s (max_tokens: %s, temp: %s)", provider_name, self.model_name, effective_max_tokens, effective_temperature)
+
+        summary: Optional[str] = None
+        raw_summary, answered_by = self._complete_with_failover(
+            "summarization", _SUMMARY_SYSTEM, prompt, effective_max_tokens, effective_temperature
+        )
+        if raw_summary:
+            summary = raw_summary.strip()
+            logger.info("%s summary generated successfully. Length: %d", answered_by._provider_name, len(summary))
+            if answered_by is self: # A failover provider's answer isn't cached under this model's key
+                self._store_response(cache_key, "summary", summary)
         else:
-            logger.warning(f"Summarization not implemented for provider: {provider_name}")
-            return f"Placeholder summary for provider {provider_name}. Text: {text[:100]}..." # Or return None / raise error
+            logger.warning("%s summarization returned empty content.", provider_name)
 
         return summary # Return the potentially None summary
 
-    def generate_tags(self, text: str, num_tags: Optional[int] = None, max_tokens: Optional[int] = None, temperature: Optional[float] = None) -> Optional[List[str]]:
-        """Generates a list of relevant keywords/tags for the given text."""
-        if not self.client_instance or not self.model_name:
-            # This assertion helps mypy understand that provider_config is not None here.
-            assert self.provider_config is not None, "Provider config should be set if client is initialized"
-            logger.error(f"LLM client or model not properly initialized for tag generation with provider {self.provider_config.provider_name}.")
-            raise LLMClientInitializationError("Client or model not initialized before calling generate_tags.")
-        
-        # Additional assertion for clarity.
-        assert self.provider_config is not None, "Provider config must be set here."
+    def generate_tags(self, text: str, num_tags: Optional[int] = None, max_tokens: Optional[int] = None, temperature: Optional[float] = None, stream: bool = False) -> Optional[List[str]]:
+        """Generates a list of relevant keywords/tags for the given text.
+
+        With stream=True the response is streamed and the request is cut off as soon as
+        the JSON list is complete, instead of waiting for the model to finish.
+        """
+        self._check_ready("generate_tags")
+        llm_config = get_llm_config()
         effective_num_tags = num_tags if num_tags is not None else llm_config.default_num_tags
         effective_max_tokens = max_tokens if max_tokens is not None else llm_config.default_max_tokens_tags
         effective_temperature = temperature if temperature is not None else llm_config.default_temperature
-        provider_name = self.provider_config.provider_name
+        provider_name = self._provider_name
 
-        prompt = (
-            f"Extract exactly {effective_num_tags} highly relevant and distinct keywords or short phrases (tags) from the following text. "
-            f"Format the output STRICTLY as a JSON list of strings. For example: [\"keyword1\", \"short phrase tag\", \"concept3\"]. "
-            f"Ensure the output is ONLY the JSON list and nothing else.\n\n---\nText: {text}\n---"
-        )
-        
-        logger.info(f"Requesting tags from {provider_name} model {self.model_name} (num_tags: {effective_num_tags}, max_tokens: {effective_max_tokens}, temp: {effective_temperature})")
-        
-        import json # For parsing
-        raw_content: Optional[str] = None
-        tags_result: Optional[List[str]] = None
+        cache_key = self._tags_cache_key(text, effective_num_tags, effective_max_tokens, effective_temperature)
+        cached_tags = self._get_cached_response(cache_key)
+        if cached_tags is not None:
+            logger.debug("Using cached tags from %s model %s.", provider_name, self.model_name)
+            return list(cached_tags)
 
-        if provider_name == "openai":
-            try:
-                from openai import OpenAI, RateLimitError as OpenAIRateLimitError, APIConnectionError as OpenAIAPIConnectionError, AuthenticationError as OpenAIAuthenticationError, APIError as OpenAIAPIError
-                # For newer OpenAI models that support JSON mode explicitly:
-                openai_response_format_arg: Optional[Dict[str, str]] = {"type": "json_object"}
-                # Check if model might be older and not support json_object type, then don't pass it.
-                # This is a simple check; a more robust solution might involve a config per model.
-                if "gpt-3.5-turbo-0125" not in self.model_name and "gpt-4" not in self.model_name : # example check
-                    logger.warning(f"Model {self.model_name} may not support strict JSON mode. Prompting for JSON without forcing response_format.")
-                    openai_response_format_arg = None # Or don't include it in create()
-
-                openai_api_params: Dict[str, Any] = {
-                    "model": self.model_name,
-                    "messages": [
-                        {"role": "system", "content": "You are an expert at extracting keywords and tags. You always output a valid JSON list of strings, and nothing else."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "max_tokens": effective_max_tokens,
-                    "temperature": effective_temperature
-                }
-                if openai_response_format_arg: # Only add if we decided to use it
-                    openai_api_params["response_format"] = openai_response_format_arg
-                
-                response = self.client_instance.chat.completions.create(**openai_api_params)
-                raw_content = response.choices[0].message.content
-            except OpenAIAuthenticationError as e:
-                logger.error(f"OpenAI authentication error during tag generation: {e}")
-                raise LLMAuthenticationError(f"Authentication failed with OpenAI: {e}") from e
-            except OpenAIRateLimitError as e:
-                logger.error(f"OpenAI rate limit exceeded during tag generation: {e}")
-                raise LLMRateLimitError(f"Rate limit exceeded with OpenAI: {e}") from e
-            except OpenAIAPIConnectionError as e:
-                logger.error(f"OpenAI API connection error during tag generation: {e}")
-                raise LLMAPIError(f"API connection error with OpenAI: {e}") from e
-            except OpenAIAPIError as e:
-                logger.error(f"OpenAI API error during tag generation: {e}")
-                raise LLMAPIError(f"API error with OpenAI: {e}") from e
-            except Exception as e:
-                logger.error(f"Unexpected error during OpenAI tag generation: {e}", exc_info=True)
-                raise LLMAPIError(f"Unexpected error with OpenAI tag generation: {e}") from e
-
-        elif provider_name == "anthropic":
-            try:
-                from anthropic import Anthropic, RateLimitError as AnthropicRateLimitError, APIConnectionError as AnthropicAPIConnectionError, AuthenticationError as AnthropicAuthenticationError, APIError as AnthropicAPIError # type: ignore[import-not-found]
-                # Anthropic doesn't have a direct JSON mode like OpenAI's `response_format`.
-                # Relies more heavily on the prompt for JSON structure.
-                response = self.client_instance.messages.create(
-                    model=self.model_name,
-                    max_tokens=effective_max_tokens,
-                    temperature=effective_temperature,
-                    system="You are an expert at extracting keywords and tags. You always output a valid JSON list of strings, and nothing else. Your entire response should be ONLY the JSON list.",
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                raw_content = response.content[0].text if response.content and response.content[0].text else None
-            except AnthropicAuthenticationError as e:
-                logger.error(f"Anthropic authentication error during tag generation: {e}")
-                raise LLMAuthenticationError(f"Authentication failed with Anthropic: {e}") from e
-            except AnthropicRateLimitError as e:
-                logger.error(f"Anthropic rate limit exceeded during tag generation: {e}")
-                raise LLMRateLimitError(f"Rate limit exceeded with Anthropic: {e}") from e
-            except AnthropicAPIConnectionError as e:
-                logger.error(f"Anthropic API connection error during tag generation: {e}")
-                raise LLMAPIError(f"API connection error with Anthropic: {e}") from e
-            except AnthropicAPIError as e:
-                logger.error(f"Anthropic API error during tag generation: {e}")
-                raise LLMAPIError(f"API error with Anthropic: {e}") from e
-            except Exception as e:
-                logger.error(f"Unexpected error during Anthropic tag generation: {e}", exc_info=True)
-                raise LLMAPIError(f"Unexpected error with Anthropic tag generation: {e}") from e
-
-        elif provider_name == "groq":
-            try:
-                from groq import Groq, RateLimitError as GroqRateLimitError, APIConnectionError as GroqAPIConnectionError, AuthenticationError as GroqAuthenticationError, APIError as GroqAPIError # type: ignore[import-not-found]
-                # Groq API is OpenAI compatible, including response_format for JSON
-                groq_response_format_arg: Optional[Dict[str, str]] = {"type": "json_object"}
-                # No complex model check needed here as Mixtral via Groq generally supports this.
-
-                groq_api_params: Dict[str, Any] = {
-                    "model": self.model_name,
-                    "messages": [
-                        {"role": "system", "content": "You are an expert at extracting keywords and tags. You always output a valid JSON list of strings, and nothing else."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "max_tokens": effective_max_tokens,
-                    "temperature": effective_temperature,
-                }
-                if groq_response_format_arg: # Ensure this is correctly intended; Groq uses response_format directly in params usually
-                    groq_api_params["response_format"] = groq_response_format_arg
-
-                response = self.client_instance.chat.completions.create(**groq_api_params)
-                raw_content = response.choices[0].message.content
-            except GroqAuthenticationError as e:
-                logger.error(f"Groq authentication error during tag generation: {e}")
-                raise LLMAuthenticationError(f"Authentication failed with Groq: {e}") from e
-            except GroqRateLimitError as e:
-                logger.error(f"Groq rate limit exceeded during tag generation: {e}")
-                raise LLMRateLimitError(f"Rate limit exceeded with Groq: {e}") from e
-            except GroqAPIConnectionError as e:
-                logger.error(f"Groq API connection error during tag generation: {e}")
-                raise LLMAPIError(f"API connection error with Groq: {e}") from e
-            except GroqAPIError as e:
-                logger.error(f"Groq API error during tag generation: {e}")
-                raise LLMAPIError(f"API error with Groq: {e}") from e
-            except Exception as e:
-                logger.error(f"Unexpected error during Groq tag generation: {e}", exc_info=True)
-                raise LLMAPIError(f"Unexpected error with Groq tag generation: {e}") from e
+        # Built only on a cache miss; truncation may need to tokenize the whole text
+        prompt = _TAGS_USER_TMPL % (effective_num_tags, self._truncate_input(text, effective_max_tokens))
+
+        logger.info("Requesting tags from %s model %s (num_tags: %s, max_tokens: %s, temp: %s)", provider_name, self.model_name, effective_num_tags, effective_max_tokens, effective_temperature)
+
+        response_format = self._tags_response_format()
+        # Without a JSON mode we rely more heavily on the prompt for JSON structure.
+        system_prompt = _TAGS_SYSTEM if response_format else _TAGS_SYSTEM_NO_JSON_MODE
+
+        if stream:
+            raw_content, answered_by = self._stream_json_list("tag generation", system_prompt, prompt, effective_max_tokens, effective_temperature, response_format), self
         else:
-            logger.warning(f"Tag generation not implemented for provider: {provider_name}")
-            return [f"placeholder_tag_{i+1}_{provider_name}" for i in range(effective_num_tags)] # Or return None
+            raw_content, answered_by = self._complete_with_failover("tag generation", system_prompt, prompt, effective_max_tokens, effective_temperature, response_format)
+        tags_result = self._parse_tags(raw_content, effective_num_tags)
 
+        if answered_by is self: # A failover provider's answer isn't cached under this model's key
+            self._store_response(cache_key, "tags", tuple(tags_result)) # Immutable so callers can't alter the cached copy
+        return tags_result
+
+    def _tags_response_format(self) -> Optional[Dict[str, str]]:
+        """JSON mode request option for tag generation, or None if the provider/model lacks it."""
+        if not self._adapter.supports_json_mode:
+            return None
+        json_mode_models = self._adapter.json_mode_models
+        if json_mode_models is None or self.model_name in json_mode_models:
+            return {"type": "json_object"}
+        logger.warning("Model %s may not support strict JSON mode. Prompting for JSON without forcing response_format.", self.model_name)
+        return None
+
+    def _parse_tags(self, raw_content: Optional[str], num_tags: Optional[int] = None) -> List[str]:
+        """Parse a tag generation response into a list of strings, raising LLMResponseFormatError otherwise.
+
+        If num_tags is given, extra tags beyond it are dropped.
+        """
+        provider_name = self._provider_name
         if not raw_content:
-            logger.error(f"LLM ({provider_name}) returned empty content for tag generation.")
-            # This specific error should be raised *after* the try-except for the API call
+            logger.error("LLM (%s) returned empty content for tag generation.", provider_name)
+            # This specific error should be raised *after* the API call
             # as an API error might be the cause of empty content, and should be caught first.
             raise LLMResponseFormatError(f"{provider_name} returned empty content for tags.")
 
         # Robust JSON parsing (common to all providers if they return raw_content)
         try:
-            # Sometimes LLMs wrap JSON in ```json ... ```, try to strip it.
-            if raw_content.strip().startswith("```json"):
-                cleaned_content = raw_content.strip()[7:-3].strip() # Remove ```json and ```
-            elif raw_content.strip().startswith("```"):
-                 cleaned_content = raw_content.strip()[3:-3].strip() # Remove ```
-            else:
-                cleaned_content = raw_content.strip()
-
-            parsed_json = json.loads(cleaned_content)
+            parsed_json = _parse_tag_json(raw_content)
             if isinstance(parsed_json, list) and all(isinstance(tag, str) for tag in parsed_json):
-                tags_result = parsed_json
-                logger.info(f"{provider_name} tags generated and parsed successfully: {tags_result}")
-            else:
-                logger.error(f"LLM ({provider_name}) returned content that parsed to JSON but not a list of strings: {parsed_json}. Original content: '{raw_content}'")
-                raise LLMResponseFormatError(f"{provider_name} did not return a JSON list of strings. Parsed: {type(parsed_json)}. Content: {raw_content[:200]}...")
+                if num_tags is not None:
+                    parsed_json = parsed_json[:num_tags]
+                logger.info("%s tags generated and parsed successfully: %s", provider_name, parsed_json)
+                return parsed_json
+            logger.error("LLM (%s) returned content that parsed to JSON but not a list of strings: %s. Original content: '%s'", provider_name, parsed_json, raw_content)
+            raise LLMResponseFormatError(f"{provider_name} did not return a JSON list of strings. Parsed: {type(parsed_json)}. Content: {raw_content[:200]}...")
         except json.JSONDecodeError as e_json:
-            logger.error(f"Failed to parse JSON response for tags from {provider_name}. Error: {e_json}. Content: '{raw_content}'")
+            logger.error("Failed to parse JSON response for tags from %s. Error: %s. Content: '%s'", provider_name, e_json, raw_content)
             raise LLMResponseFormatError(f"Failed to parse JSON from {provider_name} for tags. Error: {e_json}. Content: {raw_content[:200]}...") from e_json
         except LLMResponseFormatError: # Re-raise if it was one of our own from above
             raise
         except Exception as e: # Catch any other unexpected error during JSON parsing or validation
-            logger.error(f"Unexpected error processing tags from {provider_name} after receiving content. Error: {e}. Content: '{raw_content}'", exc_info=True)
+            logger.error("Unexpected error processing tags from %s after receiving content. Error: %s. Content: '%s'", provider_name, e, raw_content, exc_info=True)
             raise LLMResponseFormatError(f"Unexpected error processing tags from {provider_name}. Original error: {e}. Content: {raw_content[:200]}...") from e
-            
-        return tags_result
+
+    def _complete_json_list(self, operation: str, system_prompt: str, prompt: str, expected_len: int, max_tokens: int, temperature: float) -> List[Any]:
+        """Run a batch prompt and parse the reply as a JSON list with one entry per document."""
+        provider_name = self._provider_name
+        raw_content = self._complete(operation, system_prompt, prompt, max_tokens, temperature)
+        if not raw_content:
+            raise LLMResponseFormatError(f"{provider_name} returned empty content for batch request.")
+        try:
+            parsed_json = _JSON_DECODER.decode(_strip_json_fence(raw_content))
+        except json.JSONDecodeError as e_json:
+            logger.error("Failed to parse batch JSON response from %s: %s", provider_name, e_json)
+            raise LLMResponseFormatError(f"Failed to parse JSON from {provider_name} for batch. Error: {e_json}. Content: {raw_content[:200]}...") from e_json
+        if not isinstance(parsed_json, list) or len(parsed_json) != expected_len:
+            raise LLMResponseFormatError(f"{provider_name} did not return a JSON list of {expected_len} results. Content: {raw_content[:200]}...")
+        return parsed_json
+
+    def _check_ready(self, operation: str) -> None:
+        if not self.client_instance or not self.model_name:
+            logger.error("LLM client or model not properly initialized for %s with provider %s.", operation, self._provider_name)
+            raise LLMClientInitializationError(f"Client or model not initialized before calling {operation}.")
+
+    def _max_concurrency(self, concurrency: Optional[int]) -> int:
+        if concurrency is None:
+            concurrency = self.provider_config.max_concurrency
+        if concurrency is None:
+            concurrency = get_llm_config().max_concurrency
+        return max(1, concurrency)
+
+    async def _gather_bounded(self, func: Callable[..., Any], texts: List[str], concurrency: Optional[int], **kwargs: Any) -> List[Any]:
+        """Run func(text, **kwargs) for every text in worker threads, at most `concurrency` at a time.
+
+        Each request still passes through the provider's token bucket, so the
+        pool never exceeds the configured request rate.
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrency(concurrency))
+        loop = asyncio.get_running_loop()
+
+        async def run_one(text: str) -> Any:
+            async with semaphore:
+                return await loop.run_in_executor(None, functools.partial(func, text, **kwargs))
+
+        return await asyncio.gather(*(run_one(text) for text in texts), return_exceptions=True)
+
+    def _use_batch_api(self, count: int) -> bool:
+        """Whether `count` documents should go through the provider's batch API."""
+        return bool(
+            self.provider_config.use_batch_api
+            and self._adapter.batch is not None
+            and count >= get_llm_config().batch_api_threshold
+        )
+
+    def _complete_via_batch_api(self, operation: str, system_prompt: str, prompts: List[str], max_tokens: int, temperature: float, response_format: Optional[Dict[str, str]] = None) -> List[Optional[str]]:
+        """Submit prompts as one provider batch job and wait for it; results are in prompt order."""
+        logger.info("Submitting %d %s requests to the %s batch API.", len(prompts), operation, self._provider_name)
+        self._wait_for_warmup()
+        self._acquire_rate_limit()
+        with self._translate_sdk_errors(operation):
+            return self._adapter.batch(self.client_instance, self.model_name, system_prompt, prompts, max_tokens, temperature, response_format)
+
+    def _summarize_via_batch_api(self, texts: List[str], max_tokens: Optional[int], temperature: Optional[float]) -> List[Union[Optional[str], BaseException]]:
+        llm_config = get_llm_config()
+        effective_max_tokens = max_tokens if max_tokens is not None else llm_config.default_max_tokens_summary
+        effective_temperature = temperature if temperature is not None else llm_config.default_temperature
+        prompts = [_SUMMARY_USER_TMPL % self._truncate_input(text, effective_max_tokens) for text in texts]
+        raw_results = self._complete_via_batch_api("batch API summarization", _SUMMARY_SYSTEM, prompts, effective_max_tokens, effective_temperature)
+
+        results: List[Union[Optional[str], BaseException]] = []
+        for text, raw_summary in zip(texts, raw_results):
+            if raw_summary is None:
+                results.append(LLMAPIError(f"{self._provider_name} batch request failed for this document."))
+                continue
+            summary = raw_summary.strip()
+            cache_key = self._summary_cache_key(text, effective_max_tokens, effective_temperature)
+            self._store_response(cache_key, "summary", summary)
+            results.append(summary)
+        return results
+
+    def _generate_tags_via_batch_api(self, texts: List[str], num_tags: Optional[int], max_tokens: Optional[int], temperature: Optional[float]) -> List[Union[Optional[List[str]], BaseException]]:
+        llm_config = get_llm_config()
+        effective_num_tags = num_tags if num_tags is not None else llm_config.default_num_tags
+        effective_max_tokens = max_tokens if max_tokens is not None else llm_config.default_max_tokens_tags
+        effective_temperature = temperature if temperature is not None else llm_config.default_temperature
+        response_format = self._tags_response_format()
+        system_prompt = _TAGS_SYSTEM if response_format else _TAGS_SYSTEM_NO_JSON_MODE
+        prompts = [_TAGS_USER_TMPL % (effective_num_tags, self._truncate_input(text, effective_max_tokens)) for text in texts]
+        raw_results = self._complete_via_batch_api("batch API tag generation", system_prompt, prompts, effective_max_tokens, effective_temperature, response_format)
+
+        results: List[Union[Optional[List[str]], BaseException]] = []
+        for text, raw_content in zip(texts, raw_results):
+            if raw_content is None:
+                results.append(LLMAPIError(f"{self._provider_name} batch request failed for this document."))
+                continue
+            try:
+                tags = self._parse_tags(raw_content, effective_num_tags)
+            except LLMResponseFormatError as e:
+                results.append(e)
+                continue
+            cache_key = self._tags_cache_key(text, effective_num_tags, effective_max_tokens, effective_temperature)
+            self._store_response(cache_key, "tags", tuple(tags))
+            results.append(tags)
+        return results
+
+    async def summarize_many(self, texts: List[str], concurrency: Optional[int] = None, max_tokens: Optional[int] = None, temperature: Optional[float] = None) -> List[Union[Optional[str], BaseException]]:
+        """Summarize documents with up to `concurrency` requests in flight.
+
+        concurrency defaults to the provider's max_concurrency, then llm_config.max_concurrency.
+
+        If the provider config has use_batch_api set and there are at least
+        llm_config.batch_api_threshold documents, they are instead submitted as one
+        provider batch job, which is cheaper but may take a long time to complete.
+
+        Results are in input order; a failed document yields its exception instead of a summary.
+        """
+        if self._use_batch_api(len(texts)):
+            self._check_ready("summarize_many")
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._summarize_via_batch_api, texts, max_tokens, temperature)
+        return await self._gather_bounded(self.summarize, texts, concurrency, max_tokens=max_tokens, temperature=temperature)
+
+    async def generate_tags_many(self, texts: List[str], concurrency: Optional[int] = None, num_tags: Optional[int] = None, max_tokens: Optional[int] = None, temperature: Optional[float] = None) -> List[Union[Optional[List[str]], BaseException]]:
+        """Generate tags for documents with up to `concurrency` requests in flight.
+
+        Uses the provider batch API under the same conditions as summarize_many.
+        Results are in input order; a failed document yields its exception instead of tags.
+        """
+        if self._use_batch_api(len(texts)):
+            self._check_ready("generate_tags_many")
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._generate_tags_via_batch_api, texts, num_tags, max_tokens, temperature)
+        return await self._gather_bounded(self.generate_tags, texts, concurrency, num_tags=num_tags, max_tokens=max_tokens, temperature=temperature)
+
+    def run_many(self, func: Callable[..., Any], texts: List[str], concurrency: Optional[int] = None, **kwargs: Any) -> List[Any]:
+        """Blocking counterpart of summarize_many/generate_tags_many for code without an event loop.
+
+        Example: client.run_many(client.summarize, texts, max_tokens=200)
+        """
+        return asyncio.run(self._gather_bounded(func, texts, concurrency, **kwargs))
+
+    def summarize_batch(self, texts: List[str], batch_size: int = 8, max_tokens: Optional[int] = None, temperature: Optional[float] = None) -> List[str]:
+        """Summarize several documents, packing up to batch_size of them into each API call.
+
+        Returns one summary per input text, in order. max_tokens is per document.
+        Each document is truncated to its share of the input token budget.
+        """
+        self._check_ready("summarize_batch")
+        llm_config = get_llm_config()
+        per_doc_tokens = max_tokens if max_tokens is not None else llm_config.default_max_tokens_summary
+        effective_temperature = temperature if temperature is not None else llm_config.default_temperature
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+
+        summaries: List[str] = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            batch_tokens = per_doc_tokens * len(batch)
+            documents = [self._truncate_input(text, batch_tokens, len(batch)) for text in batch]
+            prompt = _BATCH_SUMMARY_USER_TMPL % (len(batch), len(batch), _format_batch_documents(documents))
+            results = self._complete_json_list(
+                "batch summarization", _BATCH_SUMMARY_SYSTEM, prompt, len(batch), batch_tokens, effective_temperature
+            )
+            if not all(isinstance(summary, str) for summary in results):
+                raise LLMResponseFormatError("Batch summary response is not a JSON list of strings.")
+            summaries.extend(summary.strip() for summary in results)
+        return summaries
+
+    def generate_tags_batch(self, texts: List[str], batch_size: int = 8, num_tags: Optional[int] = None, max_tokens: Optional[int] = None, temperature: Optional[float] = None) -> List[List[str]]:
+        """Generate tags for several documents, packing up to batch_size of them into each API call.
+
+        Returns one list of tags per input text, in order. max_tokens is per document.
+        Each document is truncated to its share of the input token budget.
+        """
+        self._check_ready("generate_tags_batch")
+        llm_config = get_llm_config()
+        effective_num_tags = num_tags if num_tags is not None else llm_config.default_num_tags
+        per_doc_tokens = max_tokens if max_tokens is not None else llm_config.default_max_tokens_tags
+        effective_temperature = temperature if temperature is not None else llm_config.default_temperature
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+
+        all_tags: List[List[str]] = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            batch_tokens = per_doc_tokens * len(batch)
+            documents = [self._truncate_input(text, batch_tokens, len(batch)) for text in batch]
+            prompt = _BATCH_TAGS_USER_TMPL % (len(batch), effective_num_tags, len(batch), _format_batch_documents(documents))
+            results = self._complete_json_list(
+                "batch tag generation", _BATCH_TAGS_SYSTEM, prompt, len(batch), batch_tokens, effective_temperature
+            )
+            for tags in results:
+                if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+                    raise LLMResponseFormatError("Batch tag response is not a JSON list of string lists.")
+                all_tags.append(tags)
+        return all_tags
+
+@functools.lru_cache(maxsize=8)
+def _cached_client(provider_name: Optional[str], model_name: Optional[str], api_key_fingerprint: str) -> LLMClient:
+    # api_key_fingerprint only takes part in the cache key, so a rotated key builds a fresh client
+    return LLMClient(provider_name=provider_name, model_name=model_name)
+
+def get_llm_client(provider_name: Optional[str] = None, model_name: Optional[str] = None) -> LLMClient:
+    """Return a shared LLMClient for the provider/model, constructing it on first use.
+
+    Callers that make many requests should hold on to a single client; this
+    helper gives repeated short-lived callers the same benefit.
+    """
+    llm_config = get_llm_config()
+    provider_config = llm_config.get_provider_config(provider_name) if provider_name else llm_config.get_default_provider()
+    api_key = provider_config.get_api_key() if provider_config else None
+    if not api_key:
+        return LLMClient(provider_name=provider_name, model_name=model_name) # Raises the appropriate LLMError
+    fingerprint = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+    # Key on the resolved provider so a changed default provider doesn't return the old client
+    return _cached_client(provider_config.provider_name, model_name, fingerprint)
 
 def main():
     # Example usage of the LLMClient
@@ -464,6 +1181,7 @@ def main():
     # For testing, ensure mocks are not active if you want to hit actual APIs.
 
     print("Testing LLMClient functionality...")
+    llm_config = get_llm_config()
 
     # Test with default provider (usually OpenAI if key is set)
     try:
@@ -485,7 +1203,7 @@ def main():
     except LLMError as e:
         print(f"LLMError with default provider: {e}")
     except Exception as e:
-        logger.error(f"Unexpected error with default provider: {e}", exc_info=True)
+        logger.error("Unexpected error with default provider: %s", e, exc_info=True)
 
 
     # Test with a specific provider, e.g., Groq (if key is set)
@@ -509,7 +1227,7 @@ def main():
         except LLMError as e:
             print(f"LLMError with {TEST_PROVIDER}: {e}")
         except Exception as e:
-            logger.error(f"Unexpected error with {TEST_PROVIDER} test: {e}", exc_info=True)
+            logger.error("Unexpected error with %s test: %s", TEST_PROVIDER, e, exc_info=True)
     else:
         print(f"{TEST_PROVIDER} provider or its API key not configured. Skipping {TEST_PROVIDER} test.")
 
@@ -520,7 +1238,7 @@ def main():
     except LLMProviderNotFound as e:
         print(f"Caught expected error: {e}")
     except Exception as e:
-        logger.error(f"Caught unexpected error for non_existent_provider: {e}", exc_info=True)
+        logger.error("Caught unexpected error for non_existent_provider: %s", e, exc_info=True)
 
     # Test error handling: API key error (if a provider is configured without a key)
     # This requires a provider in llm_config.yaml that has no API_KEY_ENV set or env var missing
@@ -540,7 +1258,7 @@ def main():
         except LLMProviderNotFound as e: # Should not happen if no_key_provider_config is True
              print(f"LLMProviderNotFound (unexpected here) for {test_provider_no_key_name}: {e}")
         except Exception as e:
-            logger.error(f"Unexpected error for {test_provider_no_key_name} API key test: {e}", exc_info=True)
+            logger.error("Unexpected error for %s API key test: %s", test_provider_no_key_name, e, exc_info=True)
     else:
         print(f"Provider \'{test_provider_no_key_name}\' not configured for API key error test. Skipping.")
 
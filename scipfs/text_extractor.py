@@ -1,69 +1,247 @@
+import hashlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, Union
 import logging
 
+from .llm_cache import ExtractionCache
+
 # Placeholder for actual text extraction libraries
 # Example: import PyPDF2, python-docx, openpyxl, markdown
 
 logger = logging.getLogger(__name__)
 
-SUPPORTED_TEXT_EXTENSIONS = [".pdf", ".txt", ".md", ".py", ".js", ".html", ".css"] # Add more as implemented
-# Consider .docx, .pptx, .xlsx, .json, .xml, .csv etc.
+PathOrEntry = Union[Path, "os.DirEntry[str]"]
+
+# Extensions whose extraction is CPU-bound parsing rather than a plain read;
+# extract_text_many uses worker processes instead of threads when any are present.
+CPU_BOUND_EXTENSIONS = frozenset({".pdf"})
+
+# Files at least this large are decoded straight from a read-only memory map
+# instead of being read into an intermediate bytes object first.
+MMAP_THRESHOLD = 64 * 1024
+
+# Bytes around the first UTF-8 decoding error handed to the encoding detector
+_SNIFF_BYTES = 8192
+
+# Detected encodings keyed by a digest of the sample, least recently used first.
+# Keeping only digests means cached samples don't hold file contents in memory.
+_ENCODING_CACHE: "OrderedDict[bytes, Optional[str]]" = OrderedDict()
+_ENCODING_CACHE_SIZE = 1024
+_ENCODING_CACHE_LOCK = threading.Lock() # extract_text_many decodes on a thread pool
+
+def _detect_encoding(sample: bytes) -> Optional[str]:
+    """Best-guess encoding of sample, or None if it can't be determined.
+
+    Uses charset-normalizer (installed alongside requests) when available.
+    Cached on a digest of the sample, so identical files are only sniffed once.
+    """
+    key = hashlib.blake2b(sample, digest_size=16).digest()
+    with _ENCODING_CACHE_LOCK:
+        if key in _ENCODING_CACHE:
+            _ENCODING_CACHE.move_to_end(key)
+            return _ENCODING_CACHE[key]
+    try:
+        import charset_normalizer
+    except ImportError:
+        return None
+    match = charset_normalizer.from_bytes(sample).best()
+    encoding = match.encoding if match else None
+    with _ENCODING_CACHE_LOCK:
+        _ENCODING_CACHE[key] = encoding
+        if len(_ENCODING_CACHE) > _ENCODING_CACHE_SIZE:
+            _ENCODING_CACHE.popitem(last=False)
+    return encoding
+
+def _decode(data: Union[bytes, mmap.mmap], file_path: Path) -> str:
+    try:
+        return str(data, "utf-8")
+    except UnicodeDecodeError as e:
+        start = max(0, e.start - _SNIFF_BYTES // 2)
+        encoding = _detect_encoding(bytes(data[start:start + _SNIFF_BYTES]))
+    if encoding and encoding not in ("ascii", "utf_8"):
+        try:
+            text = str(data, encoding, "replace")
+            logger.debug("Decoded %s as %s.", file_path, encoding)
+            return text
+        except LookupError: # Detector named a codec Python doesn't have
+            pass
+    logger.warning("%s is not valid UTF-8 and its encoding could not be detected; replacing undecodable bytes.", file_path)
+    return str(data, "utf-8", "replace")
+
+def _read_plain(file_path: Path) -> str:
+    """Read a text file, decoding as UTF-8 or, failing that, the detected encoding."""
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            return _decode(f.read(), file_path)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _decode(mm, file_path) # Decodes from the mapping without a bytes copy
+
+# Extraction handlers by lower-case file suffix; add new ones with @register
+_HANDLERS: Dict[str, Callable[[Path], Optional[str]]] = {}
+SUPPORTED_TEXT_EXTENSIONS: FrozenSet[str] = frozenset()
+
+def register(*suffixes: str) -> Callable[[Callable[[Path], Optional[str]]], Callable[[Path], Optional[str]]]:
+    """Decorator registering a text extraction handler for the given file suffixes.
+
+    Example:
+        @register(".docx")
+        def _extract_docx(file_path: Path) -> Optional[str]: ...
+    """
+    def decorator(handler: Callable[[Path], Optional[str]]) -> Callable[[Path], Optional[str]]:
+        global SUPPORTED_TEXT_EXTENSIONS
+        for suffix in suffixes:
+            _HANDLERS[suffix.lower()] = handler
+        SUPPORTED_TEXT_EXTENSIONS = frozenset(_HANDLERS)
+        return handler
+    return decorator
+
+register(".txt", ".md", ".py", ".js", ".html", ".css")(_read_plain)
+
+@register(".pdf")
+def _extract_pdf(file_path: Path) -> Optional[str]:
+    # Placeholder: Use PyPDF2 or similar
+    # Example:
+    # with open(file_path, 'rb') as f:
+    #     reader = PyPDF2.PdfReader(f)
+    #     return "".join(page.extract_text() for page in reader.pages if page.extract_text())
+    logger.info("Attempting PDF text extraction for %s (not implemented yet).", file_path)
+    return f"Extracted text from PDF: {file_path.name} (Not Implemented Yet)" # Placeholder
 
-def extract_text(file_path: Path) -> Optional[str]:
+# @register(".docx")
+# def _extract_docx(file_path: Path) -> Optional[str]:
+#     # Placeholder: Use python-docx
+#     logger.info("Attempting DOCX text extraction for %s (not implemented yet).", file_path)
+#     return f"Extracted text from DOCX: {file_path.name} (Not Implemented Yet)"
+# Consider .pptx, .xlsx, .json, .xml, .csv etc.
+
+def extract_text(file_path: PathOrEntry, cache: Optional[ExtractionCache] = None) -> Optional[str]:
     """Extracts plain text content from a given file.
 
     Args:
-        file_path: Path object pointing to the file.
+        file_path: Path object pointing to the file, or an os.DirEntry from
+            os.scandir(), whose is_file() answer is already cached.
+        cache: Optional ExtractionCache. Text of files whose mtime and size
+            are unchanged since they were cached is returned without re-reading.
 
     Returns:
         A string containing the extracted text, or None if extraction fails
         or the file type is not supported for text extraction.
     """
     if not file_path.is_file():
-        logger.error(f"File not found for text extraction: {file_path}")
+        logger.error("File not found for text extraction: %s", file_path)
         return None
+    if isinstance(file_path, os.DirEntry):
+        file_path = Path(file_path.path)
+    if cache is None:
+        return _extract_file(file_path)
 
+    try:
+        stat = file_path.stat()
+    except OSError as e:
+        logger.error("Could not stat %s for text extraction: %s", file_path, e)
+        return None
+    text = cache.get(file_path.absolute(), stat)
+    if text is None:
+        text = _extract_file(file_path)
+        if text is not None:
+            cache.put(file_path.absolute(), stat, text)
+    return text
+
+def _extract_file(file_path: Path) -> Optional[str]:
     file_suffix = file_path.suffix.lower()
+    handler = _HANDLERS.get(file_suffix)
 
-    if file_suffix not in SUPPORTED_TEXT_EXTENSIONS:
-        logger.warning(f"Unsupported file type for direct text extraction: {file_suffix}. Will attempt basic read.")
+    if handler is None:
+        logger.warning("Unsupported file type for direct text extraction: %s. Will attempt basic read.", file_suffix)
         # Fallback for unknown but potentially text-based files
         try:
-            return file_path.read_text(encoding='utf-8', errors='ignore')
+            return _read_plain(file_path)
         except Exception as e:
-            logger.error(f"Could not read presumed text file {file_path} as a fallback: {e}")
+            logger.error("Could not read presumed text file %s as a fallback: %s", file_path, e)
             return None
 
     try:
-        if file_suffix == '.pdf':
-            # Placeholder: Use PyPDF2 or similar
-            # Example:
-            # with open(file_path, 'rb') as f:
-            #     reader = PyPDF2.PdfReader(f)
-            #     return "".join(page.extract_text() for page in reader.pages if page.extract_text())
-            logger.info(f"Attempting PDF text extraction for {file_path} (not implemented yet).")
-            return f"Extracted text from PDF: {file_path.name} (Not Implemented Yet)" # Placeholder
-        
-        elif file_suffix in ['.txt', '.md', '.py', '.js', '.html', '.css']: # Add other plain text types
-            return file_path.read_text(encoding='utf-8')
-        
-        # elif file_suffix == '.docx':
-            # Placeholder: Use python-docx
-            # logger.info(f"Attempting DOCX text extraction for {file_path} (not implemented yet).")
-            # return f"Extracted text from DOCX: {file_path.name} (Not Implemented Yet)"
-        
-        # Add more handlers for .pptx, .xlsx, etc.
-        
-        else:
-            # This case should ideally be caught by the initial check, but as a safeguard:
-            logger.warning(f"No specific text extraction handler for supported suffix: {file_suffix}")
-            return file_path.read_text(encoding='utf-8', errors='ignore') # Attempt basic read for listed supported types
-
+        return handler(file_path)
     except Exception as e:
-        logger.error(f"Error extracting text from {file_path}: {e}", exc_info=True)
+        logger.error("Error extracting text from %s: %s", file_path, e, exc_info=True)
         return None
 
+def _iter_entries(paths: Iterable[PathOrEntry]) -> Iterator[PathOrEntry]:
+    """Yield files from paths, expanding directories (non-recursively) with os.scandir."""
+    for path in paths:
+        if not isinstance(path, os.DirEntry) and path.is_dir():
+            with os.scandir(path) as entries:
+                # DirEntry caches the file type from the directory listing, so
+                # extract_text's is_file() check costs no extra stat call.
+                yield from (entry for entry in entries if entry.is_file())
+        else:
+            yield path
+
+def _extract_parallel(entries: List[PathOrEntry], file_paths: List[Path], workers: Optional[int]) -> List[Optional[str]]:
+    if len(entries) <= 1 or workers == 1:
+        return [extract_text(entry) for entry in entries]
+
+    executor: Executor
+    if any(path.suffix.lower() in CPU_BOUND_EXTENSIONS for path in file_paths):
+        executor = ProcessPoolExecutor(max_workers=workers)
+        items: List[PathOrEntry] = list(file_paths) # DirEntry objects can't be pickled
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        items = entries
+    with executor:
+        return list(executor.map(extract_text, items, chunksize=4)) # chunksize amortizes IPC for processes
+
+def extract_text_many(paths: Iterable[PathOrEntry], workers: Optional[int] = None, cache: Optional[ExtractionCache] = None) -> Dict[Path, Optional[str]]:
+    """Extract text from several files in parallel.
+
+    Plain-text files are read on a thread pool. If any file needs CPU-bound
+    parsing (see CPU_BOUND_EXTENSIONS), a process pool is used instead so
+    parsing runs on all cores.
+
+    Args:
+        paths: Files to extract from. Directories are expanded to the files
+            directly inside them.
+        workers: Maximum number of worker threads/processes. Defaults to the
+            executor's own default (os.cpu_count() for processes). 1 disables parallelism.
+        cache: Optional ExtractionCache, consulted before and updated after
+            extraction. Only files that changed since they were cached are read.
+
+    Returns:
+        A dict mapping each file's Path to its extracted text (None on failure),
+        in the order the files were visited.
+    """
+    entries = list(_iter_entries(paths))
+    file_paths = [Path(entry.path) if isinstance(entry, os.DirEntry) else entry for entry in entries]
+    if cache is None:
+        return dict(zip(file_paths, _extract_parallel(entries, file_paths, workers)))
+
+    results: Dict[Path, Optional[str]] = dict.fromkeys(file_paths) # Fixes the result order
+    misses: List[Tuple[PathOrEntry, Path, os.stat_result]] = []
+    for entry, path in zip(entries, file_paths):
+        try:
+            stat = entry.stat()
+        except OSError as e:
+            logger.error("Could not stat %s for text extraction: %s", path, e)
+            continue
+        text = cache.get(path.absolute(), stat)
+        if text is None:
+            misses.append((entry, path, stat))
+        else:
+            results[path] = text
+    if misses:
+        logger.info("Extracting text from %d of %d files; the rest are unchanged and cached.", len(misses), len(entries))
+        texts = _extract_parallel([m[0] for m in misses], [m[1] for m in misses], workers)
+        for (_, path, stat), text in zip(misses, texts):
+            results[path] = text
+            if text is not None:
+                cache.put(path.absolute(), stat, text)
+    return results
+
 if __name__ == '__main__':
     # Example usage (create some dummy files to test)
     logging.basicConfig(level=logging.INFO)
@@ -1,9 +1,16 @@
+from pathlib import Path
+
 from setuptools import setup, find_packages
 
+HERE = Path(__file__).resolve().parent
+README = HERE / "README.md"
+LONG_DESCRIPTION = README.read_text(encoding="utf-8") if README.exists() else ""
+
 setup(
     name="scipfs",
     version="0.1.0",
     packages=find_packages(),
+    package_data={"scipfs": ["providers.json"]},
     install_requires=[
         "click>=8.0",
         "requests>=2.20",
@@ -16,7 +23,7 @@ setup(
     },
     author="The SciPhi Initiative, LLC",
     description="A CLI tool to manage file clusters on IPFS for communities",
-    long_description=open("README.md").read(),
+    long_description=LONG_DESCRIPTION,
     long_description_content_type="text/markdown",
     url="https://github.com/CameronBeebe/scipfs",
     classifiers=[
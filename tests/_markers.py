@@ -0,0 +1,10 @@
+"""Skip decorators shared by the test modules (not a test module)."""
+import os
+import unittest
+
+# Tests that talk to a real IPFS daemon through scipfs_go_helper only run when
+# asked for: SCIPFS_IPFS_TESTS=1 pytest tests/unit
+requires_ipfs = unittest.skipUnless(
+    os.environ.get("SCIPFS_IPFS_TESTS") == "1",
+    "needs a running IPFS daemon and scipfs_go_helper; set SCIPFS_IPFS_TESTS=1 to run",
+)
@@ -0,0 +1,9 @@
+# Runs the scipfs CLI directly, skipping the runpy lookup behind `python -m scipfs.cli`.
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scipfs.cli import cli # noqa: E402
+
+cli(prog_name="scipfs")
@@ -0,0 +1,16 @@
+"""Where the tests put their temporary files (not a test module).
+
+TEST_TMPDIR is SCIPFS_TEST_TMPDIR if set, otherwise RAM-backed /dev/shm, as
+long as that directory exists and is writable; None (the system default temp
+dir) otherwise. Pass it as dir= to tempfile.mkdtemp/mkstemp/TemporaryDirectory.
+"""
+import os
+from typing import Optional
+
+def _test_tmpdir() -> Optional[str]:
+    tmp_dir = os.environ.get("SCIPFS_TEST_TMPDIR", "/dev/shm")
+    if os.path.isdir(tmp_dir) and os.access(tmp_dir, os.W_OK):
+        return tmp_dir
+    return None
+
+TEST_TMPDIR = _test_tmpdir()
@@ -0,0 +1,58 @@
+"""Long-lived scipfs CLI worker for the integration tests (not a test module).
+
+Reads one JSON-encoded argument list per line from stdin, runs it through
+scipfs.cli.cli inside this interpreter, and writes one JSON line back with
+the command's "returncode", "stdout" and "stderr". This way the Python
+startup and scipfs import cost is paid once per test session instead of
+once per command. See run_scipfs_command in test_ipns_lifetime.py.
+"""
+import io
+import json
+import logging
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scipfs.cli import cli # noqa: E402
+
+def run_command(args):
+    out, err = io.StringIO(), io.StringIO()
+    # logging.basicConfig in scipfs.cli bound its handler to the real stderr at import time
+    handlers = [h for h in logging.getLogger().handlers if isinstance(h, logging.StreamHandler)]
+    previous_streams = [h.setStream(err) for h in handlers]
+    returncode = 0
+    try:
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                # standalone_mode (the default) keeps click's own error printing and exit codes
+                cli.main(args=args, prog_name="scipfs", obj={})
+            except SystemExit as e:
+                if e.code is None:
+                    returncode = 0
+                elif isinstance(e.code, int):
+                    returncode = e.code
+                else:
+                    print(e.code, file=sys.stderr)
+                    returncode = 1
+            except Exception:
+                traceback.print_exc()
+                returncode = 1
+    finally:
+        for handler, stream in zip(handlers, previous_streams):
+            handler.setStream(stream)
+    return {"returncode": returncode, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+def main():
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        response = run_command(json.loads(line))
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+if __name__ == "__main__":
+    main()
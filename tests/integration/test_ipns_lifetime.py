@@ -6,41 +6,103 @@ from pathlib import Path
 import json
 import time # For potential cleanup delays or IPNS propagation
 import re
+import atexit
+import functools
+import select
+import tempfile
+import threading
+
+try:
+    import pytest
+    import xdist # noqa: F401 (registers the xdist_group mark)
+    # Keeps each class's tests on one worker under pytest-xdist's --dist loadgroup
+    xdist_group = lambda name: pytest.mark.xdist_group(name=name)
+except ImportError: # Plain unittest run, or pytest without pytest-xdist
+    xdist_group = lambda name: (lambda cls: cls)
 
 # Add project root to sys.path to allow importing scipfs modules if needed
 # (though for CLI testing, direct subprocess calls are primary)
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(PROJECT_ROOT))
 
-# Helper function to run scipfs commands
-def run_scipfs_command(command_args, timeout=60):
-    # Try to use the editable install first, then fallback to installed scipfs
-    # This assumes the tests are run from the project root or similar context
-    # where 'python -m scipfs.cli' would work for an editable install.
-    try:
-        base_command = [sys.executable, "-m", "scipfs.cli"]
-        # Quick check if this module path might work (doesn't guarantee scipfs is runnable this way)
-        # A more robust check might involve trying to import scipfs.cli
-        subprocess.run(base_command + ["--version"], capture_output=True, text=True, check=True, timeout=5)
-        print(f"Using 'python -m scipfs.cli' for commands.")
-    except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-        print(f"Falling back to 'scipfs' command (assuming it's in PATH).")
-        base_command = ["scipfs"]
+from tests._tmpdir import TEST_TMPDIR
+
+# Echo commands and their full output; assertion messages include stderr either way
+_VERBOSE = os.environ.get("SCIPFS_TEST_VERBOSE") == "1"
+
+# Serializes use of the driver and the one-time discovery of the scipfs command
+_COMMAND_LOCK = threading.Lock()
+LAUNCHER_PATH = PROJECT_ROOT / "tests" / "_scipfs_launcher.py"
+
+# Long-lived scipfs_cli_driver.py process shared by all commands, started on first use
+DRIVER_PATH = Path(__file__).resolve().parent / "scipfs_cli_driver.py"
+_DRIVER = None
+_DRIVER_FAILED = False # Set once the driver can't be used; commands then run one process each
+
+def _stop_driver():
+    global _DRIVER
+    if _DRIVER is not None:
+        _DRIVER.stdin.close()
         try:
-            subprocess.run(base_command + ["--version"], capture_output=True, text=True, check=True, timeout=5)
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired) as e:
-            print(f"CRITICAL: Neither 'python -m scipfs.cli' nor 'scipfs' command seem to work. Ensure scipfs is installed and accessible.")
-            print(f"Details: {e}")
-            # This is a fatal error for the test setup
-            raise RuntimeError("SciPFS command not found or not executable.") from e
+            _DRIVER.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            _DRIVER.kill()
+        _DRIVER = None
+
+atexit.register(_stop_driver)
+
+def _run_in_driver(command_args, timeout):
+    """Run a command in the shared driver process.
+
+    Returns a CompletedProcess, or None if the driver is unavailable and the
+    caller should fall back to running the command in its own process.
+    """
+    global _DRIVER, _DRIVER_FAILED
+    if _DRIVER_FAILED:
+        return None
+    try:
+        if _DRIVER is None:
+            _DRIVER = subprocess.Popen([sys.executable, str(DRIVER_PATH)], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        if _VERBOSE: print(f"Executing in driver: scipfs {' '.join(command_args)}") # For test visibility
+        _DRIVER.stdin.write(json.dumps(command_args) + "\n")
+        _DRIVER.stdin.flush()
+        ready, _, _ = select.select([_DRIVER.stdout], [], [], timeout)
+        if not ready:
+            print(f"Command timed out after {timeout} seconds in driver: scipfs {' '.join(command_args)}")
+            _DRIVER.kill() # Its state is unknown now; the next command starts a fresh one
+            _DRIVER = None
+            return subprocess.CompletedProcess(args=command_args, returncode=124, stdout="TIMEOUT", stderr="Command timed out")
+        line = _DRIVER.stdout.readline()
+        if not line:
+            raise RuntimeError(f"driver exited with code {_DRIVER.poll()}")
+        response = json.loads(line)
+    except Exception as e: # Includes select() being unsupported on pipes (Windows)
+        if _VERBOSE: print(f"Falling back to one process per command; scipfs driver failed: {e}")
+        _DRIVER_FAILED = True
+        if _DRIVER is not None:
+            _DRIVER.kill()
+            _DRIVER = None
+        return None
+    if _VERBOSE:
+        print(f"STDOUT:\n{response['stdout']}")
+        print(f"STDERR:\n{response['stderr']}")
+    return subprocess.CompletedProcess(args=command_args, **response)
 
+# Helper function to run scipfs commands
+def run_scipfs_command(command_args, timeout=60):
+    # The driver handles one command at a time, so calls from several threads take turns
+    with _COMMAND_LOCK:
+        result = _run_in_driver(command_args, timeout)
+    if result is not None:
+        return result
 
-    full_command = base_command + command_args
-    print(f"Executing: {' '.join(full_command)}") # For test visibility
+    full_command = _get_base_command() + command_args
+    if _VERBOSE: print(f"Executing: {' '.join(full_command)}") # For test visibility
     try:
         result = subprocess.run(full_command, capture_output=True, text=True, check=False, timeout=timeout)
-        print(f"STDOUT:\n{result.stdout}")
-        print(f"STDERR:\n{result.stderr}")
+        if _VERBOSE:
+            print(f"STDOUT:\n{result.stdout}")
+            print(f"STDERR:\n{result.stderr}")
         return result
     except subprocess.TimeoutExpired:
         print(f"Command timed out after {timeout} seconds: {' '.join(full_command)}")
@@ -50,161 +112,212 @@ def run_scipfs_command(command_args, timeout=60):
         print(f"Error running command {' '.join(full_command)}: {e}")
         raise
 
+def _get_base_command():
+    with _COMMAND_LOCK: # Only the first caller probes, even when called from several threads
+        base_command = _discover_base_command()
+    if base_command is None:
+        raise RuntimeError("SciPFS command not found or not executable.")
+    return list(base_command)
+
+@functools.lru_cache(maxsize=1)
+def _discover_base_command():
+    """Find how to invoke scipfs, probing at most once per session.
+
+    Returns the command prefix as a tuple, or None if no way works. The None
+    is cached too, so a broken setup is reported once and never re-probed.
+    """
+    # Prefer the checked-in launcher script, which imports scipfs.cli directly
+    # instead of going through runpy like 'python -m scipfs.cli'.
+    if LAUNCHER_PATH.exists():
+        return (sys.executable, str(LAUNCHER_PATH))
+    # Otherwise try to use the editable install first, then fallback to installed scipfs
+    # This assumes the tests are run from the project root or similar context
+    # where 'python -m scipfs.cli' would work for an editable install.
+    for base_command in ((sys.executable, "-m", "scipfs.cli"), ("scipfs",)):
+        try:
+            # Quick check if this invocation works (doesn't guarantee every command will)
+            subprocess.run(list(base_command) + ["--version"], capture_output=True, text=True, check=True, timeout=5)
+        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired) as e:
+            if _VERBOSE: print(f"'{' '.join(base_command)}' is not usable: {e}")
+            continue
+        if _VERBOSE: print(f"Using '{' '.join(base_command)}' for commands.")
+        return base_command
+    print(f"CRITICAL: Neither 'python -m scipfs.cli' nor 'scipfs' command seem to work. Ensure scipfs is installed and accessible.")
+    return None
+
+# Set once the IPFS daemon has answered, so later test classes skip the check
+_IPFS_READY = False
+
+# Helper to wait until the IPFS daemon answers (assumes 'ipfs' CLI is in PATH)
+def wait_for_ipfs_ready(timeout=10):
+    """Poll `ipfs id` every 100 ms until it succeeds. Returns False if it never did within timeout."""
+    global _IPFS_READY
+    if _IPFS_READY:
+        return True
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            res = subprocess.run(["ipfs", "id"], capture_output=True, check=False, timeout=1)
+            if res.returncode == 0:
+                _IPFS_READY = True
+                return True
+        except subprocess.TimeoutExpired:
+            pass
+        except FileNotFoundError:
+            print("Warning: 'ipfs' command not found in PATH.")
+            return False
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.1)
+
+# Helper to list existing IPFS key names (assumes 'ipfs' CLI is in PATH)
+def list_ipfs_keys():
+    try:
+        list_res = subprocess.run(["ipfs", "key", "list"], capture_output=True, text=True, check=False, timeout=10)
+    except subprocess.TimeoutExpired:
+        print("Warning: Timeout while listing IPFS keys")
+        return set()
+    except Exception as e:
+        print(f"Warning: Exception while listing IPFS keys: {e}")
+        return set()
+    if list_res.returncode != 0:
+        print(f"Warning: Failed to list IPFS keys. Stderr: {list_res.stderr.strip()}")
+        return set()
+    # One key name per line; split(None, 1) stops after the first token and tolerates stray whitespace
+    return {line.split(None, 1)[0] for line in list_res.stdout.splitlines() if line.strip()}
+
 # Helper to remove IPNS key (assumes 'ipfs' CLI is in PATH)
-def remove_ipfs_key(key_name):
+def remove_ipfs_key(key_name, existing_keys):
+    """Remove key_name if it is in existing_keys, as returned by list_ipfs_keys()."""
     try:
-        print(f"Attempting to remove IPFS key: {key_name}")
-        # First, check if key exists to avoid error if it doesn't
-        list_cmd = ["ipfs", "key", "list"]
-        list_res = subprocess.run(list_cmd, capture_output=True, text=True, check=False, timeout=10)
-        key_found = False
-        if list_res.returncode == 0:
-            for line in list_res.stdout.splitlines():
-                if key_name in line.split(): # Simple check, might be fragile if key_name is substring of another
-                    # A more precise check: parts = line.split(); if len(parts) >=2 and parts[1] == key_name:
-                    key_found = True
-                    break
-        
-        if key_found:
+        if _VERBOSE: print(f"Attempting to remove IPFS key: {key_name}")
+        # Check the pre-fetched key list to avoid an error if the key doesn't exist
+        if key_name in existing_keys:
             cmd = ["ipfs", "key", "rm", key_name]
             res = subprocess.run(cmd, capture_output=True, text=True, check=False, timeout=10)
             if res.returncode == 0:
-                print(f"Successfully removed IPFS key: {key_name}")
+                if _VERBOSE: print(f"Successfully removed IPFS key: {key_name}")
             else:
                 print(f"Warning: Failed to remove IPFS key {key_name}. Stderr: {res.stderr.strip()}")
         else:
-            print(f"IPFS key {key_name} not found, skipping removal.")
+            if _VERBOSE: print(f"IPFS key {key_name} not found, skipping removal.")
             
     except subprocess.TimeoutExpired:
         print(f"Warning: Timeout during IPFS key removal for {key_name}")
     except Exception as e:
         print(f"Warning: Exception during IPFS key removal for {key_name}: {e}")
 
-class TestIPNSLifetime(unittest.TestCase):
+# File added by every lifetime test class; created once in setUpModule. Identical
+# content means IPFS already has its blocks after the first add.
+_DUMMY_FILE = None
+
+def setUpModule():
+    global _DUMMY_FILE
+    # TEST_TMPDIR is RAM-backed /dev/shm on Linux, so neither writing the file nor adding it touches the disk
+    fd, name = tempfile.mkstemp(prefix="test_scipfs_lt_", suffix=".txt", dir=TEST_TMPDIR)
+    with os.fdopen(fd, "wb") as f:
+        f.write(b"scipfs lifetime test content")
+    _DUMMY_FILE = Path(name)
+
+def tearDownModule():
+    _DUMMY_FILE.unlink(missing_ok=True)
+
+class _IPNSLifetimeTests:
+    """Create a library, then add a file to it, checking its IPNS lifetime each time.
+
+    Each concrete class uses its own library and IPFS key, so the classes
+    are independent and can run on separate workers, e.g.:
+        pytest -n 2 --dist loadgroup tests/integration
+    """
     CONFIG_DIR = Path.home() / ".scipfs"
     TEST_USERNAME = "pytest_user_lt" # Unique username for these tests
-    LIB_DEFAULT_LIFETIME_NAME = "testlib_default_lt"
-    LIB_CUSTOM_LIFETIME_NAME = "testlib_custom_lt"
-    CUSTOM_LIFETIME_VAL = "48h" # Different from default 24h
-    DEFAULT_LIFETIME_VAL = "24h"
+    LIB_NAME = None
+    LIFETIME_VAL = None
+    CREATE_EXTRA_ARGS = []
+    # INFO log from library.py when the manifest is published; compiled in setUpClass
+    _PUBLISH_RE = None
+    # Result of the `scipfs create` run in setUpClass
+    _create_result = None
 
     @classmethod
     def setUpClass(cls):
-        print(f"--- TestIPNSLifetime: setUpClass ---")
+        print(f"--- {cls.__name__}: setUpClass ---")
+        # Format: INFO:scipfs.library:Published manifest CID Qm... to IPNS for key lib_name (... Lifetime: 48h)
+        # [^\n]* keeps the match on the log line itself instead of scanning the whole output
+        cls._PUBLISH_RE = re.compile(
+            rf"Published manifest CID \S+ to IPNS for key {re.escape(cls.LIB_NAME)}[^\n]*Lifetime: {re.escape(cls.LIFETIME_VAL)}"
+        )
+        # Returns immediately if the daemon is already up; only waits if it was just started
+        if not wait_for_ipfs_ready():
+            print("Please ensure your IPFS daemon is running for these integration tests.")
         # Clean up any previous test runs first to ensure a clean state
         cls._clean_up_resources()
         
         res = run_scipfs_command(["config", "set", "username", cls.TEST_USERNAME])
         if res.returncode != 0 and "already set" not in res.stdout.lower() and "set to" not in res.stdout.lower():
              print(f"Warning: Failed to set username for tests. STDOUT: {res.stdout} STDERR: {res.stderr}")
-        
-        print("Please ensure your IPFS daemon is running for these integration tests.")
-        # Give a small delay for IPFS to be ready if it was just started
-        time.sleep(2)
+
+        # Created here rather than in test_01 so that test_02 never depends on test ordering;
+        # test_01 only checks the outcome.
+        args = ["--verbose", "create", cls.LIB_NAME] + cls.CREATE_EXTRA_ARGS
+        cls._create_result = run_scipfs_command(args, timeout=90) # Increased timeout
 
 
     @classmethod
     def tearDownClass(cls):
-        print(f"--- TestIPNSLifetime: tearDownClass ---")
+        print(f"--- {cls.__name__}: tearDownClass ---")
         cls._clean_up_resources()
 
     @classmethod
     def _clean_up_resources(cls):
         print("Cleaning up test resources...")
-        manifest_default = cls.CONFIG_DIR / f"{cls.LIB_DEFAULT_LIFETIME_NAME}_manifest.json"
-        manifest_custom = cls.CONFIG_DIR / f"{cls.LIB_CUSTOM_LIFETIME_NAME}_manifest.json"
-        
-        if manifest_default.exists():
-            print(f"Removing manifest: {manifest_default}")
-            manifest_default.unlink()
-        if manifest_custom.exists():
-            print(f"Removing manifest: {manifest_custom}")
-            manifest_custom.unlink()
+        manifest_path = cls.CONFIG_DIR / f"{cls.LIB_NAME}_manifest.json"
+        if manifest_path.exists():
+            print(f"Removing manifest: {manifest_path}")
+            manifest_path.unlink()
             
-        remove_ipfs_key(cls.LIB_DEFAULT_LIFETIME_NAME)
-        remove_ipfs_key(cls.LIB_CUSTOM_LIFETIME_NAME)
+        remove_ipfs_key(cls.LIB_NAME, list_ipfs_keys())
         print("Finished cleaning up test resources.")
 
 
-    def test_01_create_library_default_lifetime(self):
-        print(f"\n--- Test: Create Library with Default Lifetime ({self.LIB_DEFAULT_LIFETIME_NAME}) ---")
-        args = ["--verbose", "create", self.LIB_DEFAULT_LIFETIME_NAME]
-        result = run_scipfs_command(args)
-        
-        self.assertEqual(result.returncode, 0, f"scipfs create failed for {self.LIB_DEFAULT_LIFETIME_NAME}. STDERR: {result.stderr}")
-        self.assertIn(f"Successfully created library '{self.LIB_DEFAULT_LIFETIME_NAME}'", result.stdout)
-        # Check the specific log line from library.py (verbose output goes to stderr)
-        expected_log_line = f"IPNS Record Lifetime: {self.DEFAULT_LIFETIME_VAL}" 
-        self.assertIn(expected_log_line, result.stderr, f"Default lifetime '{self.DEFAULT_LIFETIME_VAL}' not found in create command's STDERR. STDERR: {result.stderr}")
-        
-        manifest_path = self.CONFIG_DIR / f"{self.LIB_DEFAULT_LIFETIME_NAME}_manifest.json"
-        self.assertTrue(manifest_path.exists(), f"Manifest file was not created: {manifest_path}")
-        with open(manifest_path, "r") as f:
-            manifest_data = json.load(f)
-        self.assertEqual(manifest_data.get("ipns_record_lifetime"), self.DEFAULT_LIFETIME_VAL)
-
-    def test_02_create_library_custom_lifetime(self):
-        print(f"\n--- Test: Create Library with Custom Lifetime ({self.LIB_CUSTOM_LIFETIME_NAME}, {self.CUSTOM_LIFETIME_VAL}) ---")
-        args = ["--verbose", "create", self.LIB_CUSTOM_LIFETIME_NAME, "--ipns-lifetime", self.CUSTOM_LIFETIME_VAL]
-        result = run_scipfs_command(args, timeout=90) # Increased timeout
+    def test_01_create_library(self):
+        print(f"\n--- Test: Create Library ({self.LIB_NAME}, lifetime {self.LIFETIME_VAL}) ---")
+        result = self._create_result
 
-        self.assertEqual(result.returncode, 0, f"scipfs create failed for {self.LIB_CUSTOM_LIFETIME_NAME}. STDERR: {result.stderr}")
-        self.assertIn(f"Successfully created library '{self.LIB_CUSTOM_LIFETIME_NAME}'", result.stdout)
-        expected_log_line = f"IPNS Record Lifetime: {self.CUSTOM_LIFETIME_VAL}"
-        self.assertIn(expected_log_line, result.stderr, f"Custom lifetime '{self.CUSTOM_LIFETIME_VAL}' not found in create command's STDERR. STDERR: {result.stderr}")
+        self.assertEqual(result.returncode, 0, f"scipfs create failed for {self.LIB_NAME}. STDERR: {result.stderr}")
+        self.assertIn(f"Successfully created library '{self.LIB_NAME}'", result.stdout)
+        # Check the specific log line from library.py (verbose output goes to stderr)
+        expected_log_line = f"IPNS Record Lifetime: {self.LIFETIME_VAL}"
+        self.assertIn(expected_log_line, result.stderr, f"Lifetime '{self.LIFETIME_VAL}' not found in create command's STDERR. STDERR: {result.stderr}")
 
-        manifest_path = self.CONFIG_DIR / f"{self.LIB_CUSTOM_LIFETIME_NAME}_manifest.json"
+        manifest_path = self.CONFIG_DIR / f"{self.LIB_NAME}_manifest.json"
         self.assertTrue(manifest_path.exists(), f"Manifest file was not created: {manifest_path}")
-        with open(manifest_path, "r") as f:
-            manifest_data = json.load(f)
-        self.assertEqual(manifest_data.get("ipns_record_lifetime"), self.CUSTOM_LIFETIME_VAL)
-
-    def test_03_add_file_reuses_custom_lifetime(self):
-        print(f"\n--- Test: Add File Reuses Custom Lifetime ({self.LIB_CUSTOM_LIFETIME_NAME}) ---")
-        dummy_file_name = "test_custom_add.txt"
-        dummy_file_path = Path(dummy_file_name)
-        with open(dummy_file_path, "w") as f:
-            f.write("Test content for custom lifetime add.")
-        
-        # Ensure file is deleted after test, even if test fails
-        if dummy_file_path.exists(): self.addCleanup(dummy_file_path.unlink)
-
+        # A single-field check needs no JSON parse; library.py writes the manifest with indent=2 (": " separators)
+        self.assertIn(f'"ipns_record_lifetime": "{self.LIFETIME_VAL}"'.encode(), manifest_path.read_bytes())
 
-        args = ["--verbose", "add", self.LIB_CUSTOM_LIFETIME_NAME, str(dummy_file_path)]
+    def test_02_add_file_reuses_lifetime(self):
+        print(f"\n--- Test: Add File Reuses Lifetime ({self.LIB_NAME}) ---")
+        args = ["--verbose", "add", self.LIB_NAME, str(_DUMMY_FILE)]
         result = run_scipfs_command(args, timeout=90) # Add can take longer due to IPFS ops
 
-        self.assertEqual(result.returncode, 0, f"scipfs add failed for {self.LIB_CUSTOM_LIFETIME_NAME}. STDERR: {result.stderr}")
+        self.assertEqual(result.returncode, 0, f"scipfs add failed for {self.LIB_NAME}. STDERR: {result.stderr}")
         
         # Check for the specific INFO log from library.py that includes the lifetime
-        # Format: INFO:scipfs.library:Published manifest CID Qm... to IPNS for key lib_name (... Lifetime: 48h)
-        expected_info_log_pattern = rf"Published manifest CID [\w\d]+ to IPNS for key {self.LIB_CUSTOM_LIFETIME_NAME}.*Lifetime: {self.CUSTOM_LIFETIME_VAL}" # Removed single quotes around lib name
-        
         self.assertTrue(
-            re.search(expected_info_log_pattern, result.stderr), # Check stderr
-            f"Custom lifetime '{self.CUSTOM_LIFETIME_VAL}' not found in 'add' command's IPNS publish log (STDERR).\nSTDERR:\n{result.stderr}"
+            self._PUBLISH_RE.search(result.stderr), # Check stderr
+            f"Lifetime '{self.LIFETIME_VAL}' not found in 'add' command's IPNS publish log (STDERR).\nSTDERR:\n{result.stderr}"
         )
 
-    def test_04_add_file_reuses_default_lifetime(self):
-        print(f"\n--- Test: Add File Reuses Default Lifetime ({self.LIB_DEFAULT_LIFETIME_NAME}) ---")
-        dummy_file_name = "test_default_add.txt"
-        dummy_file_path = Path(dummy_file_name)
-        with open(dummy_file_path, "w") as f:
-            f.write("Test content for default lifetime add.")
-        
-        if dummy_file_path.exists(): self.addCleanup(dummy_file_path.unlink)
-
-        args = ["--verbose", "add", self.LIB_DEFAULT_LIFETIME_NAME, str(dummy_file_path)]
-        result = run_scipfs_command(args, timeout=90)
+@xdist_group("ipns_lifetime_default")
+class TestIPNSLifetimeDefault(_IPNSLifetimeTests, unittest.TestCase):
+    LIB_NAME = "testlib_default_lt"
+    LIFETIME_VAL = "24h"
 
-        self.assertEqual(result.returncode, 0, f"scipfs add failed for {self.LIB_DEFAULT_LIFETIME_NAME}. STDERR: {result.stderr}")
-        
-        # Check for the specific INFO log from library.py that includes the lifetime
-        expected_info_log_pattern = rf"Published manifest CID [\w\d]+ to IPNS for key {self.LIB_DEFAULT_LIFETIME_NAME}.*Lifetime: {self.DEFAULT_LIFETIME_VAL}" # Removed single quotes around lib name
-        
-        self.assertTrue(
-            re.search(expected_info_log_pattern, result.stderr), # Check stderr
-            f"Default lifetime '{self.DEFAULT_LIFETIME_VAL}' not found in 'add' command's IPNS publish log (STDERR).\nSTDERR:\n{result.stderr}"
-        )
+@xdist_group("ipns_lifetime_custom")
+class TestIPNSLifetimeCustom(_IPNSLifetimeTests, unittest.TestCase):
+    LIB_NAME = "testlib_custom_lt"
+    LIFETIME_VAL = "48h" # Different from default 24h
+    CREATE_EXTRA_ARGS = ["--ipns-lifetime", LIFETIME_VAL]
 
 if __name__ == "__main__":
     # This allows running the test file directly, e.g., python tests/integration/test_ipns_lifetime.py
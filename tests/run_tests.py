@@ -3,6 +3,45 @@ import unittest
 import sys
 import os
 import argparse
+import glob
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _test_modules(kind):
+    """Dotted names of the tests/<kind>/test_*.py modules, found without importing them."""
+    paths = sorted(glob.glob(os.path.join(TESTS_DIR, kind, 'test_*.py')))
+    return ['tests.%s.%s' % (kind, os.path.splitext(os.path.basename(path))[0]) for path in paths]
+
+UNIT_MODULES = _test_modules('unit')
+INTEGRATION_MODULES = _test_modules('integration')
+
+def run_tests_parallel(test_type='all', verbosity=2, workers=2):
+    """Run tests with pytest and pytest-xdist, spreading test classes over workers.
+    
+    Equivalent to e.g. `pytest -n 2 --dist loadgroup tests/integration`.
+    Integration test classes marked with the same xdist_group stay on one worker.
+    
+    Args:
+        test_type (str): Type of tests to run ('unit', 'integration', or 'all')
+        verbosity (int): Test runner verbosity level (1-3)
+        workers (int): Number of pytest-xdist worker processes
+    """
+    try:
+        import pytest
+        import xdist # noqa: F401
+    except ImportError:
+        print("--parallel requires pytest and pytest-xdist (pip install pytest pytest-xdist).")
+        return 1
+    
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    test_dirs = []
+    if test_type in ['unit', 'all']:
+        test_dirs.append(os.path.join(project_root, 'tests', 'unit'))
+    if test_type in ['integration', 'all']:
+        test_dirs.append(os.path.join(project_root, 'tests', 'integration'))
+    
+    args = ['-n', str(workers), '--dist', 'loadgroup', '-' + 'v' * (verbosity - 1) if verbosity > 1 else '-q']
+    return int(pytest.main(args + test_dirs))
 
 def run_tests(test_type='all', verbosity=2):
     """Run tests in the specified test directory.
@@ -15,21 +54,18 @@ def run_tests(test_type='all', verbosity=2):
     project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     sys.path.insert(0, project_root)
     
-    # Discover and run tests in the specified directory
+    # Load only the modules of the requested type; a unit run never imports integration tests
     loader = unittest.TestLoader()
     suite = unittest.TestSuite()
     
+    modules = []
     if test_type in ['unit', 'all']:
-        unit_dir = os.path.join(project_root, 'tests', 'unit')
-        unit_suite = loader.discover(unit_dir, pattern='test_*.py', top_level_dir=project_root)
-        suite.addTest(unit_suite)
-        
+        modules += UNIT_MODULES
     if test_type in ['integration', 'all']:
-        integration_dir = os.path.join(project_root, 'tests', 'integration')
-        # For integration tests, we'll look for both .py and .sh files
-        integration_suite = loader.discover(integration_dir, pattern='test_*.py', top_level_dir=project_root)
-        suite.addTest(integration_suite)
-        # Note: Shell script tests would need to be run separately
+        modules += INTEGRATION_MODULES
+        # Note: Shell script tests (integration/test_*.sh) need to be run separately
+    for module in modules:
+        suite.addTest(loader.loadTestsFromName(module))
     
     # Run the tests
     runner = unittest.TextTestRunner(verbosity=verbosity)
@@ -44,6 +80,11 @@ if __name__ == '__main__':
                       default='all', help='Type of tests to run')
     parser.add_argument('--verbosity', type=int, choices=[1, 2, 3],
                       default=2, help='Test runner verbosity level')
+    parser.add_argument('--parallel', type=int, nargs='?', const=2, default=None, metavar='WORKERS',
+                      help='Run with pytest-xdist on WORKERS processes (default 2) instead of unittest, '
+                           'e.g. the equivalent of `pytest -n 2 --dist loadgroup tests/integration`')
     args = parser.parse_args()
     
+    if args.parallel:
+        sys.exit(run_tests_parallel(args.type, args.verbosity, args.parallel))
     sys.exit(run_tests(args.type, args.verbosity)) 
\ No newline at end of file
@@ -1,45 +1,94 @@
 #!/usr/bin/env python3
+import hashlib
 import unittest
 from pathlib import Path
 import tempfile
-import shutil
-from scipfs.ipfs import IPFSClient, SciPFSFileNotFoundError, IPFSConnectionError, RuntimeError, TimeoutError
+from scipfs.ipfs import IPFSClient, SciPFSFileNotFoundError, SciPFSGoWrapperError, IPFSConnectionError, RuntimeError, TimeoutError
 import pytest
 from unittest.mock import patch, MagicMock
 from scipfs.library import Library
+from tests._markers import requires_ipfs
+from tests._tmpdir import TEST_TMPDIR
+
+# Size of the large-file test's file
+_LARGE_SIZE = 1024 * 1024
+
+class _FakeGoWrapper:
+    """Stands in for IPFSClient._execute_go_wrapper_command_json with an in-memory blockstore."""
+
+    def __init__(self):
+        self.blocks = {}
+
+    def __call__(self, go_command, *args, input_data=None, timeout_seconds=120):
+        opts = dict(zip(args[::2], args[1::2]))
+        if go_command == "add_file":
+            content = Path(opts["--file"]).read_bytes()
+            cid = "Qm" + hashlib.sha256(content).hexdigest()[:44]
+            self.blocks[cid] = content
+            return {"cid": cid}
+        if go_command == "get_cid_to_file":
+            if opts["--cid"] not in self.blocks:
+                raise SciPFSGoWrapperError(f"block not found: {opts['--cid']}")
+            Path(opts["--output"]).write_bytes(self.blocks[opts["--cid"]])
+            return {}
+        raise AssertionError(f"unexpected Go wrapper command: {go_command}")
 
 class TestAddFileOperations(unittest.TestCase):
+    test_content = b"Hello, IPFS!"
+
+    @classmethod
+    def setUpClass(cls):
+        """Create one base temp directory for the whole class; removed in tearDownClass."""
+        cls._base_dir = tempfile.TemporaryDirectory(prefix="scipfs_add_test_", dir=TEST_TMPDIR)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._base_dir.cleanup()
+
     def setUp(self):
         """Set up test fixtures before each test method."""
+        # Real IPFSClient logic, but no Go wrapper lookup and no daemon (see _FakeGoWrapper)
+        self.patcher_find_wrapper = patch('scipfs.ipfs.IPFSClient._find_go_wrapper', return_value=None)
+        self.patcher_find_wrapper.start()
         self.client = IPFSClient()
-        self.test_dir = tempfile.mkdtemp()
+        self.client.go_wrapper_path = "/fake/path/to/scipfs_go_helper"
+        self.client.go_wrapper_version = "0.1.0"
+        self.client._execute_go_wrapper_command_json = _FakeGoWrapper()
+        # Per-test subdirectory of the class's base dir; no per-test tree removal needed
+        self.test_dir = tempfile.mkdtemp(dir=self._base_dir.name)
         
         # Create a test file
         self.test_file = Path(self.test_dir) / "test.txt"
-        self.test_content = b"Hello, IPFS!"
         self.test_file.write_bytes(self.test_content)
-        
+
     def tearDown(self):
-        """Clean up test fixtures after each test method."""
-        shutil.rmtree(self.test_dir)
-        
-    def test_add_file_success(self):
-        """Test successful file addition."""
-        # 1. Add the test file
-        cid = self.client.add_file(self.test_file)
-        
-        # 2. Verify CID is returned and valid
-        self.assertIsNotNone(cid, "No CID returned from add_file")
-        self.assertTrue(cid.startswith("Qm"), 
-                       f"Invalid CID format: {cid}")
+        self.patcher_find_wrapper.stop()
         
-        # 3. Verify file can be retrieved
-        output_path = Path(self.test_dir) / "downloaded.txt"
-        self.client.get_file(cid, output_path)
-        self.assertTrue(output_path.exists(), "Downloaded file does not exist")
-        downloaded_content = output_path.read_bytes()
-        self.assertEqual(downloaded_content, self.test_content,
-                        "Downloaded content does not match original")
+    def test_add_file(self):
+        """Test adding regular, empty and large files, then getting each one back."""
+        empty_file = Path(self.test_dir) / "empty.txt"
+        empty_file.touch()
+        large_file = Path(self.test_dir) / "large.txt"
+        # A 1MB file of zeros; extending with truncate() writes no data (sparse where supported)
+        with open(large_file, "wb") as f:
+            f.truncate(_LARGE_SIZE)
+
+        for file_path in (self.test_file, empty_file, large_file):
+            with self.subTest(file=file_path.name):
+                # 1. Add the file
+                cid = self.client.add_file(file_path)
+
+                # 2. Verify CID is returned and valid
+                self.assertIsNotNone(cid, f"No CID returned from add_file for {file_path.name}")
+                self.assertTrue(cid.startswith("Qm"),
+                               f"Invalid CID format for {file_path.name}: {cid}")
+
+                # 3. Verify file can be retrieved
+                output_path = Path(self.test_dir) / f"downloaded_{file_path.name}"
+                self.client.get_file(cid, output_path)
+                self.assertTrue(output_path.exists(), "Downloaded file does not exist")
+                self.assertEqual(output_path.read_bytes(), file_path.read_bytes(),
+                                "Downloaded content does not match original")
         
     def test_add_file_nonexistent(self):
         """Test adding a non-existent file."""
@@ -47,33 +96,21 @@ class TestAddFileOperations(unittest.TestCase):
         with self.assertRaises(SciPFSFileNotFoundError) as context:
             self.client.add_file(nonexistent_file)
         self.assertIn("File not found", str(context.exception))
-        
-    def test_add_file_empty(self):
-        """Test adding an empty file."""
-        empty_file = Path(self.test_dir) / "empty.txt"
-        empty_file.touch()
-        
-        cid = self.client.add_file(empty_file)
-        self.assertIsNotNone(cid, "No CID returned for empty file")
-        self.assertTrue(cid.startswith("Qm"),
-                       f"Invalid CID format for empty file: {cid}")
-        
-    def test_add_file_large(self):
-        """Test adding a large file."""
-        large_file = Path(self.test_dir) / "large.txt"
-        # Create a 1MB file
-        with open(large_file, "wb") as f:
-            f.write(b"0" * 1024 * 1024)
-            
-        try:
-            cid = self.client.add_file(large_file)
-            self.assertIsNotNone(cid, "No CID returned for large file")
-            self.assertTrue(cid.startswith("Qm"),
-                          f"Invalid CID format for large file: {cid}")
-        except TimeoutError:
-            self.fail("Timeout while adding large file")
-        except Exception as e:
-            self.fail(f"Unexpected error adding large file: {e}")
+
+@requires_ipfs
+class TestAddFileOperationsLive(unittest.TestCase):
+    """Round trip through a real daemon, as a smoke test for the mocked tests above."""
+
+    def test_add_and_get_file_round_trip(self):
+        with tempfile.TemporaryDirectory(prefix="scipfs_add_test_", dir=TEST_TMPDIR) as test_dir:
+            test_file = Path(test_dir) / "test.txt"
+            test_file.write_bytes(TestAddFileOperations.test_content)
+            client = IPFSClient()
+            cid = client.add_file(test_file)
+            self.assertTrue(cid.startswith("Qm"), f"Invalid CID format: {cid}")
+            output_path = Path(test_dir) / "downloaded.txt"
+            client.get_file(cid, output_path)
+            self.assertEqual(output_path.read_bytes(), TestAddFileOperations.test_content)
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -1,82 +1,148 @@
 import unittest
-from unittest.mock import patch, MagicMock, mock_open, ANY
+from unittest.mock import patch, MagicMock, ANY
 from pathlib import Path
-import json
-import sys
+import inspect
+import re
+import tempfile
 
 from click.testing import CliRunner
 
-from scipfs.cli import cli, MinimalIPFSClient
-from scipfs.ipfs import IPFSClient, IPFSConnectionError, KuboVersionError, SciPFSGoWrapperError
+from scipfs.cli import cli
+from scipfs.ipfs import IPFSConnectionError, KuboVersionError
 from scipfs.library import Library
 from scipfs.config import SciPFSConfig
+from tests._tmpdir import TEST_TMPDIR
 
-# Default config dir for tests
-TEST_CONFIG_DIR = Path("/tmp/.test_scipfs_config")
+# Config dir for tests: a fresh temporary directory per run, created in setUpModule
+TEST_CONFIG_DIR = None
+
+# Attribute names of Library and Path, listed once; a MagicMock given one of these lists as its spec
+# doesn't re-inspect the class every time one is built
+LIBRARY_SPEC = dir(Library)
+PATH_SPEC = dir(Path)
+
+# Keep stderr out of result.output; click >= 8.2 always captures the two streams separately
+RUNNER_KWARGS = {"mix_stderr": False} if "mix_stderr" in inspect.signature(CliRunner.__init__).parameters else {}
+
+_config_dir_patcher = None
+_config_tmp_dir = None
+
+def setUpModule():
+    # Every test sees the same CONFIG_DIR, so patch it once for the whole module
+    global TEST_CONFIG_DIR, _config_dir_patcher, _config_tmp_dir
+    _config_tmp_dir = tempfile.TemporaryDirectory(prefix="scipfs_test_")
+    TEST_CONFIG_DIR = Path(_config_tmp_dir.name)
+    _config_dir_patcher = patch('scipfs.cli.CONFIG_DIR', TEST_CONFIG_DIR)
+    _config_dir_patcher.start()
+
+def tearDownModule():
+    _config_dir_patcher.stop()
+    _config_tmp_dir.cleanup()
 
 class TestSciPFSCLI(unittest.TestCase):
+    CREATED_LIBRARY_MSG = "Successfully created library '{}'"
+    # Full stdout of `scipfs create testlib` in test_create_library_success
+    CREATE_TESTLIB_OUTPUT_RE = re.compile(
+        r"Successfully created library 'testlib'\.\n"
+        r"IPNS Name \(share this with others\): /ipns/k51testipnsname\n"
+        r"Initial Manifest CID: QmTestManifestCID\n"
+    )
+    # The passing `scipfs doctor` checks, in output order
+    DOCTOR_ALL_OK_RE = re.compile(
+        r"\[OK\] Configuration directory exists.*"
+        r"\[OK\] Main config file exists.*"
+        r"\[INFO\] Username configured: testuser.*"
+        r"\[OK\] IPFS daemon connected successfully.*"
+        r"\[INFO\] Connected IPFS daemon version: 0\.25\.0.*"
+        r"\[INFO\] SciPFS requires Kubo: 0\.23\.0.*"
+        r"\[SUCCESS\] All checks passed",
+        re.DOTALL,
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        # One runner and one config mock for the whole class; setUp resets the mock's state
+        cls.runner = CliRunner(**RUNNER_KWARGS)
+        cls.mock_config_patcher = patch('scipfs.cli.scipfs_config_instance')
+        cls.mock_config_instance = cls.mock_config_patcher.start()
+        # IPFSClient and Library are mocked for every test; each test configures
+        # self.MockIPFSClient.return_value / self.MockLibrary.return_value as needed
+        cls.ipfs_client_patcher = patch('scipfs.cli.IPFSClient')
+        cls.MockIPFSClient = cls.ipfs_client_patcher.start()
+        cls.library_patcher = patch('scipfs.cli.Library')
+        cls.MockLibrary = cls.library_patcher.start()
+        # The add and pin file tests only read this file, so one copy serves the whole class
+        cls._dummy_dir = tempfile.TemporaryDirectory(dir=TEST_TMPDIR)
+        cls.dummy_file = Path(cls._dummy_dir.name) / "dummy.txt"
+        cls.dummy_file.write_text("test content")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._dummy_dir.cleanup()
+        cls.library_patcher.stop()
+        cls.ipfs_client_patcher.stop()
+        cls.mock_config_patcher.stop()
+
     def setUp(self):
-        self.runner = CliRunner()
-        # Set up config mocking
-        self.mock_config_patcher = patch('scipfs.cli.scipfs_config_instance')
-        self.mock_config_instance = self.mock_config_patcher.start()
+        # Clear calls and any return values/side effects configured by the previous test;
+        # resetting return_value also gives each test fresh client and library instances
+        for mock in (self.mock_config_instance, self.MockIPFSClient, self.MockLibrary):
+            mock.reset_mock(return_value=True, side_effect=True)
         self.mock_config_instance.get_username.return_value = "testuser"
         self.mock_config_instance.get_api_addr_for_client.return_value = "/ip4/127.0.0.1/tcp/5001"
-        self.mock_config_instance.config_file_path = Path("/tmp/fake_config.json")
-        
-        # Set up config dir patching
-        self.patch_config_dir = patch('scipfs.cli.CONFIG_DIR', TEST_CONFIG_DIR)
-        self.mock_config_dir = self.patch_config_dir.start()
+        self.mock_config_instance.config_file_path = TEST_CONFIG_DIR / "fake_config.json"
         
         # Common API address
         self.api_addr = "/ip4/127.0.0.1/tcp/5001"
 
-    def tearDown(self):
-        self.mock_config_patcher.stop()
-        self.patch_config_dir.stop()
+        # Client defaults for a healthy daemon, shared by all tests; tests override what they need
+        self.mock_ipfs = self.MockIPFSClient.return_value
+        self.mock_ipfs.check_ipfs_daemon.return_value = None
+        self.mock_ipfs.get_version_str.return_value = "0.25.0"
+        self.mock_ipfs.api_addr = self.api_addr
 
-    @patch('scipfs.cli.IPFSClient')
-    def test_cli_group_ipfs_client_init_success(self, MockIPFSClient):
-        mock_client_instance = MockIPFSClient.return_value
-        mock_client_instance.check_ipfs_daemon.return_value = None
+    def assertAllIn(self, expected, output):
+        """Check every expected substring in one pass and report all the missing ones together."""
+        missing = [s for s in expected if s not in output]
+        self.assertFalse(missing, msg=f"Missing from output: {missing}\n{output}")
+
+    def test_cli_group_ipfs_client_init_success(self):
+        mock_client_instance = self.MockIPFSClient.return_value
         
-        with patch('scipfs.cli.Library') as MockLibrary:
-            mock_lib_instance = MockLibrary.return_value
-            mock_lib_instance.create.return_value = None
-            mock_lib_instance.ipns_name = "/ipns/testipnsname"
-            mock_lib_instance.manifest_cid = "QmTestManifest"
-            
-            result = self.runner.invoke(cli, ['create', 'mylib'])
+        mock_lib_instance = self.MockLibrary.return_value
+        mock_lib_instance.create.return_value = None
+        mock_lib_instance.ipns_name = "/ipns/testipnsname"
+        mock_lib_instance.manifest_cid = "QmTestManifest"
         
-        MockIPFSClient.assert_called_once()
+        result = self.runner.invoke(cli, ['create', 'mylib'])
+        
+        self.MockIPFSClient.assert_called_once()
         mock_client_instance.check_ipfs_daemon.assert_called_once()
         self.assertEqual(result.exit_code, 0, msg=result.output)
-        self.assertIn("Successfully created library 'mylib'", result.output)
+        self.assertIn(self.CREATED_LIBRARY_MSG.format("mylib"), result.stdout)
 
-    @patch('scipfs.cli.IPFSClient')
-    def test_cli_group_ipfs_client_init_connection_error(self, MockIPFSClient):
-        MockIPFSClient.return_value.check_ipfs_daemon.side_effect = IPFSConnectionError("Daemon down")
+    def test_cli_group_ipfs_client_init_connection_error(self):
+        self.MockIPFSClient.return_value.check_ipfs_daemon.side_effect = IPFSConnectionError("Daemon down")
         
         result = self.runner.invoke(cli, ['create', 'mylib'])
         self.assertNotEqual(result.exit_code, 0, msg="Command should fail if IPFS connect fails")
-        self.assertIn("Error: Could not connect to IPFS API.", result.output)
-        self.assertIn("Daemon down", result.output)
+        self.assertIn("Error: Could not connect to IPFS API.", result.stderr)
+        self.assertIn("Daemon down", result.stderr)
 
-    @patch('scipfs.cli.IPFSClient')
-    def test_cli_group_ipfs_client_init_version_error(self, MockIPFSClient):
-        MockIPFSClient.return_value.check_ipfs_daemon.side_effect = KuboVersionError("Wrong version")
+    def test_cli_group_ipfs_client_init_version_error(self):
+        self.MockIPFSClient.return_value.check_ipfs_daemon.side_effect = KuboVersionError("Wrong version")
 
         result = self.runner.invoke(cli, ['pin', 'cid', 'QmABC'])
         self.assertNotEqual(result.exit_code, 0)
-        self.assertIn("Error: IPFS version mismatch.", result.output)
-        self.assertIn("Wrong version", result.output)
+        self.assertIn("Error: IPFS version mismatch.", result.stderr)
+        self.assertIn("Wrong version", result.stderr)
 
     def test_init_command(self):
         with patch('scipfs.cli.CONFIG_DIR') as mock_cfg_dir, \
              patch.object(SciPFSConfig, '_save_config') as mock_save_cfg:
             
             mock_cfg_dir.mkdir.return_value = None
-            mock_config_path = MagicMock(spec=Path)
+            mock_config_path = MagicMock(spec=PATH_SPEC)
             mock_config_path.exists.return_value = False
             self.mock_config_instance.config_file_path = mock_config_path
 
@@ -85,13 +151,11 @@ class TestSciPFSCLI(unittest.TestCase):
             self.assertEqual(result.exit_code, 0, result.output)
             mock_cfg_dir.mkdir.assert_called_once_with(parents=True, exist_ok=True)
             self.mock_config_instance._save_config.assert_called_once()
-            self.assertIn("Initialized SciPFS configuration", result.output)
+            self.assertIn("Initialized SciPFS configuration", result.stdout)
 
-    @patch('scipfs.cli.Library')
-    @patch('scipfs.cli.IPFSClient')
-    def test_create_library_success(self, MockIPFSClient, MockLibrary):
-        mock_ipfs_instance = MockIPFSClient.return_value
-        mock_library_instance = MockLibrary.return_value
+    def test_create_library_success(self):
+        mock_ipfs_instance = self.MockIPFSClient.return_value
+        mock_library_instance = self.MockLibrary.return_value
         
         mock_library_instance.name = "testlib"
         mock_library_instance.ipns_name = "/ipns/k51testipnsname"
@@ -102,31 +166,25 @@ class TestSciPFSCLI(unittest.TestCase):
         result = self.runner.invoke(cli, ['create', 'testlib'])
         
         self.assertEqual(result.exit_code, 0, msg=result.output)
-        MockLibrary.assert_called_once_with("testlib", TEST_CONFIG_DIR, mock_ipfs_instance)
+        self.MockLibrary.assert_called_once_with("testlib", TEST_CONFIG_DIR, mock_ipfs_instance)
         mock_library_instance.create.assert_called_once()
-        self.assertIn("Successfully created library 'testlib'", result.output)
-        self.assertIn("IPNS Name (share this with others): /ipns/k51testipnsname", result.output)
-        self.assertIn("Initial Manifest CID: QmTestManifestCID", result.output)
-
-    @patch('scipfs.cli.Library')
-    @patch('scipfs.cli.IPFSClient')
-    def test_create_library_already_exists_error(self, MockIPFSClient, MockLibrary):
-        mock_ipfs_instance = MockIPFSClient.return_value
-        mock_library_instance = MockLibrary.return_value
+        self.assertRegex(result.stdout, self.CREATE_TESTLIB_OUTPUT_RE)
+
+    def test_create_library_already_exists_error(self):
+        mock_ipfs_instance = self.MockIPFSClient.return_value
+        mock_library_instance = self.MockLibrary.return_value
         mock_library_instance.create.side_effect = ValueError("Library configuration file already exists.")
 
         result = self.runner.invoke(cli, ['create', 'existinglib'])
         
         self.assertNotEqual(result.exit_code, 0, msg=result.output)
-        self.assertIn("Error: Library configuration file already exists.", result.output)
-        MockLibrary.assert_called_once_with("existinglib", TEST_CONFIG_DIR, mock_ipfs_instance)
+        self.assertIn("Error: Library configuration file already exists.", result.stderr)
+        self.MockLibrary.assert_called_once_with("existinglib", TEST_CONFIG_DIR, mock_ipfs_instance)
         mock_library_instance.create.assert_called_once()
 
-    @patch('scipfs.cli.Library')
-    @patch('scipfs.cli.IPFSClient')
-    def test_join_library_success(self, MockIPFSClient, MockLibrary):
-        mock_ipfs_instance = MockIPFSClient.return_value
-        mock_library_instance = MockLibrary.return_value
+    def test_join_library_success(self):
+        mock_ipfs_instance = self.MockIPFSClient.return_value
+        mock_library_instance = self.MockLibrary.return_value
 
         def mock_join_method(ipns_name_to_join):
             mock_library_instance.name = "joinedlib"
@@ -140,69 +198,64 @@ class TestSciPFSCLI(unittest.TestCase):
         result = self.runner.invoke(cli, ['join', test_ipns_name])
 
         self.assertEqual(result.exit_code, 0, msg=result.output)
-        MockLibrary.assert_called_once_with("temp_join_placeholder", TEST_CONFIG_DIR, mock_ipfs_instance)
+        self.MockLibrary.assert_called_once_with("temp_join_placeholder", TEST_CONFIG_DIR, mock_ipfs_instance)
         mock_library_instance.join.assert_called_once_with(test_ipns_name)
-        self.assertIn(f"Successfully joined library 'joinedlib' using IPNS name: {test_ipns_name}", result.output)
-        self.assertIn("Manifest (CID: QmJoinedManifestCID) saved to", result.output)
-
-    @patch('scipfs.cli.Library')
-    @patch('scipfs.cli.IPFSClient')
-    def test_join_library_not_found(self, MockIPFSClient, MockLibrary):
-        mock_ipfs_instance = MockIPFSClient.return_value
-        mock_library_instance = MockLibrary.return_value
+        self.assertIn(f"Successfully joined library 'joinedlib' using IPNS name: {test_ipns_name}", result.stdout)
+        self.assertIn("Manifest (CID: QmJoinedManifestCID) saved to", result.stdout)
+
+    def test_join_library_not_found(self):
+        mock_ipfs_instance = self.MockIPFSClient.return_value
+        mock_library_instance = self.MockLibrary.return_value
         mock_library_instance.join.side_effect = FileNotFoundError("Could not resolve IPNS name")
 
         test_ipns_name = "/ipns/k51qNonExistent"
         result = self.runner.invoke(cli, ['join', test_ipns_name])
 
         self.assertNotEqual(result.exit_code, 0, msg=result.output)
-        self.assertIn(f"Error joining library: Could not resolve IPNS name '{test_ipns_name}'", result.output)
-
-    @patch('scipfs.cli.scipfs_config_instance.get_username', return_value="testuser")
-    @patch('scipfs.cli.Library')
-    @patch('scipfs.cli.IPFSClient')
-    @patch('pathlib.Path.exists', return_value=True)
-    def test_add_file_owner_success(self, MockPathExists, MockIPFSClient, MockLibrary, MockGetUsername):
-        mock_ipfs_instance = MockIPFSClient.return_value
-        mock_library_instance = MockLibrary.return_value
-
-        mock_library_instance.name = "ownerlib"
-        mock_library_instance.manifest_path = TEST_CONFIG_DIR / "ownerlib_manifest.json"
-        mock_library_instance.manifest_path.exists.return_value = True
-        original_cid = "QmOriginalCID"
+        self.assertIn(f"Error joining library: Could not resolve IPNS name '{test_ipns_name}'", result.stderr)
+
+    def test_add_file_success(self):
+        # (library, ipns_key_name after the add, IPNS name, expected message, message that must not appear)
+        cases = [
+            ("ownerlib", "ownerlib", "/ipns/k51ownerlib",
+             "The library's IPNS record (/ipns/k51ownerlib) has been updated",
+             "Your local manifest is updated."),
+            ("joinedlib", None, "/ipns/k51someotherlib", # This instance is NOT the owner
+             "Your local manifest is updated. If this is a shared library you don't own,",
+             "The library's IPNS record"),
+        ]
         new_cid = "QmNewCID"
-        mock_library_instance.manifest_cid = original_cid
-        
-        def mock_add_file_effect(file_path_arg, username_arg):
-            mock_library_instance.manifest_cid = new_cid
-            mock_library_instance.ipns_key_name = "ownerlib"
-            mock_library_instance.ipns_name = "/ipns/k51ownerlib"
-
-        mock_library_instance.add_file.side_effect = mock_add_file_effect
+        for lib_name, ipns_key_name, ipns_name, expected, unexpected in cases:
+            with self.subTest(library=lib_name):
+                self.mock_config_instance.get_username.reset_mock()
+                self.MockLibrary.reset_mock(return_value=True)
+                mock_library_instance = self.MockLibrary.return_value
+                mock_library_instance.name = lib_name
+                mock_library_instance.manifest_path.exists.return_value = True
+                mock_library_instance.manifest_cid = "QmOriginalCID"
+
+                def mock_add_file_effect(file_path_arg, username_arg):
+                    mock_library_instance.manifest_cid = new_cid
+                    mock_library_instance.ipns_key_name = ipns_key_name
+                    mock_library_instance.ipns_name = ipns_name
+
+                mock_library_instance.add_file.side_effect = mock_add_file_effect
+
+                result = self.runner.invoke(cli, ['add', lib_name, str(self.dummy_file)])
+
+                self.assertEqual(result.exit_code, 0, msg=result.output)
+                self.mock_config_instance.get_username.assert_called_once()
+                self.MockLibrary.assert_called_once_with(lib_name, TEST_CONFIG_DIR, self.mock_ipfs)
+                mock_library_instance.add_file.assert_called_once_with(self.dummy_file, "testuser")
+                self.assertIn(f"Added '{self.dummy_file.name}' to library '{lib_name}'", result.stdout)
+                self.assertIn(f"New Manifest CID: {new_cid}", result.stdout)
+                self.assertIn(expected, result.stdout)
+                self.assertNotIn(unexpected, result.stdout)
+
+    def test_update_command_success(self):
+        mock_ipfs_client_ctx = self.MockIPFSClient.return_value
         
-        dummy_file_path = Path("./dummy.txt")
-        with open(dummy_file_path, "w") as f:
-            f.write("test content")
-
-        result = self.runner.invoke(cli, ['add', 'ownerlib', str(dummy_file_path)])
-        
-        dummy_file_path.unlink()
-
-        self.assertEqual(result.exit_code, 0, msg=result.output)
-        MockGetUsername.assert_called_once()
-        MockLibrary.assert_called_once_with("ownerlib", TEST_CONFIG_DIR, mock_ipfs_instance)
-        mock_library_instance.add_file.assert_called_once_with(dummy_file_path, "testuser")
-        self.assertIn(f"Added '{dummy_file_path.name}' to library 'ownerlib'", result.output)
-        self.assertIn(f"New Manifest CID: {new_cid}", result.output)
-        self.assertIn("The library's IPNS record (/ipns/k51ownerlib) has been updated", result.output)
-
-    @patch('scipfs.cli.Library')
-    @patch('scipfs.cli.IPFSClient')
-    def test_update_command_success(self, MockIPFSClient, MockLibrary):
-        mock_ipfs_client_ctx = MockIPFSClient.return_value
-        mock_ipfs_client_ctx.check_ipfs_daemon.return_value = None
-        
-        mock_library_instance = MockLibrary.return_value
+        mock_library_instance = self.MockLibrary.return_value
         mock_library_instance.update_from_ipns.return_value = True
         mock_library_instance.manifest_cid = "QmNewManifest"
         mock_library_instance.name = "updatedlib"
@@ -212,22 +265,19 @@ class TestSciPFSCLI(unittest.TestCase):
         result = self.runner.invoke(cli, ['--verbose', 'update', 'updatedlib'], obj={'IPFS_CLIENT': mock_ipfs_client_ctx})
 
         self.assertEqual(result.exit_code, 0, result.output)
-        MockLibrary.assert_called_with('updatedlib', ANY, mock_ipfs_client_ctx)
+        self.MockLibrary.assert_called_with('updatedlib', ANY, mock_ipfs_client_ctx)
         mock_library_instance.update_from_ipns.assert_called_once()
-        self.assertIn("Library 'updatedlib' is already up-to-date", result.output)
+        self.assertIn("Library 'updatedlib' is already up-to-date", result.stdout)
 
-    @patch('scipfs.cli.Library')
-    @patch('scipfs.cli.IPFSClient')
-    def test_list_pinned_matched(self, MockIPFSClient, MockLibrary):
-        mock_ipfs_client_ctx = MockIPFSClient.return_value
-        mock_ipfs_client_ctx.check_ipfs_daemon.return_value = None
+    def test_list_pinned_matched(self):
+        mock_ipfs_client_ctx = self.MockIPFSClient.return_value
         mock_ipfs_client_ctx.list_pinned_cids.return_value = {
             "QmManifest1": {"Type": "recursive"},
             "QmFile1InLib1": {"Type": "recursive"},
             "QmOtherPin": {"Type": "direct"}
         }
 
-        mock_lib_instance = MockLibrary.return_value
+        mock_lib_instance = self.MockLibrary.return_value
         mock_lib_instance.name = "lib1"
         mock_lib_instance.manifest_cid = "QmManifest1"
         mock_lib_instance.list_files.return_value = [
@@ -237,7 +287,7 @@ class TestSciPFSCLI(unittest.TestCase):
         mock_lib_instance.manifest = {"ipns_name": "/ipns/k51lib1", "files": {"file1.txt": {"cid": "QmFile1InLib1"}}}
 
         with patch('scipfs.cli.CONFIG_DIR') as mock_config_dir:
-            mock_manifest_file = MagicMock(spec=Path)
+            mock_manifest_file = MagicMock(spec=PATH_SPEC)
             mock_manifest_file.name = "lib1_manifest.json"
             mock_manifest_file.stem = "lib1"
             mock_config_dir.glob.return_value = [mock_manifest_file]
@@ -245,46 +295,34 @@ class TestSciPFSCLI(unittest.TestCase):
             result = self.runner.invoke(cli, ['list-pinned'], obj={'IPFS_CLIENT': mock_ipfs_client_ctx})
 
         self.assertEqual(result.exit_code, 0, result.output)
-        self.assertIn("Fetching pinned CIDs from local IPFS node", result.output)
-        self.assertIn("Found 3 pinned CIDs", result.output)
-        self.assertIn("Matching pinned CIDs to local SciPFS libraries", result.output)
-        self.assertIn("Library: lib1", result.output)
-        self.assertIn("Manifest: QmManifest1", result.output)
-        self.assertIn("Name: file1.txt, CID: QmFile1InLib1", result.output)
-        self.assertIn("Other pinned CIDs", result.output)
-        self.assertIn("QmOtherPin", result.output)
-        MockLibrary.assert_any_call("lib1", mock_config_dir, ANY)
-
-    @patch('scipfs.cli.IPFSClient')
-    def test_doctor_command_all_ok(self, MockIPFSClient):
-        mock_client_instance = MockIPFSClient.return_value
-        mock_client_instance.check_ipfs_daemon.return_value = None
-        mock_client_instance.get_version_str.return_value = "0.25.0"
-        mock_client_instance.api_addr = self.api_addr
+        self.assertAllIn([
+            "Fetching pinned CIDs from local IPFS node",
+            "Found 3 pinned CIDs",
+            "Matching pinned CIDs to local SciPFS libraries",
+            "Library: lib1",
+            "Manifest: QmManifest1",
+            "Name: file1.txt, CID: QmFile1InLib1",
+            "Other pinned CIDs",
+            "QmOtherPin",
+        ], result.stdout)
+        self.MockLibrary.assert_any_call("lib1", mock_config_dir, ANY)
+
+    def test_doctor_command_all_ok(self):
+        mock_client_instance = self.MockIPFSClient.return_value
         mock_client_instance.check_version.return_value = True
         mock_client_instance.go_wrapper_path = "/fake/scipfs_go_helper"
 
         self.mock_config_instance.get_username.return_value = "testuser"
-        mock_config_path = MagicMock(spec=Path)
+        mock_config_path = MagicMock(spec=PATH_SPEC)
         mock_config_path.exists.return_value = True
         self.mock_config_instance.config_file_path = mock_config_path
         self.mock_config_instance._read_config.return_value = {}
 
-        with patch('pathlib.Path.exists') as mock_path_exists, \
-             patch('os.access') as mock_os_access:
-            mock_path_exists.side_effect = [True, True, True, True]
-            mock_os_access.return_value = True
+        # CONFIG_DIR is the real temporary directory from setUpModule, so its exists() check needs no patch
+        result = self.runner.invoke(cli, ['doctor'], obj={'IPFS_CLIENT': mock_client_instance})
 
-            result = self.runner.invoke(cli, ['doctor'], obj={'IPFS_CLIENT': mock_client_instance})
-        
         self.assertEqual(result.exit_code, 0, msg=result.output)
-        self.assertIn("[OK] Configuration directory exists", result.output)
-        self.assertIn("[OK] Main config file exists", result.output)
-        self.assertIn("[INFO] Username configured: testuser", result.output)
-        self.assertIn("[OK] IPFS daemon connected successfully", result.output)
-        self.assertIn("[INFO] Connected IPFS daemon version: 0.25.0", result.output)
-        self.assertIn("[INFO] SciPFS requires Kubo: 0.23.0", result.output)
-        self.assertIn("[SUCCESS] All checks passed", result.output)
+        self.assertRegex(result.stdout, self.DOCTOR_ALL_OK_RE)
 
     def test_config_show_command(self):
         self.mock_config_instance.get_username.return_value = "janedoe"
@@ -292,50 +330,13 @@ class TestSciPFSCLI(unittest.TestCase):
         
         result = self.runner.invoke(cli, ['config', 'show'])
         self.assertEqual(result.exit_code, 0, msg=result.output)
-        self.assertIn("Username: janedoe", result.output)
-        self.assertIn("IPFS API Address: /ip4/1.2.3.4/tcp/5002", result.output)
-        self.assertIn(str(self.mock_config_instance.config_file_path), result.output)
-
-    @patch('scipfs.cli.scipfs_config_instance.get_username', return_value="testuser")
-    @patch('scipfs.cli.Library')
-    @patch('scipfs.cli.IPFSClient')
-    @patch('pathlib.Path.exists', return_value=True)
-    def test_add_file_non_owner_success(self, MockPathExists, MockIPFSClient, MockLibrary, MockGetUsername):
-        mock_ipfs_instance = MockIPFSClient.return_value
-        mock_library_instance = MockLibrary.return_value
-
-        mock_library_instance.name = "joinedlib"
-        mock_library_instance.manifest_path = TEST_CONFIG_DIR / "joinedlib_manifest.json"
-        mock_library_instance.manifest_path.exists.return_value = True
-        original_cid = "QmOriginalJoinedCID"
-        new_cid = "QmNewJoinedCID"
-        mock_library_instance.manifest_cid = original_cid
-        
-        def mock_add_file_effect(file_path_arg, username_arg):
-            mock_library_instance.manifest_cid = new_cid
-            mock_library_instance.ipns_key_name = None # This instance is NOT the owner
-            mock_library_instance.ipns_name = "/ipns/k51someotherlib"
+        self.assertIn("Username: janedoe", result.stdout)
+        self.assertIn("IPFS API Address: /ip4/1.2.3.4/tcp/5002", result.stdout)
+        self.assertIn(str(self.mock_config_instance.config_file_path), result.stdout)
 
-        mock_library_instance.add_file.side_effect = mock_add_file_effect
-        
-        dummy_file_path = Path("./dummy_non_owner.txt")
-        with open(dummy_file_path, "w") as f:
-            f.write("test content")
-
-        result = self.runner.invoke(cli, ['add', 'joinedlib', str(dummy_file_path)])
-        
-        dummy_file_path.unlink()
-
-        self.assertEqual(result.exit_code, 0, msg=result.output)
-        self.assertIn(f"New Manifest CID: {new_cid}", result.output)
-        self.assertIn("Your local manifest is updated. If this is a shared library you don't own,", result.output)
-        self.assertNotIn("The library's IPNS record has been updated", result.output)
-
-    @patch('scipfs.cli.Library')
-    @patch('scipfs.cli.IPFSClient')
-    def test_info_library_success(self, MockIPFSClient, MockLibrary):
-        mock_ipfs_instance = MockIPFSClient.return_value
-        mock_library_instance = MockLibrary.return_value
+    def test_info_library_success(self):
+        mock_ipfs_instance = self.MockIPFSClient.return_value
+        mock_library_instance = self.MockLibrary.return_value
 
         mock_library_instance.name = "infolib"
         mock_library_instance.manifest_path.exists.return_value = True
@@ -358,24 +359,23 @@ class TestSciPFSCLI(unittest.TestCase):
         result = self.runner.invoke(cli, ['info', 'infolib'])
 
         self.assertEqual(result.exit_code, 0, msg=result.output)
-        MockLibrary.assert_called_once_with("infolib", TEST_CONFIG_DIR, ANY)
-        self.assertIn("Information for library: infolib", result.output)
-        self.assertIn("IPNS Name (if published): /ipns/k51infolib", result.output)
-        self.assertIn("Owner/Creator: testuser", result.output)
-        self.assertIn("Description: Test library", result.output)
-        self.assertIn("Number of files: 2", result.output)
-        self.assertIn("Last Modified (Manifest): 2024-03-21T12:00:00Z", result.output)
-
-    @patch('scipfs.cli.Library')
-    @patch('scipfs.cli.IPFSClient')
-    def test_update_library_with_changes(self, MockIPFSClient, MockLibrary):
-        mock_ipfs_instance = MockIPFSClient.return_value
-        mock_ipfs_instance.check_ipfs_daemon.return_value = None
+        self.MockLibrary.assert_called_once_with("infolib", TEST_CONFIG_DIR, ANY)
+        self.assertAllIn([
+            "Information for library: infolib",
+            "IPNS Name (if published): /ipns/k51infolib",
+            "Owner/Creator: testuser",
+            "Description: Test library",
+            "Number of files: 2",
+            "Last Modified (Manifest): 2024-03-21T12:00:00Z",
+        ], result.stdout)
+
+    def test_update_library_with_changes(self):
+        mock_ipfs_instance = self.MockIPFSClient.return_value
 
         # Create and configure the initial library mock
-        initial_lib_mock = MagicMock(spec=Library)
+        initial_lib_mock = MagicMock(spec=LIBRARY_SPEC)
         initial_lib_mock.name = "updatelib2"
-        initial_lib_mock.manifest_path = MagicMock(spec=Path)
+        initial_lib_mock.manifest_path = MagicMock(spec=PATH_SPEC)
         initial_lib_mock.manifest_path.exists.return_value = True
         initial_lib_mock.manifest_path.__str__.return_value = str(TEST_CONFIG_DIR / "updatelib2_manifest.json")
         initial_lib_mock.manifest_path.name = (TEST_CONFIG_DIR / "updatelib2_manifest.json").name
@@ -387,7 +387,7 @@ class TestSciPFSCLI(unittest.TestCase):
         initial_lib_mock.manifest_data = initial_manifest.copy()
 
         # Create and configure the fetcher library mock
-        fetcher_lib_mock = MagicMock(spec=Library)
+        fetcher_lib_mock = MagicMock(spec=LIBRARY_SPEC)
         fetcher_lib_mock.name = "updatelib2"
         fetcher_lib_mock.manifest_cid = "QmNewCIDFromIPNS"
         fetcher_lib_mock.manifest_path = TEST_CONFIG_DIR / "updatelib2_manifest.json"
@@ -406,22 +406,22 @@ class TestSciPFSCLI(unittest.TestCase):
             return True
         initial_lib_mock.update_from_ipns = update_from_ipns_effect
 
-        MockLibrary.side_effect = [initial_lib_mock, fetcher_lib_mock]
+        self.MockLibrary.side_effect = [initial_lib_mock, fetcher_lib_mock]
 
         result = self.runner.invoke(cli, ['update', 'updatelib2'])
 
         self.assertEqual(result.exit_code, 0, msg=result.output)
-        self.assertIn("Updating library 'updatelib2' from IPNS name: /ipns/k51updatelib2", result.output)
-        self.assertIn("New Manifest CID: QmNewCIDFromIPNS", result.output)
+        self.assertIn("Updating library 'updatelib2' from IPNS name: /ipns/k51updatelib2", result.stdout)
+        self.assertIn("New Manifest CID: QmNewCIDFromIPNS", result.stdout)
         self.assertEqual(initial_lib_mock.manifest, new_manifest)
         self.assertEqual(initial_lib_mock.manifest_data, new_manifest)
 
     @patch('scipfs.cli.scipfs_config_instance.set_username')
     def test_config_set_username_success(self, mock_set_username):
-        result = self.runner.invoke(cli, ['config', 'set', 'username', 'newuser'])
+        result = self.runner.invoke(cli, ['config', 'set', 'username', 'newuser'], catch_exceptions=False)
         self.assertEqual(result.exit_code, 0, msg=result.output)
         mock_set_username.assert_called_once_with('newuser')
-        self.assertIn("Username set to: newuser", result.output)
+        self.assertIn("Username set to: newuser", result.stdout)
 
     @patch('scipfs.cli.scipfs_config_instance.set_username')
     def test_config_set_username_too_short(self, mock_set_username):
@@ -432,41 +432,37 @@ class TestSciPFSCLI(unittest.TestCase):
         
         result = self.runner.invoke(cli, ['config', 'set', 'username', 'nu'])
         self.assertNotEqual(result.exit_code, 0, msg=result.output)
-        self.assertIn("Error: Username must be at least 3 characters long.", result.output)
+        self.assertIn("Error: Username must be at least 3 characters long.", result.stderr)
 
-    @patch('scipfs.cli.IPFSClient')
-    def test_pin_cid_success(self, MockIPFSClient):
-        mock_ipfs_instance = MockIPFSClient.return_value
+    def test_pin_cid_success(self):
+        mock_ipfs_instance = self.MockIPFSClient.return_value
         test_cid = "QmTestCIDForPinning"
 
-        result = self.runner.invoke(cli, ['pin', 'cid', test_cid])
+        result = self.runner.invoke(cli, ['pin', 'cid', test_cid], catch_exceptions=False)
 
         self.assertEqual(result.exit_code, 0, msg=result.output)
         mock_ipfs_instance.pin.assert_called_once_with(test_cid)
-        self.assertIn(f"Attempting to pin CID: {test_cid}", result.output)
-        self.assertIn(f"Successfully pinned CID: {test_cid}", result.output)
+        self.assertIn(f"Attempting to pin CID: {test_cid}", result.stdout)
+        self.assertIn(f"Successfully pinned CID: {test_cid}", result.stdout)
 
     def test_pin_cid_invalid_format(self):
         result = self.runner.invoke(cli, ['pin', 'cid', 'invalidcidformat'])
         self.assertNotEqual(result.exit_code, 0, msg=result.output)
-        self.assertIn("invalid cid: selected encoding not supported", result.output)
+        self.assertIn("invalid cid: selected encoding not supported", result.stderr)
 
-    @patch('scipfs.cli.IPFSClient')
-    def test_pin_cid_ipfs_connection_error(self, MockIPFSClient):
-        mock_ipfs_instance = MockIPFSClient.return_value
+    def test_pin_cid_ipfs_connection_error(self):
+        mock_ipfs_instance = self.MockIPFSClient.return_value
         mock_ipfs_instance.pin.side_effect = ConnectionError("Failed to connect to IPFS daemon")
         test_cid = "QmValidCID"
 
         result = self.runner.invoke(cli, ['pin', 'cid', test_cid])
 
         self.assertNotEqual(result.exit_code, 0, msg=result.output)
-        self.assertIn("Error pinning CID QmValidCID: Failed to connect to IPFS daemon", result.output)
+        self.assertIn("Error pinning CID QmValidCID: Failed to connect to IPFS daemon", result.stderr)
 
-    @patch('scipfs.cli.Library')
-    @patch('scipfs.cli.IPFSClient')
-    def test_pin_library_success(self, MockIPFSClient, MockLibrary):
-        mock_ipfs_instance = MockIPFSClient.return_value
-        mock_library_instance = MockLibrary.return_value
+    def test_pin_library_success(self):
+        mock_ipfs_instance = self.MockIPFSClient.return_value
+        mock_library_instance = self.MockLibrary.return_value
 
         mock_library_instance.name = "pinlib"
         mock_library_instance.manifest_path.exists.return_value = True
@@ -480,18 +476,18 @@ class TestSciPFSCLI(unittest.TestCase):
         result = self.runner.invoke(cli, ['pin', 'library', 'pinlib'])
 
         self.assertEqual(result.exit_code, 0, msg=result.output)
-        MockLibrary.assert_called_once_with("pinlib", TEST_CONFIG_DIR, mock_ipfs_instance)
-        self.assertIn("Pinning library 'pinlib'", result.output)
-        self.assertIn("Pinning manifest (CID: QmPinManifestCID)", result.output)
-        self.assertIn("Manifest pinned successfully", result.output)
-        self.assertIn("Pinning 2 file(s) in library 'pinlib'", result.output)
-        self.assertIn("Finished pinning files: 2 succeeded, 0 failed/skipped", result.output)
-
-    @patch('scipfs.cli.Library')
-    @patch('scipfs.cli.IPFSClient')
-    def test_pin_library_empty_manifest_no_files(self, MockIPFSClient, MockLibrary):
-        mock_ipfs_instance = MockIPFSClient.return_value
-        mock_library_instance = MockLibrary.return_value
+        self.MockLibrary.assert_called_once_with("pinlib", TEST_CONFIG_DIR, mock_ipfs_instance)
+        self.assertAllIn([
+            "Pinning library 'pinlib'",
+            "Pinning manifest (CID: QmPinManifestCID)",
+            "Manifest pinned successfully",
+            "Pinning 2 file(s) in library 'pinlib'",
+            "Finished pinning files: 2 succeeded, 0 failed/skipped",
+        ], result.stdout)
+
+    def test_pin_library_empty_manifest_no_files(self):
+        mock_ipfs_instance = self.MockIPFSClient.return_value
+        mock_library_instance = self.MockLibrary.return_value
 
         mock_library_instance.name = "emptylib"
         mock_library_instance.manifest_path.exists.return_value = True
@@ -502,27 +498,19 @@ class TestSciPFSCLI(unittest.TestCase):
 
         self.assertEqual(result.exit_code, 0, msg=result.output)
         mock_ipfs_instance.pin.assert_called_once_with("QmEmptyManifestCID")
-        self.assertIn("Library 'emptylib' contains no files to pin", result.output)
+        self.assertIn("Library 'emptylib' contains no files to pin", result.stdout)
 
-    @patch('scipfs.cli.IPFSClient')
-    def test_pin_file_success(self, MockIPFSClient):
-        mock_ipfs_instance = MockIPFSClient.return_value
-        dummy_file_path_obj = TEST_CONFIG_DIR / "dummy_to_pin.txt"
+    def test_pin_file_success(self):
+        mock_ipfs_instance = self.MockIPFSClient.return_value
         expected_cid = "QmDummyFileCID"
-
-        with open(dummy_file_path_obj, "w") as f:
-            f.write("test pin content")
-
         mock_ipfs_instance.add_file.return_value = expected_cid
 
-        result = self.runner.invoke(cli, ['pin', 'file', str(dummy_file_path_obj)])
-        
-        dummy_file_path_obj.unlink()
+        result = self.runner.invoke(cli, ['pin', 'file', str(self.dummy_file)])
 
         self.assertEqual(result.exit_code, 0, msg=result.output)
-        mock_ipfs_instance.add_file.assert_called_once_with(dummy_file_path_obj, pin=True)
-        self.assertIn(f"File '{dummy_file_path_obj.name}' added to IPFS with CID: {expected_cid}", result.output)
-        self.assertIn(f"Successfully pinned CID: {expected_cid}", result.output)
+        mock_ipfs_instance.add_file.assert_called_once_with(self.dummy_file, pin=True)
+        self.assertIn(f"File '{self.dummy_file.name}' added to IPFS with CID: {expected_cid}", result.stdout)
+        self.assertIn(f"Successfully pinned CID: {expected_cid}", result.stdout)
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -3,83 +3,109 @@ import unittest
 from pathlib import Path
 import tempfile
 import shutil
-import os
-import pytest
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import patch, MagicMock
 import json
 import subprocess
 
-from scipfs.ipfs import IPFSClient, SciPFSFileNotFoundError, RuntimeError, SciPFSGoWrapperError
+from scipfs.ipfs import IPFSClient, SciPFSGoWrapperError
+from tests._tmpdir import TEST_TMPDIR
+
+def _completed_process(returncode=0, stdout_data=None, stderr_data=None):
+    """A CompletedProcess mock carrying the Go helper's JSON response."""
+    mock_proc = MagicMock(spec=subprocess.CompletedProcess)
+    mock_proc.returncode = returncode
+    mock_proc.stdout = json.dumps(stdout_data) if stdout_data is not None else ""
+    mock_proc.stderr = json.dumps(stderr_data) if stderr_data is not None else ""
+    return mock_proc
 
 class TestGetFile(unittest.TestCase):
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        self.client = IPFSClient()
-        self.test_dir = tempfile.mkdtemp()
-        
+    @classmethod
+    def setUpClass(cls):
+        """Set up the client and test file once; get_file never modifies the input file."""
+        # No Go helper lookup or IPFS daemon: subprocess.run returns canned Go helper responses
+        cls.patcher_find_wrapper = patch('scipfs.ipfs.IPFSClient._find_go_wrapper', return_value=None)
+        cls.patcher_find_wrapper.start()
+        cls.patcher_run = patch('subprocess.run')
+        cls.mock_run = cls.patcher_run.start()
+
+        cls.client = IPFSClient()
+        cls.client.go_wrapper_path = "/fake/path/to/scipfs_go_helper"
+        cls.client.go_wrapper_version = "0.1.0"
+        cls.test_dir = tempfile.mkdtemp(dir=TEST_TMPDIR)
+
         # Create a test file
-        self.test_file = Path(self.test_dir) / "test.txt"
-        self.test_content = b"Hello, IPFS!"
-        self.test_file.write_bytes(self.test_content)
-        
-    def tearDown(self):
-        """Clean up test fixtures after each test method."""
-        shutil.rmtree(self.test_dir)
-        
+        cls.test_file = Path(cls.test_dir) / "test.txt"
+        cls.test_content = b"Hello, IPFS!"
+        cls.test_file.write_bytes(cls.test_content)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher_run.stop()
+        cls.patcher_find_wrapper.stop()
+        shutil.rmtree(cls.test_dir)
+
+    def setUp(self):
+        self.mock_run.reset_mock(return_value=True, side_effect=True)
+
+    def _assert_get_file_raises(self, cid, go_response, expected_substrings):
+        """Assert get_file raises SciPFSGoWrapperError naming all expected_substrings, leaving no output file."""
+        output_path = Path(self.test_dir) / f"{self._testMethodName}.txt"
+        self.mock_run.return_value = go_response
+        with self.assertRaises(SciPFSGoWrapperError) as cm:
+            self.client.get_file(cid, output_path)
+        message = str(cm.exception).lower()
+        missing = [s for s in expected_substrings if s not in message]
+        self.assertFalse(missing, f"Unexpected error message: {cm.exception}")
+        self.assertFalse(output_path.exists())
+
     def test_get_file_success(self):
         """Test successful file download."""
+        def fake_go_helper(command_list, **kwargs):
+            go_command = command_list[3]
+            if go_command == "add_file":
+                return _completed_process(stdout_data={"success": True, "data": {"cid": "QmFake"}})
+            # get_cid_to_file: the Go helper writes the content to --output itself
+            output = Path(command_list[command_list.index("--output") + 1])
+            output.write_bytes(self.test_content)
+            return _completed_process(stdout_data={"success": True, "data": {}})
+        self.mock_run.side_effect = fake_go_helper
+
         # 1. Add a test file to IPFS
         cid = self.client.add_file(self.test_file)
-        self.assertIsNotNone(cid, "Failed to add test file to IPFS")
-        
+        self.assertEqual(cid, "QmFake", "Failed to add test file to IPFS")
+
         # 2. Download it using get_file
         output_path = Path(self.test_dir) / "downloaded.txt"
         self.client.get_file(cid, output_path)
-        
+
         # 3. Verify the downloaded file matches the original
         self.assertTrue(output_path.exists(), "Downloaded file does not exist")
         downloaded_content = output_path.read_bytes()
-        self.assertEqual(downloaded_content, self.test_content, 
+        self.assertEqual(downloaded_content, self.test_content,
                         "Downloaded content does not match original")
-        
+        self.assertEqual(
+            self.mock_run.call_args[0][0],
+            [self.client.go_wrapper_path, '-api', self.client.api_addr, 'get_cid_to_file',
+             '--cid', cid, '--output', str(output_path)],
+        )
+
     def test_get_file_nonexistent_cid(self):
-        """Test getting a file with a non-existent but validly formatted CID."""
-        # Using a CID that is validly formatted (CIDv1, sha2-256, raw) but highly unlikely to exist.
-        # This is better than an invalidly formatted CID for testing actual 'cat' failure.
-        # However, our Go helper validates with cid.Decode first.
-        # If cid.Decode passes but 'ipfs cat' fails, the error would come from 'ipfs cat' execution.
-        # If cid.Decode fails (e.g. "QmNonExistent..." is too short), that error comes first.
-        # Let's use a CID that *should* pass cid.Decode but likely won't be found by 'cat'.
-        # For example, a CID of some random bytes: echo "random_nonexistent_data_string" | ipfs add -Q --cid-version 1
-        # This yields: bafkreic7kcvocg3h7palqcoayyq7yr7t4fnxkigpxtjftxhlisxetbpyva
-        # For robustness, this test should ideally mock the Go helper to simulate 'ipfs cat' error for a non-existent CID
-        # if we want to differentiate from "invalid CID format".
-        # For now, we test the path where the CID is validly formatted but cat fails (or decode fails if CID is bad).
-        
-        # Using a CID that is valid but unlikely to exist to test the 'cat' path.
-        # For this test, we'll actually check the behavior with an *invalidly formatted* CID first,
-        # as this is what the original "QmNonExistentCID123456789" was closer to testing.
-        # The go wrapper's cid.Decode will catch this.
-        nonexistent_cid = "QmNonExistentTooShort" # Clearly invalid format
-        output_path = Path(self.test_dir) / "nonexistent.txt"
-        
-        with self.assertRaises(SciPFSGoWrapperError) as cm:
-            self.client.get_file(nonexistent_cid, output_path)
-        # Check that the error message indicates an issue with the CID itself or its retrieval by cat
-        self.assertTrue(
-            "invalid cid" in str(cm.exception).lower() or 
-            "could not cat object" in str(cm.exception).lower() or # If cat fails for a valid CID
-            "selected encoding not supported" in str(cm.exception).lower(),
-            f"Unexpected error message: {str(cm.exception)}"
+        """Test getting a file with a validly formatted CID that 'ipfs cat' can't find."""
+        # Passes the Go helper's cid.Decode check, so the failure comes from 'cat'
+        nonexistent_cid = "bafkreic7kcvocg3h7palqcoayyq7yr7t4fnxkigpxtjftxhlisxetbpyva"
+        self._assert_get_file_raises(
+            nonexistent_cid,
+            _completed_process(returncode=1, stderr_data={"success": False, "error": f"could not cat object {nonexistent_cid}: not found"}),
+            ["could not cat object", nonexistent_cid],
         )
 
     def test_get_file_invalid_cid(self):
         """Test getting a file with an invalid CID format."""
-        invalid_cid = "not-a-valid-cid"
-        output_path = Path(self.test_dir) / "invalid.txt"
-        with self.assertRaises(SciPFSGoWrapperError) as cm: # Updated exception type
-            self.client.get_file(invalid_cid, output_path)
-        self.assertIn("invalid cid", str(cm.exception).lower()) # Check for part of the new error message
+        self._assert_get_file_raises(
+            "not-a-valid-cid",
+            _completed_process(stdout_data={"success": False, "error": "invalid cid: selected encoding not supported"}),
+            ["invalid cid"],
+        )
 
 if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file
+    unittest.main()
@@ -3,7 +3,10 @@ import unittest
 import tempfile
 from pathlib import Path
 from scipfs.ipfs import IPFSClient, RuntimeError, SciPFSGoWrapperError, SciPFSFileNotFoundError
+from tests._markers import requires_ipfs
+from tests._tmpdir import TEST_TMPDIR
 
+@requires_ipfs
 class TestIPNSOperations(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures before each test method."""
@@ -11,7 +14,7 @@ class TestIPNSOperations(unittest.TestCase):
         self.test_key_name = "test_key"
         
         # Create a test file for publishing
-        self.test_dir = tempfile.mkdtemp()
+        self.test_dir = tempfile.mkdtemp(dir=TEST_TMPDIR)
         self.test_file = Path(self.test_dir) / "test.txt"
         self.test_content = b"Hello, IPNS!"
         self.test_file.write_bytes(self.test_content)
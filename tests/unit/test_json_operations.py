@@ -5,9 +5,11 @@ import tempfile
 from pathlib import Path
 from scipfs.ipfs import IPFSClient, SciPFSGoWrapperError, SciPFSException
 import logging
+from tests._markers import requires_ipfs
 
 logger = logging.getLogger(__name__)
 
+@requires_ipfs
 class TestJsonOperations(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures before each test method."""
@@ -7,13 +7,13 @@ from datetime import datetime
 # Ensure scipfs modules are importable. Adjust path if tests are run from a different root.
 # This might require adding the project root to sys.path or using `python -m unittest discover`
 try:
-    from scipfs.library import Library
+    from scipfs.library import Library, FileEntry
     from scipfs.ipfs import IPFSClient, SciPFSException, SciPFSFileNotFoundError
 except ImportError:
     # Fallback for cases where tests might be run in a way that scipfs is not directly in pythonpath
     import sys
     sys.path.insert(0, str(Path(__file__).parent.parent))
-    from scipfs.library import Library
+    from scipfs.library import Library, FileEntry
     from scipfs.ipfs import IPFSClient, SciPFSException, SciPFSFileNotFoundError
 
 
@@ -85,9 +85,10 @@ class TestLibrary(unittest.TestCase):
         file_info = library.manifest["files"][mock_file_path.name]
         
         expected_iso_ts = datetime.fromtimestamp(fixed_timestamp).isoformat()
-        self.assertEqual(file_info["added_timestamp"], expected_iso_ts)
-        self.assertEqual(file_info["added_by"], "testuser")
-        self.assertEqual(file_info["cid"], "QmFileCID1")
+        self.assertIsInstance(file_info, FileEntry)
+        self.assertEqual(file_info.added_timestamp, expected_iso_ts)
+        self.assertEqual(file_info.added_by, "testuser")
+        self.assertEqual(file_info.cid, "QmFileCID1")
         self.mock_ipfs_client.add_file.assert_called_with(mock_file_path)
         self.mock_ipfs_client.pin.assert_any_call("QmFileCID1") # Pinning file CID
         self.mock_ipfs_client.pin.assert_any_call("QmManifestCIDAfterAdd") # Pinning new manifest CID
@@ -96,7 +97,7 @@ class TestLibrary(unittest.TestCase):
     @patch('scipfs.library.Library._save_manifest') # Mock _save_manifest to isolate update logic
     def test_update_from_ipns_success_update(self, mock_save_manifest):
         initial_manifest_cid = "QmOldManifestCID"
-        new_resolved_cid = "QmNewManifestCID"
+        new_resolved_cid = "bafybeigdyrzt5sfp7udm7hu76uh7y26nf3efuylqabf3oclgtqy55fbzdi"
         
         # Setup library with an initial state
         library = Library(self.library_name, self.config_dir, self.mock_ipfs_client)
@@ -141,6 +142,15 @@ class TestLibrary(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "Library does not have an IPNS name for updates."):
             library.update_from_ipns()
 
+    def test_update_from_ipns_invalid_cid(self):
+        library = Library(self.library_name, self.config_dir, self.mock_ipfs_client)
+        library.ipns_name = "/ipns/k_test_peer_id"
+        self.mock_ipfs_client.resolve_ipns_name.return_value = "/ipfs/not-a-cid"
+
+        with self.assertRaisesRegex(ValueError, "invalid CID"):
+            library.update_from_ipns()
+        self.mock_ipfs_client.get_json.assert_not_called()
+
     def test_update_from_ipns_resolve_fails(self):
         library = Library(self.library_name, self.config_dir, self.mock_ipfs_client)
         library.ipns_name = "/ipns/k_test_peer_id"
@@ -151,7 +161,7 @@ class TestLibrary(unittest.TestCase):
             
     def test_get_file_info(self):
         library = Library(self.library_name, self.config_dir, self.mock_ipfs_client)
-        file_data = {"cid": "QmFile1", "size": 123, "added_timestamp": datetime.now().isoformat(), "added_by": "user1"}
+        file_data = FileEntry(cid="QmFile1", size=123, added_timestamp=datetime.now().isoformat(), added_by="user1")
         library.manifest["files"]["test_file.txt"] = file_data
 
         info = library.get_file_info("test_file.txt")
@@ -163,5 +173,28 @@ class TestLibrary(unittest.TestCase):
         info_none = library.get_file_info("non_existent_file.txt")
         self.assertIsNone(info_none)
 
+    def test_manifest_file_entries_round_trip(self):
+        self.mock_ipfs_client.add_json.return_value = "QmRoundTripCID"
+        library = Library(self.library_name, self.config_dir, self.mock_ipfs_client)
+        library.manifest["files"]["a.txt"] = FileEntry(cid="QmA", size=1, added_timestamp="2023-01-01T12:00:00", added_by="user1")
+        # An entry written by a newer peer with fields this version doesn't know about
+        newer_entry = {"cid": "QmB", "size": 2, "added_timestamp": "2023-01-02T12:00:00", "added_by": "user2",
+                       "summary": "A short summary.", "tags": ["physics", "notes"]}
+        library.manifest["files"]["b.txt"] = FileEntry.from_dict(newer_entry)
+        library._save_manifest()
+
+        added_manifest = self.mock_ipfs_client.add_json.call_args[0][0]
+        self.assertEqual(added_manifest["files"]["a.txt"], {"cid": "QmA", "size": 1, "added_timestamp": "2023-01-01T12:00:00", "added_by": "user1"})
+        self.assertEqual(added_manifest["files"]["b.txt"], newer_entry)
+
+        reloaded = Library(self.library_name, self.config_dir, self.mock_ipfs_client)
+        self.assertEqual(reloaded.manifest["files"]["a.txt"], library.manifest["files"]["a.txt"])
+        self.assertEqual(reloaded.manifest["files"]["b.txt"], library.manifest["files"]["b.txt"])
+        self.assertEqual(reloaded.manifest_cid, "QmRoundTripCID")
+
+        # Saving again after the reload, as add_file does, still carries the unknown fields
+        reloaded._save_manifest()
+        self.assertEqual(self.mock_ipfs_client.add_json.call_args[0][0]["files"]["b.txt"], newer_entry)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
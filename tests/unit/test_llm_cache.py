@@ -0,0 +1,49 @@
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+
+from scipfs.llm_cache import LLMCache
+
+
+class TestLLMCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_path = Path(self.test_dir) / "llm_cache.sqlite3"
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_put_get_roundtrip_persists_across_instances(self):
+        cache = LLMCache(self.cache_path)
+        cache.put(b"k1", "gpt-4o-mini", "summary", "A summary.")
+        cache.put(b"k2", "gpt-4o-mini", "tags", ["a", "b"])
+        cache.close()
+
+        reopened = LLMCache(self.cache_path)
+        self.assertEqual(reopened.get(b"k1"), "A summary.")
+        self.assertEqual(reopened.get(b"k2"), ["a", "b"])
+        self.assertIsNone(reopened.get(b"missing"))
+        reopened.close()
+
+    def test_least_recently_used_entries_evicted(self):
+        cache = LLMCache(self.cache_path, max_entries=2)
+        cache._TRIM_EVERY = 1
+        cache.put(b"old", None, "summary", "old")
+        cache.put(b"recent", None, "summary", "recent")
+        self.assertEqual(cache.get(b"old"), "old") # Touch, so "recent" is now least recently used
+        cache.put(b"new", None, "summary", "new")
+        self.assertIsNone(cache.get(b"recent"))
+        self.assertEqual(cache.get(b"old"), "old")
+        self.assertEqual(cache.get(b"new"), "new")
+        cache.close()
+
+    def test_storage_errors_are_treated_as_misses(self):
+        cache = LLMCache(self.cache_path)
+        cache.close()
+        self.assertIsNone(cache.get(b"k1"))
+        cache.put(b"k1", None, "summary", "ignored") # Must not raise
+
+
+if __name__ == '__main__':
+    unittest.main()
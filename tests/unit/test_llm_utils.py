@@ -1,27 +1,33 @@
 import unittest
+import asyncio
 from unittest.mock import MagicMock, patch, ANY
 import json
 from pathlib import Path
 import sys
+import os
+import threading
+import time
+import shutil
+import tempfile
 
 # Ensure scipfs modules are importable
 try:
     from scipfs.llm_utils import (
-        LLMClient,
+        LLMClient, TokenBucket, get_llm_client, _cached_client, _SDK_CLIENTS, _RESPONSE_CACHE, _chunk_text, _open_disk_cache,
         LLMError, LLMProviderNotFound, LLMAPIKeyError, 
         LLMClientInitializationError, LLMAPIError,
-        LLMResponseFormatError, LLMRateLimitError, LLMAuthenticationError
+        LLMResponseFormatError, LLMRateLimitError, LLMAuthenticationError, LLMConnectionError, LLMServerError
     )
-    from scipfs.llm_config import llm_config, LLMProviderConfig, GlobalLLMConfig
+    from scipfs.llm_config import llm_config, LLMProviderConfig, GlobalLLMConfig, get_llm_config
 except ImportError:
     sys.path.insert(0, str(Path(__file__).parent.parent))
     from scipfs.llm_utils import (
-        LLMClient,
+        LLMClient, TokenBucket, get_llm_client, _cached_client, _SDK_CLIENTS, _RESPONSE_CACHE, _chunk_text, _open_disk_cache,
         LLMError, LLMProviderNotFound, LLMAPIKeyError, 
         LLMClientInitializationError, LLMAPIError,
-        LLMResponseFormatError, LLMRateLimitError, LLMAuthenticationError
+        LLMResponseFormatError, LLMRateLimitError, LLMAuthenticationError, LLMConnectionError, LLMServerError
     )
-    from scipfs.llm_config import llm_config, LLMProviderConfig, GlobalLLMConfig    
+    from scipfs.llm_config import llm_config, LLMProviderConfig, GlobalLLMConfig, get_llm_config
 
 # Mock SDKs before they are potentially imported by llm_utils
 # This is a common pattern: set up mocks for things that would be imported.
@@ -36,6 +42,7 @@ class MockOpenAIAPIError(Exception): pass
 class MockOpenAIRateLimitError(MockOpenAIAPIError): pass
 class MockOpenAIAuthError(MockOpenAIAPIError): pass
 class MockOpenAIConnectionError(MockOpenAIAPIError): pass
+class MockOpenAIInternalServerError(MockOpenAIAPIError): pass
 
 class MockAnthropicAPIError(Exception): pass
 class MockAnthropicRateLimitError(MockAnthropicAPIError): pass
@@ -92,26 +99,53 @@ class TestLLMClient(unittest.TestCase):
         mock_openai.OpenAI.return_value = MagicMock() 
         mock_anthropic.Anthropic.return_value = MagicMock()
         mock_groq.Groq.return_value = MagicMock()
+        _SDK_CLIENTS.clear()
+        _RESPONSE_CACHE.clear()
+        _cached_client.cache_clear()
+        self.http_client_patcher = patch('scipfs.llm_utils._shared_http_client', return_value=None)
+        self.mock_shared_http_client = self.http_client_patcher.start()
 
         # Mock the global llm_config. We'll often override specific provider configs per test.
-        self.mock_llm_config_patcher = patch('scipfs.llm_utils.llm_config', spec=GlobalLLMConfig)
-        self.mock_llm_config = self.mock_llm_config_patcher.start()
+        self.mock_llm_config = MagicMock(spec=GlobalLLMConfig)
+        self.mock_llm_config_patcher = patch('scipfs.llm_utils.get_llm_config', return_value=self.mock_llm_config)
+        self.mock_llm_config_patcher.start()
         
         # Setup some default behavior for the mocked llm_config
         self.mock_openai_provider_config = MagicMock(spec=LLMProviderConfig)
         self.mock_openai_provider_config.provider_name = "openai"
         self.mock_openai_provider_config.get_api_key.return_value = "fake_openai_key"
         self.mock_openai_provider_config.default_model = "gpt-4o-mini"
+        self.mock_openai_provider_config.use_batch_api = False
+        self.mock_openai_provider_config.rate_limit_rps = None
+        self.mock_openai_provider_config.max_concurrency = None
+        self.mock_openai_provider_config.timeout_s = 30.0
+        self.mock_openai_provider_config.connect_timeout_s = 5.0
+        self.mock_openai_provider_config.max_retries = None
+        self.mock_openai_provider_config.context_window = None
 
         self.mock_anthropic_provider_config = MagicMock(spec=LLMProviderConfig)
         self.mock_anthropic_provider_config.provider_name = "anthropic"
         self.mock_anthropic_provider_config.get_api_key.return_value = "fake_anthropic_key"
         self.mock_anthropic_provider_config.default_model = "claude-3-haiku"
+        self.mock_anthropic_provider_config.use_batch_api = False
+        self.mock_anthropic_provider_config.rate_limit_rps = None
+        self.mock_anthropic_provider_config.max_concurrency = None
+        self.mock_anthropic_provider_config.timeout_s = 30.0
+        self.mock_anthropic_provider_config.connect_timeout_s = 5.0
+        self.mock_anthropic_provider_config.max_retries = None
+        self.mock_anthropic_provider_config.context_window = None
 
         self.mock_groq_provider_config = MagicMock(spec=LLMProviderConfig)
         self.mock_groq_provider_config.provider_name = "groq"
         self.mock_groq_provider_config.get_api_key.return_value = "fake_groq_key"
         self.mock_groq_provider_config.default_model = "mixtral-8x7b-32768"
+        self.mock_groq_provider_config.use_batch_api = False
+        self.mock_groq_provider_config.rate_limit_rps = None
+        self.mock_groq_provider_config.max_concurrency = None
+        self.mock_groq_provider_config.timeout_s = 30.0
+        self.mock_groq_provider_config.connect_timeout_s = 5.0
+        self.mock_groq_provider_config.max_retries = None
+        self.mock_groq_provider_config.context_window = None
 
         # Default provider for llm_config mock
         self.mock_llm_config.get_default_provider.return_value = self.mock_openai_provider_config
@@ -124,28 +158,75 @@ class TestLLMClient(unittest.TestCase):
         self.mock_llm_config.default_max_tokens_tags = 50
         self.mock_llm_config.default_num_tags = 5
         self.mock_llm_config.default_temperature = 0.7
+        self.mock_llm_config.rate_limit_rps = 0 # No client-side pacing in tests
+        self.mock_llm_config.rate_limit_burst = 16
+        self.mock_llm_config.max_retries = 0
+        self.mock_llm_config.max_concurrency = 10
+        self.mock_llm_config.failover_chain = []
+        self.mock_llm_config.warmup_on_init = False
+        self.mock_llm_config.enable_chunked_summary = True
+        self.mock_llm_config.summary_chunk_chars = 8000
+        self.mock_llm_config.summary_chunk_overlap = 200
+        self.mock_llm_config.max_input_tokens = 24000
+        self.mock_llm_config.batch_api_threshold = 8
+        self.mock_llm_config.enable_disk_cache = False
 
     def tearDown(self):
         self.mock_llm_config_patcher.stop()
+        self.http_client_patcher.stop()
 
     def test_init_success_default_provider(self):
         # Uses OpenAI as default from setUp
         client = LLMClient()
         self.assertEqual(client.provider_config.provider_name, "openai")
         self.assertEqual(client.model_name, "gpt-4o-mini")
-        mock_openai.OpenAI.assert_called_once_with(api_key="fake_openai_key")
+        mock_openai.OpenAI.assert_called_once_with(api_key="fake_openai_key", timeout=ANY, max_retries=0)
 
     def test_init_success_specific_provider_anthropic(self):
         client = LLMClient(provider_name="anthropic")
         self.assertEqual(client.provider_config.provider_name, "anthropic")
         self.assertEqual(client.model_name, "claude-3-haiku")
-        mock_anthropic.Anthropic.assert_called_once_with(api_key="fake_anthropic_key")
+        mock_anthropic.Anthropic.assert_called_once_with(api_key="fake_anthropic_key", timeout=ANY, max_retries=0)
 
     def test_init_success_specific_provider_groq_with_model(self):
         client = LLMClient(provider_name="groq", model_name="llama3-70b-8192")
         self.assertEqual(client.provider_config.provider_name, "groq")
         self.assertEqual(client.model_name, "llama3-70b-8192")
-        mock_groq.Groq.assert_called_once_with(api_key="fake_groq_key")
+        mock_groq.Groq.assert_called_once_with(api_key="fake_groq_key", timeout=ANY, max_retries=0)
+
+    @patch('scipfs.llm_utils._sdk_timeout', return_value="bounded_timeout")
+    def test_init_passes_provider_timeout_and_disables_sdk_retries(self, mock_sdk_timeout):
+        self.mock_groq_provider_config.timeout_s = 10.0
+        self.mock_groq_provider_config.max_retries = 1 # Used by _complete_with_retries, never by the SDK
+        LLMClient(provider_name="groq")
+        mock_sdk_timeout.assert_called_once_with(10.0, 5.0)
+        mock_groq.Groq.assert_called_once_with(api_key="fake_groq_key", timeout="bounded_timeout", max_retries=0)
+
+    def test_init_imports_only_selected_provider_sdk(self):
+        import importlib
+        with patch('scipfs.llm_utils.importlib.import_module', wraps=importlib.import_module) as mock_import:
+            LLMClient(provider_name="groq")
+            LLMClient(provider_name="groq", model_name="llama3-70b-8192") # Served from the SDK client cache
+        mock_import.assert_called_once_with("groq")
+
+    def test_warmup_on_init_surfaces_invalid_key_on_first_request(self):
+        self.mock_llm_config.warmup_on_init = True
+        mock_sdk_instance = mock_openai.OpenAI.return_value
+        mock_sdk_instance.models.list.side_effect = MockOpenAIAuthError("invalid key")
+        client = LLMClient(provider_name="openai")
+        with self.assertRaises(LLMAuthenticationError):
+            client.summarize("Some text.")
+        mock_sdk_instance.chat.completions.create.assert_not_called()
+
+    def test_warmup_success_does_not_affect_requests(self):
+        client = LLMClient(provider_name="openai")
+        mock_sdk_instance = mock_openai.OpenAI.return_value
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="Summary."))]
+        mock_sdk_instance.chat.completions.create.return_value = mock_response
+        client.start_warmup()
+        self.assertEqual(client.summarize("Some text."), "Summary.")
+        mock_sdk_instance.models.list.assert_called_once()
 
     def test_init_provider_not_found(self):
         self.mock_llm_config.get_provider_config.return_value = None
@@ -173,6 +254,46 @@ class TestLLMClient(unittest.TestCase):
         # It might be good practice to reset the side_effect here if not done in setUp/tearDown thoroughly
         # For now, relying on setUp to clear it for the next test.
 
+    def test_init_provider_without_adapter(self):
+        custom_config = MagicMock(spec=LLMProviderConfig)
+        custom_config.provider_name = "custom"
+        custom_config.get_api_key.return_value = "fake_custom_key"
+        custom_config.default_model = "custom-model"
+        self.mock_llm_config.get_provider_config.side_effect = lambda name: custom_config
+        with self.assertRaisesRegex(LLMClientInitializationError, "SDK client for provider 'custom' is not implemented."):
+            LLMClient(provider_name="custom")
+
+    def test_init_passes_shared_http_client(self):
+        shared_http_client = MagicMock()
+        self.mock_shared_http_client.return_value = shared_http_client
+        LLMClient(provider_name="groq")
+        mock_groq.Groq.assert_called_once_with(api_key="fake_groq_key", timeout=ANY, max_retries=0, http_client=shared_http_client)
+
+    def test_init_reuses_sdk_client_for_same_key(self):
+        first = LLMClient(provider_name="openai")
+        second = LLMClient(provider_name="openai", model_name="gpt-4o")
+        self.assertIs(second.client_instance, first.client_instance)
+        mock_openai.OpenAI.assert_called_once_with(api_key="fake_openai_key", timeout=ANY, max_retries=0)
+
+        self.mock_openai_provider_config.get_api_key.return_value = "rotated_key"
+        LLMClient(provider_name="openai")
+        mock_openai.OpenAI.assert_called_with(api_key="rotated_key", timeout=ANY, max_retries=0)
+        self.assertEqual(mock_openai.OpenAI.call_count, 2)
+
+    def test_get_llm_client_shares_instance_until_key_rotates(self):
+        first = get_llm_client("openai")
+        self.assertIs(get_llm_client("openai"), first)
+        self.assertIs(get_llm_client(), first) # Default provider resolves to the same client
+        self.assertIsNot(get_llm_client("openai", model_name="gpt-4o"), first)
+
+        self.mock_openai_provider_config.get_api_key.return_value = "rotated_key"
+        self.assertIsNot(get_llm_client("openai"), first)
+
+    def test_get_llm_client_missing_key_raises(self):
+        self.mock_openai_provider_config.get_api_key.return_value = None
+        with self.assertRaises(LLMAPIKeyError):
+            get_llm_client("openai")
+
     # --- Summarize Tests --- 
     def test_summarize_openai_success(self):
         client = LLMClient(provider_name="openai")
@@ -188,6 +309,61 @@ class TestLLMClient(unittest.TestCase):
         self.assertEqual(call_args[1]['model'], "gpt-4o-mini")
         self.assertIn("Summarize the following text", call_args[1]['messages'][1]['content'])
 
+    def test_summarize_cached_for_identical_request(self):
+        client = LLMClient(provider_name="openai")
+        mock_sdk_instance = mock_openai.OpenAI.return_value
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="Cached summary."))]
+        mock_sdk_instance.chat.completions.create.return_value = mock_response
+
+        self.assertEqual(client.summarize("Same text."), "Cached summary.")
+        self.assertEqual(LLMClient(provider_name="openai").summarize("Same text."), "Cached summary.")
+        mock_sdk_instance.chat.completions.create.assert_called_once()
+
+        client.summarize("Same text.", temperature=0.1) # Different settings miss the cache
+        self.assertEqual(mock_sdk_instance.chat.completions.create.call_count, 2)
+
+    def test_summarize_served_from_disk_cache_across_runs(self):
+        test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, test_dir)
+        self.mock_llm_config.enable_disk_cache = True
+        self.mock_llm_config.disk_cache_path = Path(test_dir) / "llm_cache.sqlite3"
+        self.mock_llm_config.disk_cache_max_entries = 100
+        self.addCleanup(_open_disk_cache.cache_clear)
+        client = LLMClient(provider_name="openai")
+        mock_sdk_instance = mock_openai.OpenAI.return_value
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="Disk cached summary."))]
+        mock_sdk_instance.chat.completions.create.return_value = mock_response
+
+        self.assertEqual(client.summarize("Same text."), "Disk cached summary.")
+        _RESPONSE_CACHE.clear() # Simulate a new process
+        self.assertEqual(client.summarize("Same text."), "Disk cached summary.")
+        mock_sdk_instance.chat.completions.create.assert_called_once()
+
+    def test_summarize_long_text_map_reduce(self):
+        self.mock_llm_config.summary_chunk_chars = 40
+        self.mock_llm_config.summary_chunk_overlap = 0
+        client = LLMClient(provider_name="openai")
+        mock_sdk_instance = mock_openai.OpenAI.return_value
+        batch_response, final_response = MagicMock(), MagicMock()
+        batch_response.choices = [MagicMock(message=MagicMock(content=json.dumps(["part one", "part two"])))]
+        final_response.choices = [MagicMock(message=MagicMock(content="Final summary."))]
+        mock_sdk_instance.chat.completions.create.side_effect = [batch_response, final_response]
+
+        text = "First sentence is here. Second one. Third sentence ends it."
+        self.assertEqual(client.summarize(text), "Final summary.")
+        final_prompt = mock_sdk_instance.chat.completions.create.call_args[1]['messages'][1]['content']
+        self.assertIn("part one\n\npart two", final_prompt)
+
+    def test_chunk_text_splits_at_sentences_with_overlap(self):
+        text = "Alpha beta. Gamma delta. Epsilon zeta."
+        self.assertEqual(_chunk_text(text, max_chars=100), [text])
+        self.assertEqual(_chunk_text(text, max_chars=25, overlap=0), ["Alpha beta. Gamma delta.", "Epsilon zeta."])
+        chunks = _chunk_text(text, max_chars=25, overlap=6)
+        self.assertTrue(chunks[1].startswith("delta."))
+        self.assertTrue(all(len(chunk) <= 25 for chunk in chunks))
+
     def test_summarize_anthropic_rate_limit(self):
         # Ensure Anthropic mock is configured for successful init for this test
         # The rate limit error is on the messages.create call, not init
@@ -200,7 +376,156 @@ class TestLLMClient(unittest.TestCase):
         with self.assertRaisesRegex(LLMRateLimitError, "Rate limit exceeded with Anthropic: Rate limit hit"):
             client.summarize("Text for Anthropic.")
 
+    def test_sdk_error_translation_prefers_most_specific_class(self):
+        client = LLMClient(provider_name="openai")
+        mock_sdk_instance = mock_openai.OpenAI.return_value
+        for sdk_error, llm_error, message in [
+            (MockOpenAIAuthError("bad key"), LLMAuthenticationError, "Authentication failed with OpenAI: bad key"),
+            (MockOpenAIConnectionError("down"), LLMAPIError, "API connection error with OpenAI: down"),
+            (MockOpenAIAPIError("500"), LLMAPIError, "API error with OpenAI: 500"),
+            (ValueError("odd"), LLMAPIError, "Unexpected error with OpenAI summarization: odd"),
+        ]:
+            mock_sdk_instance.chat.completions.create.side_effect = sdk_error
+            with self.assertRaises(llm_error) as ctx:
+                client.summarize("Error text %s" % message)
+            self.assertEqual(str(ctx.exception), message)
+            self.assertIs(ctx.exception.__cause__, sdk_error)
+
+    @patch('scipfs.llm_utils.time.sleep')
+    def test_summarize_retries_after_rate_limit(self, mock_sleep):
+        self.mock_llm_config.max_retries = 2
+        client = LLMClient(provider_name="openai")
+        mock_sdk_instance = mock_openai.OpenAI.return_value
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="After retry."))]
+        mock_sdk_instance.chat.completions.create.side_effect = [MockOpenAIRateLimitError("429"), mock_response]
+
+        self.assertEqual(client.summarize("Retry text."), "After retry.")
+        self.assertEqual(mock_sdk_instance.chat.completions.create.call_count, 2)
+        mock_sleep.assert_called_once()
+
+    @patch('scipfs.llm_utils.time.sleep')
+    def test_persistent_rate_limit_calls_adapter_max_retries_plus_one_times(self, mock_sleep):
+        self.mock_llm_config.max_retries = 3
+        mock_create = mock_openai.OpenAI.return_value.chat.completions.create
+        mock_create.side_effect = MockOpenAIRateLimitError("429")
+        # (provider override, expected SDK calls): the SDK itself never retries, so calls == retries + 1
+        for provider_max_retries, expected_calls in [(None, 4), (1, 2)]:
+            with self.subTest(provider_max_retries=provider_max_retries):
+                mock_create.reset_mock()
+                mock_sleep.reset_mock()
+                self.mock_openai_provider_config.max_retries = provider_max_retries
+                client = LLMClient(provider_name="openai")
+                with self.assertRaises(LLMRateLimitError):
+                    client.summarize("Always rate limited %s." % provider_max_retries)
+                self.assertEqual(mock_create.call_count, expected_calls)
+                self.assertEqual(mock_sleep.call_count, expected_calls - 1)
+
+    @patch('scipfs.llm_utils.time.sleep')
+    def test_summarize_retries_after_server_error(self, mock_sleep):
+        self.mock_llm_config.max_retries = 2
+        client = LLMClient(provider_name="openai")
+        mock_create = mock_openai.OpenAI.return_value.chat.completions.create
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="After 500."))]
+        server_error = MockOpenAIInternalServerError("internal error")
+        server_error.status_code = 500
+        mock_create.side_effect = [server_error, mock_response]
+        self.assertEqual(client.summarize("Server error text."), "After 500.")
+        self.assertEqual(mock_create.call_count, 2)
+
+        bad_request = MockOpenAIAPIError("bad request")
+        bad_request.status_code = 400
+        mock_create.reset_mock()
+        mock_create.side_effect = bad_request
+        with self.assertRaises(LLMAPIError) as ctx:
+            client.summarize("Bad request text.")
+        self.assertNotIsInstance(ctx.exception, LLMServerError)
+        mock_create.assert_called_once()
+
+    def test_summarize_fails_over_to_next_provider(self):
+        self.mock_llm_config.failover_chain = ["openai", "anthropic", "groq"]
+        self.mock_anthropic_provider_config.get_api_key.return_value = None # Skipped: no key
+        client = LLMClient(provider_name="openai")
+        mock_openai.OpenAI.return_value.chat.completions.create.side_effect = MockOpenAIConnectionError("timed out")
+        mock_groq_response = MagicMock()
+        mock_groq_response.choices = [MagicMock(message=MagicMock(content="Groq summary."))]
+        mock_groq.Groq.return_value.chat.completions.create.return_value = mock_groq_response
+
+        self.assertEqual(client.summarize("Some text."), "Groq summary.")
+        mock_anthropic.Anthropic.assert_not_called()
+        # Groq's answer isn't cached as OpenAI's, so the next call asks again
+        self.assertEqual(client.summarize("Some text."), "Groq summary.")
+        self.assertEqual(mock_groq.Groq.return_value.chat.completions.create.call_count, 2)
+
+    def test_generate_tags_failover_uses_fallback_models_json_mode(self):
+        self.mock_llm_config.failover_chain = ["openai"]
+        self.mock_openai_provider_config.default_model = "o1-mini" # Not in the JSON-mode allow-list
+        client = LLMClient(provider_name="groq")
+        mock_groq.Groq.return_value.chat.completions.create.side_effect = MockGroqConnectionError("timed out")
+        mock_openai_response = MagicMock()
+        mock_openai_response.choices = [MagicMock(message=MagicMock(content='["t1"]'))]
+        mock_openai_create = mock_openai.OpenAI.return_value.chat.completions.create
+        mock_openai_create.return_value = mock_openai_response
+
+        self.assertEqual(client.generate_tags("Some text.", num_tags=1), ["t1"])
+        self.assertIn("response_format", mock_groq.Groq.return_value.chat.completions.create.call_args[1])
+        self.assertNotIn("response_format", mock_openai_create.call_args[1])
+
+    def test_summarize_without_failover_raises_connection_error(self):
+        client = LLMClient(provider_name="openai")
+        mock_openai.OpenAI.return_value.chat.completions.create.side_effect = MockOpenAIConnectionError("timed out")
+        with self.assertRaises(LLMConnectionError):
+            client.summarize("Some text.")
+
+    @patch('scipfs.llm_utils.time.sleep')
+    @patch('scipfs.llm_utils.time.monotonic')
+    def test_token_bucket_waits_when_empty(self, mock_monotonic, mock_sleep):
+        mock_monotonic.return_value = 100.0
+        bucket = TokenBucket(rate=2.0, capacity=1)
+        bucket.acquire()
+        mock_sleep.assert_not_called()
+        mock_sleep.side_effect = lambda seconds: setattr(mock_monotonic, 'return_value', 100.0 + seconds)
+        bucket.acquire()
+        mock_sleep.assert_called_once_with(0.5)
+
+    def test_generate_tags_truncates_long_input(self):
+        self.mock_llm_config.max_input_tokens = 10
+        client = LLMClient(provider_name="groq")
+        mock_sdk_instance = mock_groq.Groq.return_value
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content='["t"]'))]
+        mock_sdk_instance.chat.completions.create.return_value = mock_response
+
+        fake_encoding = MagicMock()
+        fake_encoding.encode.side_effect = lambda text: text.split()
+        fake_encoding.decode.side_effect = lambda tokens: " ".join(tokens)
+        with patch('scipfs.llm_utils._load_encoding', return_value=fake_encoding):
+            client.generate_tags(" ".join("w%d" % i for i in range(50)))
+        prompt = mock_sdk_instance.chat.completions.create.call_args[1]['messages'][1]['content']
+        self.assertIn("Text: w0 w1 w2 w3 w4 w5 w6 w7 w8 w9\n---", prompt)
+
+    def test_input_budget_limited_by_context_window(self):
+        self.mock_groq_provider_config.context_window = 1000
+        client = LLMClient(provider_name="groq")
+        self.assertEqual(client._input_token_budget(max_tokens=200), 1000 - 200 - 256)
+        other_model = LLMClient(provider_name="groq", model_name="llama3-70b-8192")
+        self.assertEqual(other_model._input_token_budget(max_tokens=200), 24000) # Window only describes the default model
+
     # --- Generate Tags Tests ---
+    def test_generate_tags_cache_hit_skips_prompt_building(self):
+        client = LLMClient(provider_name="openai")
+        mock_sdk_instance = mock_openai.OpenAI.return_value
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content='["a", "b"]'))]
+        mock_sdk_instance.chat.completions.create.return_value = mock_response
+        self.assertEqual(client.generate_tags("Same text."), ["a", "b"])
+
+        with patch.object(client, "_truncate_input") as mock_truncate:
+            self.assertEqual(client.generate_tags("Same text."), ["a", "b"])
+        mock_truncate.assert_not_called()
+        mock_sdk_instance.chat.completions.create.assert_called_once()
+
     def test_generate_tags_groq_success_json(self):
         client = LLMClient(provider_name="groq")
         mock_sdk_instance = mock_groq.Groq.return_value
@@ -225,6 +550,26 @@ class TestLLMClient(unittest.TestCase):
         tags = client.generate_tags("Text for fenced JSON.")
         self.assertEqual(tags, ["fenced_tag"])
 
+    def test_generate_tags_bare_fence_with_trailing_whitespace(self):
+        client = LLMClient(provider_name="openai")
+        mock_sdk_instance = mock_openai.OpenAI.return_value
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content='  ```\n["a", "b"]\n```  \n'))]
+        mock_sdk_instance.chat.completions.create.return_value = mock_response
+        self.assertEqual(client.generate_tags("Text with bare fence."), ["a", "b"])
+
+    def test_generate_tags_openai_json_mode_only_for_known_models(self):
+        mock_sdk_instance = mock_openai.OpenAI.return_value
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content='["t"]'))]
+        mock_sdk_instance.chat.completions.create.return_value = mock_response
+
+        LLMClient(provider_name="openai").generate_tags("Known model.")
+        self.assertEqual(mock_sdk_instance.chat.completions.create.call_args[1]['response_format'], {"type": "json_object"})
+
+        LLMClient(provider_name="openai", model_name="gpt-4o-mini-badmodel").generate_tags("Unknown model.")
+        self.assertNotIn('response_format', mock_sdk_instance.chat.completions.create.call_args[1])
+
     def test_generate_tags_anthropic_invalid_json_response(self):
         client = LLMClient(provider_name="anthropic")
         mock_sdk_instance = mock_anthropic.Anthropic.return_value
@@ -246,5 +591,262 @@ class TestLLMClient(unittest.TestCase):
         with self.assertRaisesRegex(LLMResponseFormatError, "openai did not return a JSON list of strings"):
             client.generate_tags("Text for OpenAI wrong JSON type.")
 
+    def test_generate_tags_tolerates_prose_trailing_commas_and_wrapper_object(self):
+        client = LLMClient(provider_name="openai")
+        mock_sdk_instance = mock_openai.OpenAI.return_value
+        contents = [
+            'Here are the tags: ["a", "b",] Hope this helps!',
+            json.dumps({"tags": ["c", "d"]}),
+            json.dumps(["1", "2", "3", "4", "5", "6", "7"]),
+        ]
+        responses = []
+        for content in contents:
+            response = MagicMock()
+            response.choices = [MagicMock(message=MagicMock(content=content))]
+            responses.append(response)
+        mock_sdk_instance.chat.completions.create.side_effect = responses
+
+        self.assertEqual(client.generate_tags("First."), ["a", "b"])
+        self.assertEqual(client.generate_tags("Second."), ["c", "d"])
+        self.assertEqual(client.generate_tags("Third.", num_tags=5), ["1", "2", "3", "4", "5"])
+
+    # --- Streaming Tests ---
+    def test_generate_tags_stream_stops_after_list_closes(self):
+        client = LLMClient(provider_name="openai")
+        mock_sdk_instance = mock_openai.OpenAI.return_value
+        deltas = ['```json\n["a', '", "b]"', ']', '\n```', ' trailing tokens']
+        chunks = [MagicMock(choices=[MagicMock(delta=MagicMock(content=d))]) for d in deltas]
+        mock_stream = MagicMock()
+        mock_stream.__iter__.return_value = iter(chunks)
+        mock_sdk_instance.chat.completions.create.return_value = mock_stream
+
+        self.assertEqual(client.generate_tags("Text to stream.", stream=True), ["a", "b]"])
+        self.assertTrue(mock_sdk_instance.chat.completions.create.call_args[1]['stream'])
+        mock_stream.close.assert_called_once()
+
+    def test_summarize_stream_anthropic(self):
+        client = LLMClient(provider_name="anthropic")
+        mock_sdk_instance = mock_anthropic.Anthropic.return_value
+        stream_cm = mock_sdk_instance.messages.stream.return_value
+        stream_cm.__enter__.return_value.text_stream = iter(["Streamed ", "summary."])
+        self.assertEqual("".join(client.summarize_stream("Text.")), "Streamed summary.")
+        # The completed stream is cached, so summarize() doesn't call the API again
+        self.assertEqual(client.summarize("Text."), "Streamed summary.")
+        mock_sdk_instance.messages.create.assert_not_called()
+
+    # --- Batch Tests ---
+    def test_summarize_batch_splits_into_requests(self):
+        client = LLMClient(provider_name="openai")
+        mock_sdk_instance = mock_openai.OpenAI.return_value
+        first, second = MagicMock(), MagicMock()
+        first.choices = [MagicMock(message=MagicMock(content=json.dumps([" s1 ", "s2"])))]
+        second.choices = [MagicMock(message=MagicMock(content='```json\n["s3"]\n```'))]
+        mock_sdk_instance.chat.completions.create.side_effect = [first, second]
+
+        summaries = client.summarize_batch(["a", "b", "c"], batch_size=2)
+        self.assertEqual(summaries, ["s1", "s2", "s3"])
+        self.assertEqual(mock_sdk_instance.chat.completions.create.call_count, 2)
+        first_call = mock_sdk_instance.chat.completions.create.call_args_list[0][1]
+        self.assertIn("### DOC 2 ###\nb", first_call['messages'][1]['content'])
+        self.assertEqual(first_call['max_tokens'], 300)
+
+    def test_batch_documents_share_the_input_budget(self):
+        self.mock_llm_config.max_input_tokens = 10
+        client = LLMClient(provider_name="groq")
+        mock_sdk_instance = mock_groq.Groq.return_value
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content='[["t"], ["u"]]'))]
+        mock_sdk_instance.chat.completions.create.return_value = mock_response
+
+        fake_encoding = MagicMock()
+        fake_encoding.encode.side_effect = lambda text: text.split()
+        fake_encoding.decode.side_effect = lambda tokens: " ".join(tokens)
+        long_text = " ".join("w%d" % i for i in range(50))
+        with patch('scipfs.llm_utils._load_encoding', return_value=fake_encoding):
+            client.generate_tags_batch([long_text, long_text])
+        prompt = mock_sdk_instance.chat.completions.create.call_args[1]['messages'][1]['content']
+        self.assertIn("### DOC 1 ###\nw0 w1 w2 w3 w4\n### DOC 2 ###\nw0 w1 w2 w3 w4", prompt)
+        self.assertTrue(prompt.endswith("w4"))
+
+    def test_generate_tags_batch_anthropic_wrong_count(self):
+        client = LLMClient(provider_name="anthropic")
+        mock_sdk_instance = mock_anthropic.Anthropic.return_value
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock(text=json.dumps([["t1"]]))]
+        mock_sdk_instance.messages.create.return_value = mock_response
+
+        with self.assertRaisesRegex(LLMResponseFormatError, "did not return a JSON list of 2 results"):
+            client.generate_tags_batch(["a", "b"])
+
+    def test_summarize_many_returns_results_in_order(self):
+        client = LLMClient(provider_name="groq")
+        mock_sdk_instance = mock_groq.Groq.return_value
+
+        def fake_create(**kwargs):
+            text = kwargs['messages'][1]['content']
+            if "bad" in text:
+                raise MockGroqRateLimitError("slow down")
+            response = MagicMock()
+            response.choices = [MagicMock(message=MagicMock(content="summary of " + text.split("---\n")[1].split("\n---")[0]))]
+            return response
+        mock_sdk_instance.chat.completions.create.side_effect = fake_create
+
+        results = asyncio.run(client.summarize_many(["one", "bad", "three"], concurrency=2))
+        self.assertEqual(results[0], "summary of one")
+        self.assertIsInstance(results[1], LLMRateLimitError)
+        self.assertEqual(results[2], "summary of three")
+
+    def test_run_many_respects_provider_max_concurrency(self):
+        self.mock_groq_provider_config.max_concurrency = 2
+        client = LLMClient(provider_name="groq")
+        lock = threading.Lock()
+        in_flight = [0, 0] # current, peak
+
+        def fake_summarize(text):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            time.sleep(0.01)
+            with lock:
+                in_flight[0] -= 1
+            return text.upper()
+
+        results = client.run_many(fake_summarize, ["a", "b", "c", "d", "e"])
+        self.assertEqual(results, ["A", "B", "C", "D", "E"])
+        self.assertLessEqual(in_flight[1], 2)
+
+    @patch('scipfs.llm_utils.time.sleep')
+    def test_summarize_many_uses_openai_batch_api(self, mock_sleep):
+        self.mock_openai_provider_config.use_batch_api = True
+        self.mock_llm_config.batch_api_threshold = 2
+        client = LLMClient(provider_name="openai")
+        mock_sdk_instance = mock_openai.OpenAI.return_value
+        mock_sdk_instance.batches.create.return_value = MagicMock(id="batch_1")
+        mock_sdk_instance.batches.retrieve.side_effect = [
+            MagicMock(id="batch_1", status="in_progress"),
+            MagicMock(id="batch_1", status="completed", output_file_id="file_out"),
+        ]
+        # Output lines arrive out of order and the second request failed
+        output_lines = [
+            {"custom_id": "2", "response": {"status_code": 200, "body": {"choices": [{"message": {"content": " third "}}]}}},
+            {"custom_id": "1", "response": {"status_code": 500, "body": {}}},
+            {"custom_id": "0", "response": {"status_code": 200, "body": {"choices": [{"message": {"content": "first"}}]}}},
+        ]
+        mock_sdk_instance.files.content.return_value.text = "\n".join(json.dumps(line) for line in output_lines)
+
+        results = asyncio.run(client.summarize_many(["a", "b", "c"]))
+        self.assertEqual(results[0], "first")
+        self.assertIsInstance(results[1], LLMAPIError)
+        self.assertEqual(results[2], "third")
+        mock_sdk_instance.chat.completions.create.assert_not_called()
+        self.assertEqual(mock_sdk_instance.batches.create.call_args[1]['endpoint'], "/v1/chat/completions")
+        mock_sleep.assert_called_once()
+
+    @patch('scipfs.llm_utils.time.sleep')
+    def test_generate_tags_many_uses_anthropic_batch_api(self, mock_sleep):
+        self.mock_anthropic_provider_config.use_batch_api = True
+        self.mock_llm_config.batch_api_threshold = 2
+        client = LLMClient(provider_name="anthropic")
+        mock_sdk_instance = mock_anthropic.Anthropic.return_value
+        mock_sdk_instance.messages.batches.create.return_value = MagicMock(id="msgbatch_1")
+        mock_sdk_instance.messages.batches.retrieve.return_value = MagicMock(processing_status="ended")
+
+        def result(custom_id, text):
+            entry = MagicMock(custom_id=custom_id)
+            entry.result.type = "succeeded"
+            entry.result.message.content = [MagicMock(text=text)]
+            return entry
+        mock_sdk_instance.messages.batches.results.return_value = [result("1", "not json"), result("0", '["t1", "t2"]')]
+
+        results = asyncio.run(client.generate_tags_many(["a", "b"]))
+        self.assertEqual(results[0], ["t1", "t2"])
+        self.assertIsInstance(results[1], LLMResponseFormatError)
+        requests = mock_sdk_instance.messages.batches.create.call_args[1]['requests']
+        self.assertEqual([r['custom_id'] for r in requests], ["0", "1"])
+        mock_sleep.assert_not_called()
+
+class TestLLMConfig(unittest.TestCase):
+
+    def test_get_llm_config_is_shared_instance(self):
+        import scipfs.llm_config as llm_config_module
+        self.assertIs(get_llm_config(), get_llm_config())
+        self.assertIs(llm_config_module.llm_config, get_llm_config())
+
+    def test_provider_api_key_loaded_on_first_use(self):
+        with patch.dict('os.environ', {}, clear=True):
+            provider = LLMProviderConfig("openai")
+            self.assertIsNone(provider.api_key)
+        with patch.dict('os.environ', {"SCIPFS_OPENAI_API_KEY": "late_key"}):
+            self.assertEqual(provider.get_api_key(), "late_key")
+
+    def test_invalidate_rereads_api_keys(self):
+        config = GlobalLLMConfig()
+        with patch.dict('os.environ', {"SCIPFS_OPENAI_API_KEY": "old_key"}):
+            self.assertEqual(config.get_api_key("openai"), "old_key")
+        with patch.dict('os.environ', {"SCIPFS_OPENAI_API_KEY": "new_key"}):
+            self.assertEqual(config.get_api_key("openai"), "old_key")
+            config.invalidate()
+            self.assertEqual(config.get_api_key("openai"), "new_key")
+
+    def test_global_get_api_key_is_memoized(self):
+        config = GlobalLLMConfig()
+        with patch.dict('os.environ', {"SCIPFS_OPENAI_API_KEY": "first_key"}):
+            self.assertEqual(config.get_api_key("OpenAI"), "first_key")
+        with patch.dict('os.environ', {"SCIPFS_OPENAI_API_KEY": "second_key"}):
+            self.assertEqual(config.get_api_key("openai"), "first_key")
+        self.assertIsNone(config.get_api_key("unknown_provider"))
+
+    def test_config_objects_have_no_instance_dict(self):
+        self.assertFalse(hasattr(LLMProviderConfig("openai"), "__dict__"))
+        self.assertFalse(hasattr(GlobalLLMConfig(), "__dict__"))
+
+    def test_disk_cache_is_opt_in(self):
+        # The cache keeps model output about the user's documents on disk, so nothing is written by default
+        self.assertFalse(GlobalLLMConfig().enable_disk_cache)
+
+    def test_missing_api_key_warns_once(self):
+        with patch.dict('os.environ', {}, clear=True), \
+             patch('scipfs.llm_config.logger') as mock_logger:
+            LLMProviderConfig("warnonce_provider").get_api_key()
+            LLMProviderConfig("warnonce_provider").get_api_key()
+        mock_logger.warning.assert_called_once()
+
+    def test_providers_built_on_demand_from_registry(self):
+        config = GlobalLLMConfig()
+        self.assertEqual(config.providers, {})
+        anthropic = config.get_provider_config("Anthropic")
+        self.assertEqual(anthropic.default_model, "claude-3-haiku-20240307")
+        self.assertEqual(anthropic.timeout_s, 60.0)
+        self.assertEqual(list(config.providers), ["anthropic"])
+        self.assertEqual(config.get_default_provider().provider_name, "openai")
+        self.assertIsNone(config.get_provider_config("not_registered"))
+        with self.assertRaises(TypeError):
+            config.providers["anthropic"] = None
+
+    def test_default_provider_resolved_once_and_invalidated(self):
+        config = GlobalLLMConfig()
+        first = config.get_default_provider()
+        self.assertIs(config.get_default_provider(), first)
+        config.set_default_provider("groq")
+        self.assertEqual(config.get_default_provider().provider_name, "groq")
+        config.add_provider("groq", default_model="llama3-8b-8192")
+        self.assertEqual(config.get_default_provider().default_model, "llama3-8b-8192")
+
+    @patch.dict(os.environ, {"SCIPFS_GROQ_API_KEY": "groq-key", "SCIPFS_LOCAL_API_KEY": "local-key"}, clear=True)
+    def test_configured_providers(self):
+        config = GlobalLLMConfig()
+        config.add_provider("local")
+        self.assertEqual(config.configured_providers(), ["groq", "local"])
+
+    def test_add_provider_accepts_provider_overrides(self):
+        config = GlobalLLMConfig()
+        config.add_provider("local", default_model="llama3", context_window=8192, timeout_s=120.0, max_retries=1, max_concurrency=2)
+        provider = config.get_provider_config("local")
+        self.assertEqual(
+            (provider.default_model, provider.context_window, provider.timeout_s, provider.max_retries, provider.max_concurrency),
+            ("llama3", 8192, 120.0, 1, 2),
+        )
+        self.assertEqual(provider.connect_timeout_s, 5.0)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -4,7 +4,9 @@ from pathlib import Path
 import tempfile
 import shutil
 from scipfs.ipfs import IPFSClient
+from tests._markers import requires_ipfs
 
+@requires_ipfs
 class TestProviderOperations(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures before each test method."""
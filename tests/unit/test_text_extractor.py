@@ -0,0 +1,150 @@
+import unittest
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from scipfs.llm_cache import ExtractionCache
+from scipfs import text_extractor
+from scipfs.text_extractor import extract_text, extract_text_many, register, SUPPORTED_TEXT_EXTENSIONS
+
+
+class TestTextExtractor(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_supported_extensions_is_frozenset(self):
+        self.assertIsInstance(SUPPORTED_TEXT_EXTENSIONS, frozenset)
+        self.assertIn(".md", SUPPORTED_TEXT_EXTENSIONS)
+
+    def test_register_adds_handler(self):
+        self.addCleanup(setattr, text_extractor, "SUPPORTED_TEXT_EXTENSIONS", text_extractor.SUPPORTED_TEXT_EXTENSIONS)
+        self.addCleanup(text_extractor._HANDLERS.pop, ".csv")
+
+        @register(".CSV")
+        def extract_csv(file_path):
+            return "csv:" + file_path.read_text(encoding="utf-8")
+
+        path = self.test_dir / "data.csv"
+        path.write_text("a,b", encoding="utf-8")
+        self.assertEqual(extract_text(path), "csv:a,b")
+        self.assertIn(".csv", text_extractor.SUPPORTED_TEXT_EXTENSIONS)
+
+    def test_extract_text_plain_file(self):
+        path = self.test_dir / "notes.md"
+        path.write_text("# Title\nBody", encoding="utf-8")
+        self.assertEqual(extract_text(path), "# Title\nBody")
+
+    def test_extract_text_large_file_via_mmap(self):
+        path = self.test_dir / "big.txt"
+        content = "héllo wörld\n" * 10000 # Well above MMAP_THRESHOLD
+        path.write_text(content, encoding="utf-8")
+        self.assertEqual(extract_text(path), content)
+
+    def test_extract_text_detects_legacy_encoding(self):
+        path = self.test_dir / "cyrillic.txt"
+        content = "Привет мир, это проверка кодировки текста для извлечения. " * 4
+        path.write_bytes(content.encode("cp1251"))
+        self.assertEqual(extract_text(path), content)
+
+    def test_detect_encoding_cached_by_digest(self):
+        sample = "Привет мир".encode("cp1251") + os.urandom(16) # Unique, so not cached by another test
+        fake_detector = MagicMock()
+        fake_detector.from_bytes.return_value.best.return_value.encoding = "cp1251"
+        with patch.dict(sys.modules, {"charset_normalizer": fake_detector}):
+            self.assertEqual(text_extractor._detect_encoding(sample), "cp1251")
+            self.assertEqual(text_extractor._detect_encoding(bytes(sample)), "cp1251")
+        fake_detector.from_bytes.assert_called_once()
+        self.assertNotIn(sample, text_extractor._ENCODING_CACHE)
+        self.assertTrue(all(len(key) == 16 for key in text_extractor._ENCODING_CACHE))
+
+    @patch("scipfs.text_extractor._detect_encoding", return_value=None)
+    def test_extract_text_undetectable_encoding_replaces_bad_bytes(self, mock_detect):
+        path = self.test_dir / "big.log"
+        path.write_bytes(b"ok\xff" * 30000) # Large enough for the mmap path
+        self.assertEqual(extract_text(path), "ok\ufffd" * 30000)
+        mock_detect.assert_called_once()
+
+    def test_extract_text_missing_file(self):
+        self.assertIsNone(extract_text(self.test_dir / "missing.txt"))
+
+    def test_extract_text_accepts_dir_entry(self):
+        (self.test_dir / "a.txt").write_text("alpha", encoding="utf-8")
+        with os.scandir(self.test_dir) as entries:
+            entry = next(entries)
+            self.assertEqual(extract_text(entry), "alpha")
+
+    def test_extract_text_many_expands_directories(self):
+        (self.test_dir / "a.txt").write_text("alpha", encoding="utf-8")
+        (self.test_dir / "b.py").write_text("print('b')", encoding="utf-8")
+        (self.test_dir / "sub").mkdir()
+        extra = self.test_dir / "sub" / "c.txt"
+        extra.write_text("gamma", encoding="utf-8")
+
+        results = extract_text_many([self.test_dir, extra])
+        self.assertEqual(results, {
+            self.test_dir / "a.txt": "alpha",
+            self.test_dir / "b.py": "print('b')",
+            extra: "gamma",
+        })
+
+    def test_extract_text_many_uses_process_pool_for_pdfs(self):
+        paths = [self.test_dir / "a.txt", self.test_dir / "b.pdf"]
+        paths[0].write_text("alpha", encoding="utf-8")
+        paths[1].write_bytes(b"%PDF-1.4 dummy")
+        with patch("scipfs.text_extractor.ProcessPoolExecutor", ThreadPoolExecutor), \
+                patch("scipfs.text_extractor.ThreadPoolExecutor") as thread_pool_cls:
+            results = extract_text_many(paths, workers=2)
+        thread_pool_cls.assert_not_called()
+        self.assertEqual(list(results), paths)
+        self.assertEqual(results[paths[0]], "alpha")
+
+    def test_extract_text_cache_reused_until_file_changes(self):
+        cache = ExtractionCache(self.test_dir / "cache.sqlite3")
+        self.addCleanup(cache.close)
+        path = self.test_dir / "notes.txt"
+        path.write_text("first", encoding="utf-8")
+        self.assertEqual(extract_text(path, cache=cache), "first")
+
+        with patch("scipfs.text_extractor._extract_file") as mock_extract:
+            self.assertEqual(extract_text(path, cache=cache), "first")
+        mock_extract.assert_not_called()
+
+        path.write_text("second version", encoding="utf-8") # New size (and mtime)
+        self.assertEqual(extract_text(path, cache=cache), "second version")
+
+    def test_extract_text_many_only_extracts_cache_misses(self):
+        cache = ExtractionCache(self.test_dir / "cache.sqlite3")
+        self.addCleanup(cache.close)
+        paths = [self.test_dir / "a.txt", self.test_dir / "b.txt"]
+        paths[0].write_text("alpha", encoding="utf-8")
+        paths[1].write_text("beta", encoding="utf-8")
+        extract_text(paths[0], cache=cache)
+
+        with patch("scipfs.text_extractor._extract_file", return_value="beta") as mock_extract:
+            results = extract_text_many(paths, workers=1, cache=cache)
+        self.assertEqual(results, {paths[0]: "alpha", paths[1]: "beta"})
+        mock_extract.assert_called_once_with(paths[1])
+
+    def test_extraction_cache_replaces_table_from_earlier_schema(self):
+        cache_path = self.test_dir / "cache.sqlite3"
+        conn = sqlite3.connect(str(cache_path))
+        conn.execute("CREATE TABLE extraction (path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, text_blob BLOB NOT NULL, text_hash BLOB NOT NULL)")
+        conn.close()
+        cache = ExtractionCache(cache_path)
+        self.addCleanup(cache.close)
+        path = self.test_dir / "notes.txt"
+        path.write_text("text", encoding="utf-8")
+        cache.put(path, path.stat(), "text")
+        self.assertEqual(cache.get(path, path.stat()), "text")
+
+
+if __name__ == '__main__':
+    unittest.main()